@@ -1,9 +1,13 @@
 from application.exceptions.exceptions import (
     ApplicationException,
     AuthenticationException,
+    AvatarJobNotFoundException,
+    AvatarSupersededException,
     ChatsServerUnavailable,
+    CircuitOpenException,
     FileExtensionException,
     FileSizeException,
+    PermissionDeniedException,
     SessionDoesNotExistException,
     UserAlreadyExistsException,
     UserNotFoundException,
@@ -14,6 +14,12 @@ class AuthenticationException(ApplicationException):
     """
 
 
+class PermissionDeniedException(ApplicationException):
+    """
+    Should be raisen if an authenticated user is not allowed to perform the action.
+    """
+
+
 class SessionDoesNotExistException(ApplicationException):
     """
     Should be raisen if there is no ongoing session exists for the requesting user.
@@ -39,6 +45,13 @@ class ChatsServerUnavailable(ApplicationException):
     """
 
 
+class CircuitOpenException(ChatsServerUnavailable):
+    """
+    Should be raisen if a call to the server that is responsible for updating chats
+    was rejected without reaching it since the server is failing.
+    """
+
+
 class FileSizeException(ApplicationException):
     """
     Should be raisen if the file size exceeds the limit.
@@ -49,3 +62,15 @@ class FileExtensionException(ApplicationException):
     """
     Should be raisen if provided file extension is not supported.
     """
+
+
+class AvatarJobNotFoundException(ApplicationException):
+    """
+    Should be raisen if an avatar job with the provided id was not found.
+    """
+
+
+class AvatarSupersededException(ApplicationException):
+    """
+    Should be raisen if an avatar that was queued later has already been made the avatar of the user.
+    """
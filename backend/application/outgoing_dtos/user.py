@@ -10,6 +10,7 @@ class OutgoingUserDTO:
     id: int
     username: str
     avatar_url: str
+    avatar_renditions: dict
 
     @property
     def representation(self) -> dict:
@@ -33,4 +34,5 @@ class OutgoingUserDTO:
             id=user_data.get('id'),
             username=user_data.get('username'),
             avatar_url=user_data.get('avatar_url'),
+            avatar_renditions=user_data.get('avatar_renditions') or {},
         )
@@ -1,7 +1,11 @@
+from application.ports.avatar_job import AvatarJobRepositoryPort
 from application.ports.database_uow import DatabaseUnitOfWorkPort
 from application.ports.default_hasher import DefaultHasherPort
 from application.ports.file_storage import FileStoragePort
+from application.ports.image_processor import ImageProcessorPort
 from application.ports.jwt_manager import JWTManagerPort
+from application.ports.orphaned_file import OrphanedFileRepositoryPort
+from application.ports.outbox import OutboxRepositoryPort
 from application.ports.session import SessionRepositoryPort
 from application.ports.update_chat_related_user import UpdateChatRelatedUserPort
 from application.ports.user import UserRepositoryPort
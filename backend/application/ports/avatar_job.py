@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+
+
+class AvatarJobRepositoryPort(ABC):
+    """
+    This abstract port defines methods that are needed to queue the uploaded avatars
+    for the processing in the background and to track the progress of their processing.
+    """
+
+    @abstractmethod
+    async def add_job(self, data: dict) -> dict:
+        ...
+
+    @abstractmethod
+    async def get_job(self, job_id: str, user_id: int) -> dict | None:
+        ...
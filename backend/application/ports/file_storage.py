@@ -1,12 +1,29 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 
 
 class FileStoragePort(ABC):
 
     @abstractmethod
-    async def store(self, bfile: bytes, user_id: int, extension: str) -> str:
+    async def store(self, stream: AsyncIterator[bytes], user_id: int, extension: str) -> str:
+        ...
+
+    @abstractmethod
+    async def stage(self, path: str) -> None:
+        ...
+
+    @abstractmethod
+    async def publish(self, paths: list[str]) -> None:
         ...
 
     @abstractmethod
     async def delete(self, path: str) -> None:
         ...
+
+    @abstractmethod
+    async def delete_stale(self, path: str, min_age: float) -> bool:
+        ...
+
+    @abstractmethod
+    async def get_download_url(self, path: str) -> str | None:
+        ...
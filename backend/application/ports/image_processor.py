@@ -0,0 +1,8 @@
+from abc import ABC, abstractmethod
+
+
+class ImageProcessorPort(ABC):
+
+    @abstractmethod
+    async def create_renditions(self, path: str) -> dict:
+        ...
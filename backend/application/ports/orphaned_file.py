@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+
+
+class OrphanedFileRepositoryPort(ABC):
+    """
+    This abstract port defines methods that are needed to register the files that may be
+    no longer used, so they are deleted once nothing references them.
+    """
+
+    @abstractmethod
+    async def add_file(self, data: dict) -> None:
+        ...
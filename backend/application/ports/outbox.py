@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+
+
+class OutboxRepositoryPort(ABC):
+    """
+    This abstract port defines methods that are needed to put the messages for other services
+    into the outbox, so they are stored in the same transaction as the changes they describe.
+    """
+
+    @abstractmethod
+    async def add_message(self, data: dict) -> None:
+        ...
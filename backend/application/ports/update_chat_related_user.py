@@ -16,5 +16,13 @@ class UpdateChatRelatedUserPort(ABC):
     """
 
     @abstractmethod
-    async def execute(self, access_token: str, user_data: dict) -> None:
+    def is_available(self) -> bool:
+        ...
+
+    @abstractmethod
+    async def execute(self, user_data: dict, access_token: str | None) -> None:
+        ...
+
+    @abstractmethod
+    async def execute_bulk(self, users_data: list[dict]) -> None:
         ...
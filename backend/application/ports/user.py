@@ -1,4 +1,6 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import AsyncIterator
 
 
 class UserRepositoryPort(ABC):
@@ -19,12 +21,30 @@ class UserRepositoryPort(ABC):
     async def get_by_ids(self, ids: list) -> list:
         ...
 
+    @abstractmethod
+    def stream_by_ids(self, ids: list) -> AsyncIterator[list]:
+        ...
+
+    @abstractmethod
+    async def get_changes(self, cursor: int, limit: int) -> list:
+        ...
+
     @abstractmethod
     async def update_user(self, user_id: int, user_data: dict) -> dict | None:
         ...
 
     @abstractmethod
-    async def update_avatar(self, avatar_url: str) -> None:
+    async def lock_avatar(self, user_id: int) -> dict | None:
+        ...
+
+    @abstractmethod
+    async def update_avatar(
+        self,
+        user_id: int,
+        avatar_url: str,
+        avatar_renditions: dict,
+        queued_at: datetime | None = None,
+    ) -> dict | None:
         ...
 
     @abstractmethod
@@ -1,7 +1,10 @@
 from application.use_cases.create_session import CreateSessionUseCase
 from application.use_cases.create_user import CreateUserUseCase
+from application.use_cases.get_avatar_job import GetAvatarJobUseCase
 from application.use_cases.get_user import GetUserUseCase
+from application.use_cases.get_user_changes import GetUserChangesUseCase
 from application.use_cases.get_users_info import GetUsersInfoUseCase
+from application.use_cases.process_avatar import ProcessAvatarUseCase
 from application.use_cases.refresh_session import RefreshSessionUseCase
 from application.use_cases.search_users import SearchUsersUseCase
 from application.use_cases.terminate_all_sessions import TerminateAllSessionsUseCase
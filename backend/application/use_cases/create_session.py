@@ -79,12 +79,11 @@ class CreateSessionUseCase:
         if (user_data := await self.user_database_repo.get_by_properties({'username': username})) is not None:
             password_is_correct = await self.default_hasher.verify(value=password, hash=user_data.get('password'))
 
-            self.logger.error(
-                'Attempt to log with the wrong password.',
-                extra={'user_id': user_data.get('id'), 'event_type': 'Wrong password'},
-            )
-
             if not password_is_correct:
+                self.logger.error(
+                    'Attempt to log with the wrong password.',
+                    extra={'user_id': user_data.get('id'), 'event_type': 'Wrong password'},
+                )
                 raise AuthenticationException(title='Authentication exception.', details=exception_details)
 
             self.user_id = user_data.get('id')
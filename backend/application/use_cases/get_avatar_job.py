@@ -0,0 +1,49 @@
+from logging import getLogger
+
+from settings import settings
+
+from application.exceptions import AvatarJobNotFoundException
+from application.ports import AvatarJobRepositoryPort
+
+
+class GetAvatarJobUseCase:
+    """
+    This use case is responsible for the retrieval of an avatar processing job of the requesting user.
+    """
+
+    def __init__(self, job_id: str, user_id: int, avatar_job_repo: AvatarJobRepositoryPort) -> None:
+        """
+        Initialize the use case.
+
+        Args:
+            job_id (str): The id of the job.
+            user_id (int): The id of requesting user.
+            avatar_job_repo (AvatarJobRepositoryPort): The queue of the avatars to process in the background.
+        """
+        self.job_id = job_id
+        self.user_id = user_id
+        self.avatar_job_repo = avatar_job_repo
+        self.logger = getLogger(settings.users_logger_name)
+
+    async def execute(self) -> dict:
+        """
+        Execute the process.
+
+        Returns:
+            dict: The job.
+
+        Raises:
+            AvatarJobNotFoundException: If the user has no job with the provided id.
+        """
+        if (avatar_job := await self.avatar_job_repo.get_job(job_id=self.job_id, user_id=self.user_id)) is not None:
+            return avatar_job
+
+        self.logger.error(
+            'An avatar job with the provided id was not found.',
+            extra={'user_id': self.user_id, 'event_type': 'Avatar job not found.'}
+        )
+
+        raise AvatarJobNotFoundException(
+            title='Avatar job was not found.',
+            details={'Avatar job was not found.': 'An avatar job matching the provided id does not exist.'},
+        )
@@ -0,0 +1,50 @@
+from application.ports import DatabaseUnitOfWorkPort, UserRepositoryPort
+
+
+class GetUserChangesUseCase:
+    """
+    This use case is responsible for the retrieval of the users changed since a cursor.
+    """
+
+    def __init__(
+        self,
+        cursor: int,
+        limit: int,
+        database_repo: UserRepositoryPort,
+        database_uow: DatabaseUnitOfWorkPort,
+    ) -> None:
+        """
+        Initialize the use case.
+
+        Args:
+            cursor (int): The version of the last change seen by the consumer.
+            limit (int): The maximum number of changes in a page.
+            database_repo (UserRepositoryPort): The port that is responsible for actions with users.
+            database_uow (DatabaseUnitOfWorkPort): The unit of work the changes are read in.
+        """
+        self.cursor = cursor
+        self.limit = limit
+        self.database_repo = database_repo
+        self.database_uow = database_uow
+
+    async def execute(self) -> dict:
+        """
+        Find a page of the changes.
+
+        One extra user is requested to learn whether there are more changes after the page.
+        The transaction is ended right after the read to release the lock the writers wait for.
+
+        Returns:
+            dict: The changed users, the cursor of the next page and whether it has changes.
+        """
+        users = await self.database_repo.get_changes(cursor=self.cursor, limit=self.limit + 1)
+        await self.database_uow.rollback()
+
+        has_more = len(users) > self.limit
+        users = users[:self.limit]
+
+        return {
+            'users': users,
+            'cursor': users[-1].get('version') if users else self.cursor,
+            'has_more': has_more,
+        }
@@ -1,3 +1,7 @@
+from typing import AsyncIterator
+
+from settings import settings
+
 from application.ports import UserRepositoryPort
 
 
@@ -17,8 +21,25 @@ class GetUsersInfoUseCase:
         self.user_ids = user_ids
         self.database_repo = database_repo
 
-    async def execute(self) -> list:
+    def get_chunks(self) -> list[list]:
+        """
+        Deduplicate the user ids preserving their order and split them into chunks.
+
+        Returns:
+            list[list]: The chunks of at most settings.user_ids_chunk_size ids.
+        """
+        unique_ids = list(dict.fromkeys(self.user_ids))
+        chunk_size = settings.user_ids_chunk_size
+
+        return [unique_ids[start:start + chunk_size] for start in range(0, len(unique_ids), chunk_size)]
+
+    async def execute(self) -> AsyncIterator[list]:
         """
         Find the specified users.
+
+        Yields:
+            list: The found users, one partition at a time.
         """
-        return await self.database_repo.get_by_ids(ids=self.user_ids)
+        for chunk in self.get_chunks():
+            async for users in self.database_repo.stream_by_ids(ids=chunk):
+                yield users
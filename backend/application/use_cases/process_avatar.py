@@ -0,0 +1,220 @@
+from datetime import datetime
+from logging import getLogger
+
+from settings import settings
+
+from application.exceptions import AvatarSupersededException, FileExtensionException, UserNotFoundException
+from application.outgoing_dtos import OutgoingUserDTO
+from application.ports import (
+    DatabaseUnitOfWorkPort,
+    FileStoragePort,
+    ImageProcessorPort,
+    OrphanedFileRepositoryPort,
+    OutboxRepositoryPort,
+    UserRepositoryPort,
+)
+
+
+class ProcessAvatarUseCase:
+    """
+    This use case is responsible for making a stored avatar the avatar of a user.
+    """
+
+    def __init__(
+        self,
+        avatar_path: str,
+        user_id: int,
+        previous_avatar: dict | None,
+        file_storage: FileStoragePort,
+        image_processor: ImageProcessorPort,
+        database_repo: UserRepositoryPort,
+        database_uow: DatabaseUnitOfWorkPort,
+        outbox_repo: OutboxRepositoryPort,
+        orphaned_file_repo: OrphanedFileRepositoryPort,
+        queued_at: datetime | None = None,
+        access_token: str | None = None,
+    ) -> None:
+        """
+        Initialize the use case.
+
+        Args:
+            avatar_path (str): The path of the avatar in the storage.
+            user_id (int): User ID.
+            previous_avatar (dict | None): The avatar URL and the rendition URLs the user had before,
+                they are read from the database with the user locked if not provided.
+            file_storage (FileStoragePort): File storage port.
+            image_processor (ImageProcessorPort): The port that creates the thumbnails of the avatar.
+            database_repo (UserRepositoryPort): User repository port.
+            database_uow (DatabaseUnitOfWorkPort): Database unit of work.
+            outbox_repo (OutboxRepositoryPort): The outbox the update of chats is put into.
+            orphaned_file_repo (OrphanedFileRepositoryPort): The registry of the files that may be no longer used.
+            queued_at (datetime | None): The time the avatar was queued at, if it was processed in the background.
+            access_token (str | None): The token the update of chats is delivered with, if the service token is not used.
+        """
+        self.avatar_path = avatar_path
+        self.user_id = user_id
+        self.previous_avatar = previous_avatar
+        self.file_storage = file_storage
+        self.image_processor = image_processor
+        self.database_repo = database_repo
+        self.database_uow = database_uow
+        self.outbox_repo = outbox_repo
+        self.orphaned_file_repo = orphaned_file_repo
+        self.queued_at = queued_at
+        self.access_token = access_token
+        self.logger = getLogger(settings.users_logger_name)
+
+    async def create_renditions(self) -> dict:
+        """
+        Create the thumbnails of the stored avatar, the avatar is deleted if it can not be decoded.
+
+        Returns:
+            dict: The paths of the thumbnails by format and size.
+
+        Raises:
+            FileExtensionException: If the file can not be decoded as an image.
+        """
+        try:
+            return await self.image_processor.create_renditions(path=self.avatar_path)
+        except FileExtensionException:
+            await self.file_storage.delete(path=self.avatar_path)
+            self.logger.error(
+                'An attempt to upload file that can not be decoded as an image.',
+                extra={'user_id': self.user_id, 'event_type': 'Invalid image.'}
+            )
+            raise
+
+    async def get_previous_avatar(self) -> dict:
+        """
+        Get the avatar the user has before the update.
+
+        The user is locked until the avatar is updated, so the avatars processed concurrently
+        are applied one by one and each of them sees the one applied before.
+
+        Returns:
+            dict: The avatar URL and the rendition URLs, empty if the user does not exist.
+        """
+        if self.previous_avatar is not None:
+            return self.previous_avatar
+
+        return await self.database_repo.lock_avatar(user_id=self.user_id) or {}
+
+    def is_superseded(self, previous_avatar: dict) -> bool:
+        """
+        Check if an avatar queued later than this one was already applied.
+
+        A job processed once more after it was applied is not superseded by its own avatar.
+        """
+        if self.queued_at is None or (applied_queued_at := previous_avatar.get('avatar_queued_at')) is None:
+            return False
+        return applied_queued_at > self.queued_at
+
+    @staticmethod
+    def get_url(path: str) -> str:
+        return f'{settings.current_domain}/{path}'
+
+    @staticmethod
+    def get_path(url: str) -> str:
+        return url.removeprefix(f'{settings.current_domain}/')
+
+    async def register_orphaned_file(self, avatar_url: str, avatar_renditions: dict) -> None:
+        """
+        Register an avatar and its renditions to be deleted once no user references them.
+
+        The files are content addressed and may be shared by several users, so they are never
+        deleted right away. The default avatar is never registered.
+        """
+        if avatar_url == f'{settings.media_root}/default.jpg':
+            return
+
+        rendition_urls = [url for urls in avatar_renditions.values() for url in urls.values()]
+
+        await self.orphaned_file_repo.add_file(
+            data={
+                'url': avatar_url,
+                'paths': [self.get_path(url=url) for url in [avatar_url, *rendition_urls]],
+            },
+        )
+
+    async def execute(self) -> dict:
+        """"
+        Execute the process.
+
+        - Create the thumbnails of the avatar and publish them along with the avatar.
+        - Skip the avatar if one queued later was already applied.
+        - Update avatar and its renditions in the database.
+        - Put the update of user info in the messaging service into the outbox.
+        - Register the previous avatar to be deleted once it is no longer used.
+
+        Returns:
+            dict: The URLs of the avatar and its renditions.
+        """
+        await self.file_storage.stage(path=self.avatar_path)
+
+        rendition_paths = await self.create_renditions()
+
+        await self.file_storage.publish(
+            paths=[self.avatar_path, *(path for paths in rendition_paths.values() for path in paths.values())],
+        )
+
+        full_avatar_url = self.get_url(path=self.avatar_path)
+        avatar_renditions = {
+            format: {size: self.get_url(path=path) for size, path in paths.items()}
+            for format, paths in rendition_paths.items()
+        }
+
+        previous_avatar = await self.get_previous_avatar()
+
+        if self.is_superseded(previous_avatar=previous_avatar):
+            if previous_avatar.get('avatar_url') != full_avatar_url:
+                await self.register_orphaned_file(avatar_url=full_avatar_url, avatar_renditions=avatar_renditions)
+            await self.database_uow.commit()
+
+            self.logger.info(
+                'An avatar was skipped since a newer one was already applied.',
+                extra={'user_id': self.user_id, 'event_type': 'Avatar superseded.'}
+            )
+            raise AvatarSupersededException(
+                title='Avatar was superseded.',
+                details={'Avatar was superseded.': 'An avatar uploaded later has already been applied.'},
+            )
+
+        user_data = await self.database_repo.update_avatar(
+            user_id=self.user_id,
+            avatar_url=full_avatar_url,
+            avatar_renditions=avatar_renditions,
+            queued_at=self.queued_at,
+        )
+
+        if user_data is not None:
+            outgoing_user = OutgoingUserDTO.create(user_data=user_data)
+
+            await self.outbox_repo.add_message(
+                data={
+                    'topic': settings.chat_related_user_topic,
+                    'key': f'user:{outgoing_user.id}',
+                    'payload': outgoing_user.representation,
+                    'access_token': self.access_token,
+                },
+            )
+
+            if (previous_avatar_url := previous_avatar.get('avatar_url')) != full_avatar_url:
+                await self.register_orphaned_file(
+                    avatar_url=previous_avatar_url,
+                    avatar_renditions=previous_avatar.get('avatar_renditions'),
+                )
+
+            await self.database_uow.commit()
+            return {'avatar_url': full_avatar_url, 'avatar_renditions': avatar_renditions}
+
+        await self.register_orphaned_file(avatar_url=full_avatar_url, avatar_renditions=avatar_renditions)
+        await self.database_uow.commit()
+
+        self.logger.error(
+            'A user with the provided id was not found.',
+            extra={'user_id': self.user_id, 'event_type': 'Invalid user during avatar update.'}
+        )
+        raise UserNotFoundException(
+            title='User was not found.',
+            details={'User was not found.': 'A user matching the provided id does not exist.'},
+        )
@@ -1,10 +1,26 @@
 from logging import getLogger
+from typing import AsyncIterator
 
 from settings import settings
 
-from application.exceptions import FileExtensionException, FileSizeException, UserNotFoundException
-from application.outgoing_dtos import OutgoingUserDTO
-from application.ports import DatabaseUnitOfWorkPort, FileStoragePort, UpdateChatRelatedUserPort, UserRepositoryPort
+from application.exceptions import FileExtensionException, FileSizeException
+from application.ports import (
+    AvatarJobRepositoryPort,
+    DatabaseUnitOfWorkPort,
+    FileStoragePort,
+    ImageProcessorPort,
+    OrphanedFileRepositoryPort,
+    OutboxRepositoryPort,
+    UserRepositoryPort,
+)
+from application.use_cases.process_avatar import ProcessAvatarUseCase
+
+
+signatures = {
+    '.jpg': b'\xff\xd8\xff',
+    '.jpeg': b'\xff\xd8\xff',
+    '.png': b'\x89PNG\r\n\x1a\n',
+}
 
 
 class UpdateAvatarUseCase:
@@ -14,36 +30,48 @@ class UpdateAvatarUseCase:
 
     def __init__(
         self,
-        avatar: bytes,
+        avatar: AsyncIterator[bytes],
         extension: str,
         user_id: int,
-        access_token: str,
+        previous_avatar: dict,
         file_storage: FileStoragePort,
+        image_processor: ImageProcessorPort,
         database_repo: UserRepositoryPort,
         database_uow: DatabaseUnitOfWorkPort,
-        http_service: UpdateChatRelatedUserPort,
+        outbox_repo: OutboxRepositoryPort,
+        orphaned_file_repo: OrphanedFileRepositoryPort,
+        avatar_job_repo: AvatarJobRepositoryPort | None = None,
+        access_token: str | None = None,
     ) -> None:
         """
         Initialize the use case.
 
         Args:
-            avatar (bytes): Avatar file bytes.
+            avatar (AsyncIterator[bytes]): The chunks of the avatar file.
             extension (str): File extension.
             user_id (int): User ID.
-            access_token (str): The token required to identify the user.
+            previous_avatar (dict): The avatar URL and the rendition URLs the user had before.
             file_storage (FileStoragePort): File storage port.
+            image_processor (ImageProcessorPort): The port that creates the thumbnails of the avatar.
             database_repo (UserRepositoryPort): User repository port.
             database_uow (DatabaseUnitOfWorkPort): Database unit of work.
-            http_service (UpdateChatRelatedUserPort): The port for the http service that updates chats.
+            outbox_repo (OutboxRepositoryPort): The outbox the update of chats is put into.
+            orphaned_file_repo (OrphanedFileRepositoryPort): The registry of the files that may be no longer used.
+            avatar_job_repo (AvatarJobRepositoryPort | None): The queue of the avatars to process in the background, if any.
+            access_token (str | None): The token the update of chats is delivered with, if the service token is not used.
         """
         self.avatar = avatar
         self.extension = extension
         self.user_id = user_id
-        self.access_token = access_token
+        self.previous_avatar = previous_avatar
         self.file_storage = file_storage
+        self.image_processor = image_processor
         self.database_repo = database_repo
         self.database_uow = database_uow
-        self.http_service = http_service
+        self.outbox_repo = outbox_repo
+        self.orphaned_file_repo = orphaned_file_repo
+        self.avatar_job_repo = avatar_job_repo
+        self.access_token = access_token
         self.logger = getLogger(settings.users_logger_name)
 
     def validate(self) -> None:
@@ -52,7 +80,6 @@ class UpdateAvatarUseCase:
 
         Raises:
             FileExtensionException: If the file's extension is not supported.
-            FileSizeException: If the file's size exceeds the limit.
         """
         if self.extension not in settings.allowed_extensions:
             self.logger.error(
@@ -63,54 +90,122 @@ class UpdateAvatarUseCase:
                 title='File extension exception.',
                 details={'File extension exception.': 'This extension is not supported.'},
             )
-        
-        if len(self.avatar) > settings.max_size:
+
+    def validate_signature(self, head: bytes) -> None:
+        """
+        Validate the beginning of the avatar content against the signature of the extension.
+
+        Args:
+            head (bytes): The first bytes of the avatar file.
+
+        Raises:
+            FileExtensionException: If the content does not match the extension.
+        """
+        if not head.startswith(signatures.get(self.extension, b'')):
             self.logger.error(
-                'An attempt to upload a file that is too large.',
-                extra={'user_id': self.user_id, 'event_type': 'File is too large.'}
+                'An attempt to upload file which content does not match the extension.',
+                extra={'user_id': self.user_id, 'event_type': 'Wrong file signature.'}
             )
-            raise FileSizeException(
-                title='File size exception.',
-                details={'File size exception.': 'The file size exceeded the allowed file size.'},
+            raise FileExtensionException(
+                title='File extension exception.',
+                details={'File extension exception.': 'The file content does not match its extension.'},
             )
-        
+
+    async def validate_stream(self) -> AsyncIterator[bytes]:
+        """
+        Pass the avatar chunks through while validating them.
+
+        The first chunks are held back until they cover the signature of the extension
+        the content is checked against, and the stream is aborted as soon as its size exceeds the limit.
+
+        Yields:
+            bytes: The chunks of the avatar file.
+
+        Raises:
+            FileExtensionException: If the content does not match the extension.
+            FileSizeException: If the file's size exceeds the limit.
+        """
+        signature = signatures.get(self.extension, b'')
+        head = b''
+        size = 0
+
+        async for chunk in self.avatar:
+            if len(head) < len(signature):
+                head += chunk
+
+                if len(head) < len(signature):
+                    continue
+
+                self.validate_signature(head=head)
+
+                chunk, head = head, signature
+
+            size += len(chunk)
+
+            if size > settings.max_size:
+                self.logger.error(
+                    'An attempt to upload a file that is too large.',
+                    extra={'user_id': self.user_id, 'event_type': 'File is too large.'}
+                )
+                raise FileSizeException(
+                    title='File size exception.',
+                    details={'File size exception.': 'The file size exceeded the allowed file size.'},
+                )
+
+            yield chunk
+
+        if len(head) < len(signature):
+            self.validate_signature(head=head)
+
     async def store_file(self) -> str:
         """
-        Store avatar in the local file storage and get it's full path.
+        Stream avatar into the local file storage and get it's path.
 
         Returns:
-            str: The full path of avatar.
+            str: The path of avatar in the storage.
         """
-        avatar_url = await self.file_storage.store(bfile=self.avatar, user_id=self.user_id, extension=self.extension)
-        return f'{settings.current_domain}/{avatar_url}'
+        return await self.file_storage.store(
+            stream=self.validate_stream(),
+            user_id=self.user_id,
+            extension=self.extension,
+        )
 
-    async def execute(self) -> str | None:
+    async def execute(self) -> dict:
         """"
         Execute the process.
 
         - Validate the incoming data.
-        - Store file in the storage.
-        - Update avatar in the database.
-        - Update user info in the messaging service.
+        - Stream file into the storage validating its content and size.
+        - Process the avatar right away or, if the job repository is provided,
+          leave it to the avatar worker and return the job.
+
+        Returns:
+            dict: The URLs of the avatar and its renditions or the id and the status of the job.
         """
         self.validate()
 
-        full_avatar_url = await self.store_file()
+        avatar_path = await self.store_file()
 
-        user_data = await self.database_repo.update_avatar(avatar_url=full_avatar_url, user_id=self.user_id)
+        if self.avatar_job_repo is not None:
+            await self.file_storage.publish(paths=[avatar_path])
 
-        outgoing_user = OutgoingUserDTO.create(user_data=user_data)
+            avatar_job = await self.avatar_job_repo.add_job(
+                data={'user_id': self.user_id, 'avatar_path': avatar_path, 'access_token': self.access_token},
+            )
+            await self.database_uow.commit()
+            return {'job_id': avatar_job.get('id'), 'status': avatar_job.get('status')}
 
-        if user_data is not None:
-            if await self.http_service.execute(access_token=self.access_token, user_data=outgoing_user.representation):
-                await self.database_uow.commit()
-                return {'avatar_url': full_avatar_url}
-        await self.file_storage.delete(path=full_avatar_url)
-        self.logger.error(
-            'A user with the provided id was not found.',
-            extra={'user_id': self.user_id, 'event_type': 'Invalid user during avatar update.'}
-        )
-        raise UserNotFoundException(
-            title='User was not found.',
-            details={'User was not found.': 'A user matching the provided id does not exist.'},
+        use_case = ProcessAvatarUseCase(
+            avatar_path=avatar_path,
+            user_id=self.user_id,
+            previous_avatar=self.previous_avatar,
+            file_storage=self.file_storage,
+            image_processor=self.image_processor,
+            database_repo=self.database_repo,
+            database_uow=self.database_uow,
+            outbox_repo=self.outbox_repo,
+            orphaned_file_repo=self.orphaned_file_repo,
+            access_token=self.access_token,
         )
+
+        return await use_case.execute()
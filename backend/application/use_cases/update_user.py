@@ -4,7 +4,7 @@ from settings import settings
 
 from application.exceptions import UserAlreadyExistsException, UserNotFoundException
 from application.outgoing_dtos import OutgoingUserDTO
-from application.ports import DatabaseUnitOfWorkPort, UpdateChatRelatedUserPort, UserRepositoryPort
+from application.ports import DatabaseUnitOfWorkPort, OutboxRepositoryPort, UserRepositoryPort
 
 
 class UpdateUserUseCase:
@@ -18,7 +18,7 @@ class UpdateUserUseCase:
         user_data: dict,
         database_repo: UserRepositoryPort,
         database_uow: DatabaseUnitOfWorkPort,
-        http_service: UpdateChatRelatedUserPort,
+        outbox_repo: OutboxRepositoryPort,
     ) -> None:
         """
         Initialize the use case.
@@ -27,12 +27,12 @@ class UpdateUserUseCase:
             user_data (dict): Raw data required to create a new user.
             database_repo (UserRepositoryPort): Repository responsible for storing user records.
             database_uow (DatabaseUnitOfWorkPort): Unit of Work ensuring atomic database operations.
-            http_service (UpdateChatRelatedUserPort): The port for the http service that updates chats.
+            outbox_repo (OutboxRepositoryPort): The outbox the update of chats is put into.
         """
         self.user_data = user_data
         self.database_repo = database_repo
         self.database_uow = database_uow
-        self.http_service = http_service
+        self.outbox_repo = outbox_repo
         self.logger = getLogger(settings.users_logger_name)
 
     async def validate(self) -> None:
@@ -45,11 +45,11 @@ class UpdateUserUseCase:
             UserAlreadyExistsException: Raisen if a user with the provided data already exist.
         """
         if (username := self.user_data.get('username')) is not None:
-            self.logger.error(
-                'An attempt to update a user info with the existing username.',
-                extra={'user_id': self.user_data.get('user_id'), 'event_type': 'Update user with existing username.'}
-            )
             if await self.database_repo.check_if_exists({'username': username}):
+                self.logger.error(
+                    'An attempt to update a user info with the existing username.',
+                    extra={'user_id': self.user_data.get('user_id'), 'event_type': 'Update user with existing username.'}
+                )
                 raise UserAlreadyExistsException(
                     title='User already exists.',
                     details={'username': 'A user with such username already exists.'},
@@ -72,26 +72,35 @@ class UpdateUserUseCase:
 
         - Validate the incoming data.
         - Update the information.
+        - Put the update of chats into the outbox within the same transaction.
         """
         await self.validate()
 
-        access_token = self.user_data.pop('access_token')
+        user_id = self.user_data.pop('user_id')
+        access_token = self.user_data.pop('access_token', None)
 
         user_data = await self.database_repo.update_user(
-            user_id=self.user_data.pop('user_id'),
+            user_id=user_id,
             user_data=self.user_data,
         )
 
-        outgoing_user = OutgoingUserDTO.create(user_data=user_data)
-
         if user_data is not None:
-            if await self.http_service.execute(access_token=access_token, user_data=outgoing_user.representation):
-                await self.database_uow.commit()
-                return user_data
+            outgoing_user = OutgoingUserDTO.create(user_data=user_data)
+
+            await self.outbox_repo.add_message(
+                data={
+                    'topic': settings.chat_related_user_topic,
+                    'key': f'user:{outgoing_user.id}',
+                    'payload': outgoing_user.representation,
+                    'access_token': access_token,
+                },
+            )
+            await self.database_uow.commit()
+            return user_data
 
         self.logger.error(
             'A user with the provided id was not found.',
-            extra={'user_id': self.user_id, 'event_type': 'Invalid user during the user info update.'}
+            extra={'user_id': user_id, 'event_type': 'Invalid user during the user info update.'}
         )
 
         raise UserNotFoundException(
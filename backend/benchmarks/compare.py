@@ -0,0 +1,104 @@
+"""
+Compare two results of the load benchmark, e.g. of the base and the head commits:
+
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/head.json --threshold 10
+
+Exits with 1 if the throughput of any scenario dropped or its p95 latency grew by more than the threshold,
+or if its error rate grew by more than the error threshold in percentage points. Failed requests are often
+answered faster than the successful ones, so a head that fails fast is not mistaken for a faster one.
+"""
+from argparse import ArgumentParser
+from json import load
+from sys import exit
+
+
+def get_change(base: float, head: float) -> float:
+    """
+    Get the relative change in percent.
+    """
+    if not base:
+        return 0.0
+    return (head - base) / base * 100
+
+def get_error_rate(summary: dict) -> float:
+    """
+    Get the share of the failed requests in percent.
+    """
+    if not summary.get('requests'):
+        return 0.0
+    return summary.get('errors') / summary.get('requests') * 100
+
+def compare(base: dict, head: dict, threshold: float, error_threshold: float) -> list[str]:
+    """
+    Print the changes of every scenario present in both results.
+
+    Returns:
+        list[str]: The scenarios that regressed beyond the thresholds.
+    """
+    regressions = []
+
+    print(
+        f'{"scenario":<16}{"rps base":>10}{"rps head":>10}{"change":>9}{"p95 base":>10}{"p95 head":>10}{"change":>9}'
+        f'{"err base":>10}{"err head":>10}'
+    )
+
+    for name, head_summary in head.get('scenarios').items():
+        if (base_summary := base.get('scenarios').get(name)) is None:
+            continue
+
+        throughput_change = get_change(base_summary.get('throughput'), head_summary.get('throughput'))
+        latency_change = get_change(
+            base_summary.get('latency_ms').get('p95'),
+            head_summary.get('latency_ms').get('p95'),
+        )
+        base_error_rate = get_error_rate(summary=base_summary)
+        head_error_rate = get_error_rate(summary=head_summary)
+
+        print(
+            f'{name:<16}{base_summary.get("throughput"):>10}{head_summary.get("throughput"):>10}'
+            f'{throughput_change:>8.1f}%'
+            f'{base_summary.get("latency_ms").get("p95"):>10}{head_summary.get("latency_ms").get("p95"):>10}'
+            f'{latency_change:>8.1f}%'
+            f'{base_error_rate:>9.1f}%{head_error_rate:>9.1f}%'
+        )
+
+        if head_error_rate - base_error_rate > error_threshold:
+            print(f'{"":<16}status codes base: {base_summary.get("status_codes")}, head: {head_summary.get("status_codes")}')
+            regressions.append(name)
+        elif throughput_change < -threshold or latency_change > threshold:
+            regressions.append(name)
+
+    return regressions
+
+def main() -> None:
+    parser = ArgumentParser(description='Compare two results of the load benchmark.')
+    parser.add_argument('base')
+    parser.add_argument('head')
+    parser.add_argument('--threshold', type=float, default=10.0, help='The tolerated regression in percent.')
+    parser.add_argument(
+        '--error-threshold',
+        type=float,
+        default=1.0,
+        help='The tolerated growth of the error rate in percentage points.',
+    )
+    arguments = parser.parse_args()
+
+    with open(arguments.base) as base_file, open(arguments.head) as head_file:
+        base, head = load(base_file), load(head_file)
+
+    print(f'base: {base.get("commit")}, head: {head.get("commit")}')
+
+    regressions = compare(
+        base=base,
+        head=head,
+        threshold=arguments.threshold,
+        error_threshold=arguments.error_threshold,
+    )
+
+    if regressions:
+        print(f'Regressed beyond the thresholds: {", ".join(regressions)}.')
+        exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+from json import load
+
+import pytest
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup('micro', 'The micro-benchmarks.')
+    group.addoption('--micro-baseline', help='The JSON results of benchmarks.micro to compare with.')
+    group.addoption('--micro-threshold', type=float, default=50.0, help='The tolerated regression in percent.')
+    group.addoption('--micro-min-time', type=float, default=0.2, help='The minimal duration of a batch in seconds.')
+    group.addoption('--micro-repeat', type=int, default=5, help='The number of measured batches per benchmark.')
+
+
+@pytest.fixture(scope='session')
+def micro_baseline(request: pytest.FixtureRequest) -> dict:
+    """
+    The best per-call times of the baseline by benchmark, empty if no baseline is provided.
+    """
+    if (path := request.config.getoption('--micro-baseline')) is None:
+        return {}
+
+    with open(path) as file:
+        return load(file).get('benchmarks')
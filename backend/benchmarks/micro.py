@@ -0,0 +1,226 @@
+"""
+Measure the per-call cost of the primitives every request goes through: the password hasher,
+the JWT manager, the representations of the entities and the InternalUserDTO round-trip
+of the repositories.
+
+    python -m benchmarks.micro
+    python -m benchmarks.micro --baseline benchmarks/results/micro-<base>.json --threshold 50
+
+Exits with 1 if the best per-call time of any benchmark present in the baseline grew by more
+than the threshold. The baseline must be measured on the same machine. The same check runs
+as a pytest suite, one test per benchmark:
+
+    python -m pytest benchmarks --micro-baseline benchmarks/results/micro-<base>.json --micro-threshold 50
+"""
+from argparse import ArgumentParser, Namespace
+from asyncio import Runner, run
+from datetime import datetime, timedelta, timezone
+from json import dump, load
+from os import makedirs
+from os.path import dirname, join
+from platform import python_version
+from statistics import median
+from sys import exit
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable
+
+from passlib.hash import pbkdf2_sha256
+
+from domain.entities import Session, User
+
+from infrastructure.internal_dtos import InternalUserDTO
+from infrastructure.security import DefaultHasher, JWTManager
+
+from benchmarks.compare import get_change
+from benchmarks.load import BACKEND_DIRECTORY, get_commit
+
+
+PASSWORD = 'benchmark-password'
+
+DEFAULT_ROUNDS = [1000, 29000, 100000]
+
+
+def measure(function: Callable[[], Any], min_time: float, repeat: int) -> dict:
+    def batch(calls: int) -> float:
+        started_at = perf_counter()
+        for _ in range(calls):
+            function()
+        return perf_counter() - started_at
+
+    return measure_batches(batch=batch, min_time=min_time, repeat=repeat)
+
+def measure_async(function: Callable[[], Awaitable], min_time: float, repeat: int) -> dict:
+    """
+    Measure a coroutine function.
+
+    All the batches run in a single event loop and are timed inside of it,
+    so neither starting a loop nor scheduling a batch is included.
+    """
+    async def batch(calls: int) -> float:
+        started_at = perf_counter()
+        for _ in range(calls):
+            await function()
+        return perf_counter() - started_at
+
+    with Runner() as runner:
+        return measure_batches(batch=lambda calls: runner.run(batch(calls)), min_time=min_time, repeat=repeat)
+
+def measure_batches(batch: Callable[[int], float], min_time: float, repeat: int) -> dict:
+    """
+    Run the batch with a number of calls large enough to take at least min_time.
+
+    Args:
+        batch (Callable): Makes the provided number of calls and returns the time they took.
+
+    Returns:
+        dict: The best and the median per-call times in microseconds and the batch size.
+    """
+    calls = 1
+
+    while (elapsed := batch(calls)) < min_time:
+        calls = max(calls * 2, int(calls * min_time / max(elapsed, 1e-9)))
+
+    timings = [elapsed / calls]
+
+    for _ in range(repeat - 1):
+        timings.append(batch(calls) / calls)
+
+    return {
+        'best_us': round(min(timings) * 1e6, 3),
+        'median_us': round(median(timings) * 1e6, 3),
+        'calls': calls,
+    }
+
+def get_benchmarks(rounds: list[int]) -> dict[str, tuple[Callable, bool]]:
+    """
+    Get the benchmarks by name along with whether they are coroutine functions.
+    """
+    hasher, jwt_manager = DefaultHasher(), JWTManager()
+    password_hash = run(hasher.hash(PASSWORD))
+    access_token = run(jwt_manager.issue_pair(user_id=1)).get('access_token')
+
+    now = datetime.now()
+    session = Session(
+        id=1,
+        user_id=1,
+        created_at=now,
+        valid_through=now + timedelta(hours=24),
+        user_agent='Mozilla/5.0 (X11; Linux x86_64; rv:127.0) Gecko/20100101 Firefox/127.0',
+        access_token=access_token,
+        refresh_token=access_token,
+        terminated=False,
+    )
+    user = User(id=1, username='benchmark', password=password_hash, email='benchmark@example.com', avatar_url='/a.jpg')
+    row = SimpleNamespace(
+        id=1,
+        username='benchmark',
+        password=password_hash,
+        email='benchmark@example.com',
+        avatar_url='/media/avatars/1/avatar.jpg',
+        avatar_renditions={'64': '/media/avatars/1/64.webp', '256': '/media/avatars/1/256.webp'},
+        version=1,
+        updated_at=now,
+    )
+
+    benchmarks = {
+        'hasher.hash': (lambda: hasher.hash(PASSWORD), True),
+        'hasher.verify': (lambda: hasher.verify(PASSWORD, password_hash), True),
+        'jwt.issue_pair': (lambda: jwt_manager.issue_pair(user_id=1), True),
+        'jwt.get_user_id': (lambda: jwt_manager.get_user_id(token=access_token), True),
+        'session.representation': (lambda: session.representation, False),
+        'user.representation': (lambda: user.representation, False),
+        'internal_user_dto.round_trip': (lambda: InternalUserDTO.model_validate(row).model_dump(), False),
+    }
+
+    for value in rounds:
+        handler = pbkdf2_sha256.using(rounds=value)
+        benchmarks[f'pbkdf2_sha256.hash[rounds={value}]'] = (lambda handler=handler: handler.hash(PASSWORD), False)
+
+    return benchmarks
+
+def check(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """
+    Print the changes of every benchmark present in both results.
+
+    Returns:
+        list[str]: The benchmarks that regressed beyond the threshold.
+    """
+    regressions = []
+
+    print(f'{"benchmark":<36}{"base us":>12}{"head us":>12}{"change":>9}')
+
+    for name, head_summary in results.get('benchmarks').items():
+        if (base_summary := baseline.get('benchmarks').get(name)) is None:
+            continue
+
+        change = get_change(base_summary.get('best_us'), head_summary.get('best_us'))
+        print(f'{name:<36}{base_summary.get("best_us"):>12}{head_summary.get("best_us"):>12}{change:>8.1f}%')
+
+        if change > threshold:
+            regressions.append(name)
+
+    return regressions
+
+def parse_arguments() -> Namespace:
+    parser = ArgumentParser(description='Run the micro-benchmarks of the security primitives and DTO conversions.')
+    parser.add_argument('--min-time', type=float, default=0.2, help='The minimal duration of a batch in seconds.')
+    parser.add_argument('--repeat', type=int, default=5, help='The number of measured batches per benchmark.')
+    parser.add_argument(
+        '--rounds',
+        type=lambda value: [int(item) for item in value.split(',')],
+        default=DEFAULT_ROUNDS,
+        help='Comma separated pbkdf2_sha256 rounds to measure the hashing cost at.',
+    )
+    parser.add_argument('--filter', help='Run only the benchmarks whose names contain the value.')
+    parser.add_argument('--baseline', help='The JSON results to compare with.')
+    parser.add_argument('--threshold', type=float, default=50.0, help='The tolerated regression in percent.')
+    parser.add_argument('--output', help='The JSON file to store the results in, benchmarks/results/ by default.')
+
+    return parser.parse_args()
+
+def main() -> None:
+    arguments = parse_arguments()
+    benchmarks = {}
+
+    for name, (function, is_coroutine) in get_benchmarks(rounds=arguments.rounds).items():
+        if arguments.filter and arguments.filter not in name:
+            continue
+
+        measure_function = measure_async if is_coroutine else measure
+        benchmarks[name] = measure_function(function, min_time=arguments.min_time, repeat=arguments.repeat)
+        print(f'{name:<36}{benchmarks[name].get("best_us"):>12} us', flush=True)
+
+    results = {
+        **get_commit(),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': python_version(),
+        'benchmarks': benchmarks,
+    }
+
+    output = arguments.output or join(
+        BACKEND_DIRECTORY,
+        'benchmarks',
+        'results',
+        f'micro-{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{(results.get("commit") or "unknown")[:12]}.json',
+    )
+    makedirs(dirname(output) or '.', exist_ok=True)
+
+    with open(output, 'w') as file:
+        dump(results, file, indent=2)
+
+    print(f'Results are stored in {output}')
+
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            baseline = load(file)
+
+        print(f'base: {baseline.get("commit")}, head: {results.get("commit")}')
+
+        if regressions := check(results=results, baseline=baseline, threshold=arguments.threshold):
+            print(f'Regressed by more than {arguments.threshold}%: {", ".join(regressions)}.')
+            exit(1)
+
+
+if __name__ == '__main__':
+    main()
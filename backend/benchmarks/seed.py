@@ -0,0 +1,263 @@
+"""
+Load a synthetic dataset of users, their sessions and relations for the scale tests.
+
+The rows are streamed with COPY by several worker processes, each loading chunks
+of users in transactions of their own. The users are derived from their numbers,
+so loading the same numbers again skips the existing users along with their
+sessions and relations, and an interrupted load can be resumed by running it again.
+
+    python -m benchmarks.seed --users 1000000 --sessions-per-user 3 --relations-per-user 5 --workers 8
+
+Every seeded user has the password provided with --password and the tokens
+of the seeded sessions are signed with the KEY of the settings.
+"""
+from argparse import ArgumentParser, Namespace
+from asyncio import run
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from random import Random
+from time import perf_counter
+
+from psycopg import Connection, connect
+from sqlalchemy.engine import make_url
+
+from settings import settings
+
+from infrastructure.database.models import users_version_lock_id
+from infrastructure.security import DefaultHasher, JWTManager
+
+
+NAMES = [
+    'alex', 'maria', 'ivan', 'olga', 'john', 'emma', 'liam', 'sofia', 'noah', 'mia',
+    'lucas', 'anna', 'mark', 'elena', 'david', 'kate', 'peter', 'julia', 'max', 'nina',
+]
+
+USER_AGENTS = [
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Safari/537.36',
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_5) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.5 Safari/605.1.15',
+    'Mozilla/5.0 (X11; Linux x86_64; rv:127.0) Gecko/20100101 Firefox/127.0',
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 17_5 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148',
+    'Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0 Mobile Safari/537.36',
+    'ChatApp/2.4.1 (Android 13; SM-S911B)',
+    'ChatApp/2.4.0 (iOS 17.4; iPhone15,2)',
+    'okhttp/4.12.0',
+]
+
+
+def get_connection_url() -> str:
+    """
+    Get the libpq URL of the database from the SQLAlchemy one in the settings.
+    """
+    return make_url(settings.database_url).set(drivername='postgresql').render_as_string(hide_password=False)
+
+def get_username(number: int) -> str:
+    return f'{NAMES[number % len(NAMES)]}_{number}'
+
+def create_users(connection: Connection, numbers: range, password_hash: str) -> list[int]:
+    """
+    Load the users with the provided numbers skipping the existing ones.
+
+    The rows are copied into a temporary table and moved to the users table at once,
+    so the conflicts with the existing users are resolved by a single statement.
+
+    Returns:
+        list[int]: The ids of the created users.
+    """
+    avatar_url = f'{settings.media_root}/default.jpg'
+
+    connection.execute(
+        'CREATE TEMPORARY TABLE seed_users (username text, email text, password text, avatar_url text) ON COMMIT DROP',
+    )
+
+    with connection.cursor() as cursor:
+        with cursor.copy('COPY seed_users (username, email, password, avatar_url) FROM STDIN') as copy:
+            for number in numbers:
+                username = get_username(number=number)
+                copy.write_row((username, f'{username}@seed.example', password_hash, avatar_url))
+
+        # The versions of the users are assigned here, the change feed must wait for the load to commit.
+        cursor.execute('SELECT pg_advisory_xact_lock_shared(%s)', (users_version_lock_id,))
+        cursor.execute(
+            'INSERT INTO users (username, email, password, avatar_url) '
+            'SELECT username, email, password, avatar_url FROM seed_users '
+            'ON CONFLICT DO NOTHING RETURNING id',
+        )
+
+        return [row[0] for row in cursor.fetchall()]
+
+async def issue_tokens(user_id: int, created_at: datetime) -> tuple[str, str]:
+    """
+    Issue the access and the refresh token of a session with the expiration times JWTManager.issue_pair
+    sets, counted from the creation of the session.
+    """
+    jwt_manager = JWTManager()
+    issued_at = created_at.replace(tzinfo=settings.default_tz)
+
+    return (
+        await jwt_manager.issue_token(expiration_time=issued_at + timedelta(minutes=720), user_id=user_id),
+        await jwt_manager.issue_token(expiration_time=issued_at + timedelta(minutes=1440), user_id=user_id),
+    )
+
+async def create_session_rows(user_ids: list[int], sessions_per_user: int, random: Random) -> list[tuple]:
+    """
+    Create the sessions of the users with various user agents, ages and states.
+
+    The times are naive in settings.default_tz like the ones SessionModel sets.
+    """
+    now = datetime.now(settings.default_tz).replace(tzinfo=None)
+    rows = []
+
+    for user_id in user_ids:
+        for _ in range(sessions_per_user):
+            created_at = now - timedelta(seconds=random.randint(0, 30 * 24 * 3600))
+            valid_through = created_at + timedelta(hours=24)
+            terminated = valid_through < now and random.random() < 0.5
+            access_token, refresh_token = await issue_tokens(user_id=user_id, created_at=created_at)
+
+            rows.append(
+                (user_id, created_at, valid_through, random.choice(USER_AGENTS), access_token, refresh_token, terminated),
+            )
+
+    return rows
+
+def create_sessions(connection: Connection, user_ids: list[int], sessions_per_user: int, random: Random) -> int:
+    """
+    Load the sessions of the users.
+
+    The tokens are JWTs signed with settings.key, so the sessions that are neither
+    expired nor terminated can be used against an instance that shares the key.
+
+    Returns:
+        int: The number of the created sessions.
+    """
+    rows = run(create_session_rows(user_ids=user_ids, sessions_per_user=sessions_per_user, random=random))
+
+    with connection.cursor() as cursor:
+        with cursor.copy(
+            'COPY sessions (user_id, created_at, valid_through, user_agent, access_token, refresh_token, terminated) '
+            'FROM STDIN'
+        ) as copy:
+            for row in rows:
+                copy.write_row(row)
+
+    return len(rows)
+
+def create_relations(connection: Connection, user_ids: list[int], relations_per_user: int, random: Random) -> int:
+    """
+    Load the relations between the users of a chunk, every pair is stored once ordered by id.
+
+    Returns:
+        int: The number of the created relations.
+    """
+    if len(user_ids) < 2:
+        return 0
+
+    connection.execute('CREATE TEMPORARY TABLE seed_relations (user_one_id int, user_two_id int) ON COMMIT DROP')
+
+    with connection.cursor() as cursor:
+        with cursor.copy('COPY seed_relations (user_one_id, user_two_id) FROM STDIN') as copy:
+            for user_id in user_ids:
+                for partner_id in random.sample(user_ids, min(relations_per_user + 1, len(user_ids))):
+                    if partner_id != user_id:
+                        copy.write_row((min(user_id, partner_id), max(user_id, partner_id)))
+
+        cursor.execute(
+            'INSERT INTO user_relations (user_one_id, user_two_id) '
+            'SELECT DISTINCT user_one_id, user_two_id FROM seed_relations '
+            'ON CONFLICT DO NOTHING',
+        )
+
+        return cursor.rowcount
+
+def load_chunk(start: int, stop: int, arguments: Namespace, password_hash: str) -> dict:
+    """
+    Load a chunk of users with their sessions and relations in a single transaction.
+
+    Runs in a worker process, the random generator is seeded by the chunk, so the same
+    chunk always gets the same data.
+
+    Returns:
+        dict: The number of the created rows by table.
+    """
+    random = Random(f'{arguments.seed}:{start}')
+
+    with connect(get_connection_url()) as connection:
+        user_ids = create_users(connection=connection, numbers=range(start, stop), password_hash=password_hash)
+
+        sessions = create_sessions(
+            connection=connection,
+            user_ids=user_ids,
+            sessions_per_user=arguments.sessions_per_user,
+            random=random,
+        )
+        relations = create_relations(
+            connection=connection,
+            user_ids=user_ids,
+            relations_per_user=arguments.relations_per_user,
+            random=random,
+        )
+
+        connection.commit()
+
+    return {'users': len(user_ids), 'sessions': sessions, 'user_relations': relations}
+
+def analyze() -> None:
+    """
+    Refresh the planner statistics of the seeded tables.
+    """
+    with connect(get_connection_url(), autocommit=True) as connection:
+        for table in ('users', 'sessions', 'user_relations'):
+            connection.execute(f'ANALYZE {table}')
+
+def parse_arguments() -> Namespace:
+    parser = ArgumentParser(description='Load a synthetic dataset for the scale tests.')
+    parser.add_argument('--users', type=int, required=True, help='The number of users.')
+    parser.add_argument('--start', type=int, default=0, help='The number of the first user.')
+    parser.add_argument('--sessions-per-user', type=int, default=2)
+    parser.add_argument('--relations-per-user', type=int, default=5)
+    parser.add_argument('--chunk-size', type=int, default=10000, help='The number of users loaded in a transaction.')
+    parser.add_argument('--workers', type=int, default=4, help='The number of the worker processes.')
+    parser.add_argument('--password', default='seed-password', help='The password of every seeded user.')
+    parser.add_argument('--seed', type=int, default=0, help='The seed of the random data.')
+    parser.add_argument('--no-analyze', action='store_true', help='Do not run ANALYZE after the load.')
+
+    return parser.parse_args()
+
+def main() -> None:
+    arguments = parse_arguments()
+    password_hash = run(DefaultHasher().hash(arguments.password))
+
+    stop = arguments.start + arguments.users
+    chunks = [
+        (start, min(start + arguments.chunk_size, stop))
+        for start in range(arguments.start, stop, arguments.chunk_size)
+    ]
+    totals = {'users': 0, 'sessions': 0, 'user_relations': 0}
+    started_at = perf_counter()
+
+    with ProcessPoolExecutor(max_workers=arguments.workers) as executor:
+        futures = [
+            executor.submit(load_chunk, start, chunk_stop, arguments, password_hash)
+            for start, chunk_stop in chunks
+        ]
+
+        for number, future in enumerate(futures, start=1):
+            for table, count in future.result().items():
+                totals[table] += count
+
+            elapsed = perf_counter() - started_at
+            rows = sum(totals.values())
+            print(f'{number}/{len(chunks)} chunks, {rows} rows, {rows / elapsed:.0f} rows/s', flush=True)
+
+    elapsed = perf_counter() - started_at
+
+    for table, count in totals.items():
+        print(f'{table}: {count} rows created, {count / elapsed:.0f} rows/s')
+    print(f'Loaded {sum(totals.values())} rows in {elapsed:.1f}s, {sum(totals.values()) / elapsed:.0f} rows/s')
+
+    if not arguments.no_analyze:
+        analyze()
+
+
+if __name__ == '__main__':
+    main()
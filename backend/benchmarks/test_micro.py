@@ -0,0 +1,45 @@
+"""
+The micro-benchmarks as a pytest suite, one test per benchmark.
+
+    python -m pytest benchmarks --micro-baseline benchmarks/results/micro-<base>.json --micro-threshold 50
+
+A benchmark fails if its best per-call time grew by more than the threshold since the baseline,
+which must be measured on the same machine. Without a baseline the benchmarks are only measured.
+"""
+from typing import Callable
+
+import pytest
+
+from benchmarks.compare import get_change
+from benchmarks.micro import DEFAULT_ROUNDS, get_benchmarks, measure, measure_async
+
+
+benchmarks = get_benchmarks(rounds=DEFAULT_ROUNDS)
+
+
+@pytest.mark.parametrize('name', list(benchmarks))
+def test_micro_benchmark(
+    name: str,
+    micro_baseline: dict,
+    request: pytest.FixtureRequest,
+    record_property: Callable[[str, object], None],
+) -> None:
+    function, is_coroutine = benchmarks.get(name)
+    measure_function = measure_async if is_coroutine else measure
+
+    summary = measure_function(
+        function,
+        min_time=request.config.getoption('--micro-min-time'),
+        repeat=request.config.getoption('--micro-repeat'),
+    )
+    record_property('best_us', summary.get('best_us'))
+
+    if (base_summary := micro_baseline.get(name)) is None:
+        return
+
+    threshold = request.config.getoption('--micro-threshold')
+    change = get_change(base_summary.get('best_us'), summary.get('best_us'))
+
+    assert change <= threshold, (
+        f'{name} regressed by {change:.1f}%: {base_summary.get("best_us")} us -> {summary.get("best_us")} us.'
+    )
@@ -4,7 +4,7 @@ from infrastructure.exception_handlers import setup_exception_handlers
 from infrastructure.handlers import setup_handlers
 from infrastructure.logging import setup_logging
 from infrastructure.middleware import setup_middleware
-from infrastructure.monitoring import setup_metrics
+from infrastructure.monitoring import setup_metrics, setup_tracing
 
 from lifespan import lifespan
 
@@ -16,6 +16,7 @@ def compose_application() -> FastAPI:
     - Setup routers.
     - Setup exception handlers.
     - Setup middleware.
+    - Setup tracing.
     - Setup metrics.
     - Setup logging.
 
@@ -27,6 +28,7 @@ def compose_application() -> FastAPI:
     setup_handlers(application=application)
     setup_exception_handlers(application=application)
     setup_middleware(application=application)
+    setup_tracing()
     setup_metrics(application=application)
 
     setup_logging()
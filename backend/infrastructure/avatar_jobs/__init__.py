@@ -0,0 +1 @@
+from infrastructure.avatar_jobs.worker import AvatarJobWorker
@@ -0,0 +1,229 @@
+from asyncio import Event, Task, TimeoutError, get_running_loop, wait_for
+from datetime import datetime, timedelta, timezone
+from logging import getLogger
+from time import perf_counter
+from typing import Callable
+
+from opentelemetry.metrics import get_meter
+
+from settings import settings
+
+from application.exceptions import ApplicationException, AvatarSupersededException
+from application.ports import DatabaseUnitOfWorkPort, FileStoragePort
+from infrastructure.database.repositories import (
+    AvatarJobRepository,
+    OrphanedFileRepository,
+    OutboxRepository,
+    UserRepository,
+)
+from infrastructure.images import ImageProcessor
+from interface_adapters.controllers import ProcessAvatarController
+
+
+meter = get_meter(__name__)
+
+processed_jobs = meter.create_counter(
+    name='avatar_jobs.processed',
+    unit='{job}',
+    description='The number of avatar jobs processed by the worker by their outcome.',
+)
+queue_time = meter.create_histogram(
+    name='avatar_jobs.queue_time',
+    unit='s',
+    description='The time between queueing an avatar and claiming it for the processing.',
+)
+processing_duration = meter.create_histogram(
+    name='avatar_jobs.processing.duration',
+    unit='s',
+    description='The duration of processing a single avatar job.',
+)
+
+
+class AvatarJobWorker:
+    """
+    The background worker that processes the avatars uploaded in the asynchronous mode.
+
+    Jobs are claimed in batches with FOR UPDATE SKIP LOCKED and marked as processing,
+    so several workers can run at once. A job that stays in processing for longer than
+    settings.avatar_jobs_timeout, e.g. because its worker was stopped, is claimed again
+    until settings.avatar_jobs_max_attempts is reached, then it fails and its upload is
+    registered as an orphaned file.
+
+    The jobs of a user may be processed concurrently or out of order, e.g. when one of them
+    is retried. The user is locked while the avatar is applied and a job is superseded if an
+    avatar queued later has already been applied, so an older upload never replaces a newer one.
+    """
+
+    def __init__(
+        self,
+        unit_of_work_factory: Callable[[], DatabaseUnitOfWorkPort],
+        file_storage: FileStoragePort,
+        image_processor: ImageProcessor,
+    ) -> None:
+        """
+        Initialize the worker.
+
+        Args:
+            unit_of_work_factory (Callable): Creates the unit of work each job runs in.
+            file_storage (FileStoragePort): The storage the avatars are staged in.
+            image_processor (ImageProcessor): Creates the thumbnails of the avatars.
+        """
+        self.unit_of_work_factory = unit_of_work_factory
+        self.file_storage = file_storage
+        self.image_processor = image_processor
+        self.stopping = Event()
+        self.task: Task | None = None
+        self.logger = getLogger(settings.avatar_jobs_logger_name)
+
+    def start(self) -> None:
+        self.task = get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        """
+        Let the current batch finish and stop the worker.
+        """
+        self.stopping.set()
+
+        if self.task is not None:
+            await self.task
+
+    async def run(self) -> None:
+        while not self.stopping.is_set():
+            try:
+                claimed = await self.process_batch()
+            except Exception:
+                self.logger.exception(
+                    'Failed to process the avatar jobs.',
+                    extra={'user_id': None, 'event_type': 'Avatar jobs processing failed.'},
+                )
+                claimed = 0
+
+            if claimed < settings.avatar_jobs_batch_size:
+                try:
+                    await wait_for(self.stopping.wait(), timeout=settings.avatar_jobs_poll_interval)
+                except TimeoutError:
+                    pass
+
+    async def process_batch(self) -> int:
+        """
+        Claim a batch of the jobs and process them one by one.
+
+        The image processing is already spread over the process pool,
+        so the jobs of a batch are not processed concurrently.
+
+        Returns:
+            int: The number of claimed jobs.
+        """
+        jobs = await self.claim()
+
+        for job in jobs:
+            if self.stopping.is_set():
+                break
+            await self.process(job=job)
+
+        return len(jobs)
+
+    async def claim(self) -> list[dict]:
+        """
+        Claim the due jobs and mark them as processing.
+
+        The jobs that have used up their attempts are marked as failed instead
+        and their uploads are registered to be deleted once no user references them.
+
+        Returns:
+            list[dict]: The jobs to process.
+        """
+        now = datetime.now(timezone.utc)
+
+        async with self.unit_of_work_factory() as database_uow:
+            repository = AvatarJobRepository(session=database_uow.session)
+
+            jobs = await repository.claim_jobs(
+                limit=settings.avatar_jobs_batch_size,
+                stalled_before=now - timedelta(seconds=settings.avatar_jobs_timeout),
+            )
+
+            exhausted_jobs = [job for job in jobs if job.get('attempts') >= settings.avatar_jobs_max_attempts]
+            exhausted_ids = {job.get('id') for job in exhausted_jobs}
+            jobs = [job for job in jobs if job.get('id') not in exhausted_ids]
+
+            for job in exhausted_jobs:
+                await OrphanedFileRepository(session=database_uow.session).add_file(
+                    data={
+                        'url': f'{settings.current_domain}/{job.get("avatar_path")}',
+                        'paths': [job.get('avatar_path')],
+                    },
+                )
+
+            if exhausted_ids:
+                await repository.update_jobs(
+                    ids=exhausted_ids,
+                    data={
+                        'status': 'failed',
+                        'error': {
+                            'title': 'Avatar processing failed.',
+                            'Avatar processing failed.': 'The processing did not finish within the allowed attempts.',
+                        },
+                    },
+                )
+                processed_jobs.add(len(exhausted_ids), {'avatar_jobs.job.status': 'failed'})
+
+            for job in jobs:
+                await repository.update_jobs(
+                    ids={job.get('id')},
+                    data={'status': 'processing', 'attempts': job.get('attempts') + 1},
+                )
+
+            await database_uow.commit()
+
+        for job in jobs:
+            if job.get('attempts') == 0:
+                queue_time.record((now - job.get('created_at')).total_seconds())
+
+        return jobs
+
+    async def process(self, job: dict) -> None:
+        """
+        Process a single job and record its outcome.
+
+        The avatar is updated and the job is finished in separate transactions, a job that
+        is interrupted in between is processed once more after the timeout.
+        """
+        started_at = perf_counter()
+
+        async with self.unit_of_work_factory() as database_uow:
+            controller = ProcessAvatarController(
+                avatar_job=job,
+                file_storage=self.file_storage,
+                image_processor=self.image_processor,
+                database_repo=UserRepository(session=database_uow.session),
+                database_uow=database_uow,
+                outbox_repo=OutboxRepository(session=database_uow.session),
+                orphaned_file_repo=OrphanedFileRepository(session=database_uow.session),
+            )
+
+            try:
+                result = await controller.process_avatar()
+            except AvatarSupersededException as exception:
+                await database_uow.rollback()
+                data = {'status': 'superseded', 'error': {'title': exception.title, **exception.details}}
+            except ApplicationException as exception:
+                await database_uow.rollback()
+                data = {'status': 'failed', 'error': {'title': exception.title, **exception.details}}
+            except Exception:
+                await database_uow.rollback()
+                self.logger.exception(
+                    'Failed to process an avatar job.',
+                    extra={'user_id': job.get('user_id'), 'event_type': 'Avatar job failed.'},
+                )
+                data = {'status': 'pending'}
+            else:
+                data = {'status': 'succeeded', 'result': result}
+
+            repository = AvatarJobRepository(session=database_uow.session)
+
+            await repository.update_jobs(ids={job.get('id')}, data=data)
+            await database_uow.commit()
+
+        processed_jobs.add(1, {'avatar_jobs.job.status': data.get('status')})
+        processing_duration.record(perf_counter() - started_at, {'avatar_jobs.job.status': data.get('status')})
@@ -0,0 +1 @@
+from infrastructure.database.loaders.user import UserLoader
@@ -0,0 +1,129 @@
+from asyncio import CancelledError, Future, Task, TimerHandle, get_running_loop
+from typing import Callable, Type
+
+from opentelemetry.metrics import get_meter
+
+from settings import settings
+
+from application.ports import DatabaseUnitOfWorkPort, UserRepositoryPort
+
+
+meter = get_meter(__name__)
+
+batch_size = meter.create_histogram(
+    name='db.loader.batch.size',
+    unit='{id}',
+    description='The number of distinct ids fetched by a single batch query.',
+)
+loads = meter.create_counter(
+    name='db.loader.loads',
+    unit='{load}',
+    description='The number of lookups requested from the loader.',
+)
+queries = meter.create_counter(
+    name='db.loader.queries',
+    unit='{query}',
+    description='The number of batch queries issued by the loader.',
+)
+
+
+class UserLoader:
+    """
+    The per-process loader that coalesces the lookups of users by id.
+
+    Lookups that arrive within settings.user_loader_window seconds are fetched
+    by a single query and the results are fanned back out to the callers.
+    A batch is dispatched early once it reaches settings.user_loader_max_batch_size ids.
+    """
+
+    def __init__(
+        self,
+        unit_of_work_factory: Callable[[], DatabaseUnitOfWorkPort],
+        repository_class: Type[UserRepositoryPort],
+    ) -> None:
+        """
+        Initialize the loader.
+
+        Args:
+            unit_of_work_factory (Callable): Creates the unit of work each batch query runs in.
+            repository_class (Type[UserRepositoryPort]): The repository the batch query is run with.
+        """
+        self.unit_of_work_factory = unit_of_work_factory
+        self.repository_class = repository_class
+        self.pending: dict[int, list[Future]] = {}
+        self.timer: TimerHandle | None = None
+        self.tasks: set[Task] = set()
+        self.attributes = {'db.loader.name': 'users'}
+
+    async def load(self, user_id: int) -> dict | None:
+        """
+        Load a user by id.
+
+        Args:
+            user_id (int): The id of the user.
+
+        Returns:
+            dict | None: User DTO or None if not found.
+        """
+        loop = get_running_loop()
+        future = loop.create_future()
+
+        self.pending.setdefault(user_id, []).append(future)
+        loads.add(1, self.attributes)
+
+        if len(self.pending) >= settings.user_loader_max_batch_size:
+            self.dispatch()
+        elif self.timer is None:
+            self.timer = loop.call_later(settings.user_loader_window, self.dispatch)
+
+        return await future
+
+    def dispatch(self) -> None:
+        """
+        Send the pending lookups as one batch.
+        """
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+
+        batch, self.pending = self.pending, {}
+
+        if batch:
+            task = get_running_loop().create_task(self.load_batch(batch=batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def load_batch(self, batch: dict[int, list[Future]]) -> None:
+        """
+        Fetch the users of the batch and resolve the futures waiting for them.
+
+        An error of the query is raised to every waiter and the waiters are cancelled
+        along with the query, so none of them waits forever.
+
+        Args:
+            batch (dict): The futures waiting for the users grouped by user id.
+        """
+        batch_size.record(len(batch), self.attributes)
+        queries.add(1, self.attributes)
+
+        try:
+            async with self.unit_of_work_factory() as database_uow:
+                users = await self.repository_class(session=database_uow.session).get_by_ids(ids=list(batch))
+        except CancelledError:
+            for futures in batch.values():
+                for future in futures:
+                    future.cancel()
+            raise
+        except Exception as exception:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(exception)
+            return
+
+        users_by_id = {user.get('id'): user for user in users}
+
+        for user_id, futures in batch.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(users_by_id.get(user_id))
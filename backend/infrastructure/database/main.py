@@ -1,16 +1,75 @@
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from settings import settings
 
+from infrastructure.database.pool import InstrumentedAsyncQueuePool
+from infrastructure.monitoring.database import instrument_engine
+
+
+def get_connect_args(database_url: str) -> dict:
+    """
+    Get the driver specific connection arguments.
+
+    Args:
+        database_url (str): The database URL.
+
+    Returns:
+        dict: The arguments that are passed to the DBAPI connect call.
+    """
+    if make_url(database_url).get_driver_name() == 'psycopg':
+        return {'prepare_threshold': settings.database_prepare_threshold}
+    return {}
+
+def get_engine_options(database_url: str, pool_name: str) -> dict:
+    """
+    Get the engine and pool options.
+
+    Args:
+        database_url (str): The database URL.
+        pool_name (str): The name the pool is reported under in the logs and metrics.
+
+    Returns:
+        dict: The keyword arguments for create_async_engine.
+    """
+    return {
+        'echo': settings.echo,
+        'future': True,
+        'poolclass': InstrumentedAsyncQueuePool,
+        'pool_logging_name': pool_name,
+        'pool_size': settings.database_pool_size,
+        'max_overflow': settings.database_max_overflow,
+        'pool_timeout': settings.database_pool_timeout,
+        'pool_recycle': settings.database_pool_recycle,
+        'pool_pre_ping': settings.database_pool_pre_ping,
+        'connect_args': get_connect_args(database_url),
+    }
 
 def create_engine() -> AsyncEngine:
-    return create_async_engine(
+    engine = create_async_engine(
         settings.database_url,
-        echo=settings.echo,
-        pool_pre_ping=True,
-        future=True,
+        **get_engine_options(database_url=settings.database_url, pool_name='primary'),
     )
 
+    return instrument_engine(engine)
+
+def create_replica_engine() -> AsyncEngine | None:
+    """
+    Create an engine for the read replica.
+
+    Returns:
+        AsyncEngine | None: The replica engine or None if no replica is configured.
+    """
+    if not settings.replica_database_url:
+        return None
+
+    engine = create_async_engine(
+        settings.replica_database_url,
+        **get_engine_options(database_url=settings.replica_database_url, pool_name='replica'),
+    )
+
+    return instrument_engine(engine)
+
 def create_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
     return async_sessionmaker(
         bind=engine,
@@ -1,4 +1,7 @@
+from infrastructure.database.models.avatar_job import AvatarJobModel
 from infrastructure.database.models.base import BaseModel
+from infrastructure.database.models.orphaned_file import OrphanedFileModel
+from infrastructure.database.models.outbox_message import OutboxMessageModel
 from infrastructure.database.models.session import SessionModel
-from infrastructure.database.models.user import UserModel
+from infrastructure.database.models.user import UserModel, users_version_lock_id
 from infrastructure.database.models.user_relation import UserRelationModel
@@ -0,0 +1,39 @@
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, JSON, String, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from infrastructure.database.models.base import BaseModel
+
+
+class AvatarJobModel(BaseModel):
+    __tablename__ = 'avatar_jobs'
+
+    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: uuid4().hex)
+    user_id: Mapped[int] = mapped_column(ForeignKey('users.id', ondelete='CASCADE'), index=True, nullable=False)
+    status: Mapped[str] = mapped_column(String, default='pending', server_default='pending', nullable=False)
+    avatar_path: Mapped[str] = mapped_column(String, nullable=False)
+    access_token: Mapped[str | None] = mapped_column(String, nullable=True)
+    result: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    error: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default='0', nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.clock_timestamp(),
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        Index(
+            'ix_avatar_jobs_unfinished',
+            'updated_at',
+            postgresql_where=text("status IN ('pending', 'processing')"),
+        ),
+    )
@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, JSON, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from infrastructure.database.models.base import BaseModel
+
+
+class OrphanedFileModel(BaseModel):
+    __tablename__ = 'orphaned_files'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    url: Mapped[str] = mapped_column(String, nullable=False)
+    paths: Mapped[list] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        index=True,
+        nullable=False,
+    )
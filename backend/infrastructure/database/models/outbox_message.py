@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, Integer, JSON, String, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from infrastructure.database.models.base import BaseModel
+
+
+class OutboxMessageModel(BaseModel):
+    __tablename__ = 'outbox_messages'
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    topic: Mapped[str] = mapped_column(String, nullable=False)
+    key: Mapped[str] = mapped_column(String, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    access_token: Mapped[str | None] = mapped_column(String, nullable=True)
+    status: Mapped[str] = mapped_column(String, default='pending', server_default='pending', nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default='0', nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    available_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    dispatched_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        Index(
+            'ix_outbox_messages_pending',
+            'available_at',
+            'id',
+            postgresql_where=text("status IN ('pending', 'processing')"),
+        ),
+        Index('ix_outbox_messages_key', 'key', 'id'),
+        Index(
+            'ix_outbox_messages_finished',
+            'updated_at',
+            postgresql_where=text("status IN ('dispatched', 'superseded', 'failed')"),
+        ),
+    )
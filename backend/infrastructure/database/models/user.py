@@ -1,4 +1,6 @@
-from sqlalchemy import Integer, String
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Integer, JSON, Sequence, String, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from settings import settings
@@ -6,6 +8,13 @@ from settings import settings
 from infrastructure.database.models.base import BaseModel
 
 
+users_version_sequence = Sequence('users_version_seq')
+
+# The advisory lock the writers of users hold in shared mode from the moment a version is assigned
+# until their transaction ends. The change feed takes it exclusively to wait for such transactions.
+users_version_lock_id = 7533521
+
+
 class UserModel(BaseModel):
     __tablename__ = 'users'
 
@@ -13,4 +22,21 @@ class UserModel(BaseModel):
     username: Mapped[str] = mapped_column(String, unique=True, nullable=False)
     password: Mapped[str] = mapped_column(String, nullable=False)
     email: Mapped[str] = mapped_column(String, unique=True, nullable=False)
-    avatar_url: Mapped[str] = mapped_column(String, default=f'{settings.media_root}/default.jpg')
+    avatar_url: Mapped[str] = mapped_column(String, default=f'{settings.media_root}/default.jpg', index=True)
+    avatar_renditions: Mapped[dict] = mapped_column(JSON, default=dict, server_default='{}', nullable=False)
+    avatar_queued_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    version: Mapped[int] = mapped_column(
+        BigInteger,
+        users_version_sequence,
+        server_default=users_version_sequence.next_value(),
+        onupdate=users_version_sequence.next_value(),
+        unique=True,
+        index=True,
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.clock_timestamp(),
+        onupdate=func.clock_timestamp(),
+        nullable=False,
+    )
@@ -0,0 +1,94 @@
+from time import perf_counter
+from typing import Iterable
+from weakref import WeakSet
+
+from opentelemetry.metrics import CallbackOptions, Observation, get_meter
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+
+from settings import settings
+
+
+meter = get_meter(__name__)
+
+pools: WeakSet['InstrumentedAsyncQueuePool'] = WeakSet()
+
+
+def observe_connections(options: CallbackOptions) -> Iterable[Observation]:
+    for pool in list(pools):
+        attributes = {'db.client.connection.pool.name': pool.logging_name}
+        yield Observation(pool.checkedout(), {**attributes, 'db.client.connection.state': 'used'})
+        yield Observation(pool.checkedin(), {**attributes, 'db.client.connection.state': 'idle'})
+
+def observe_overflow(options: CallbackOptions) -> Iterable[Observation]:
+    for pool in list(pools):
+        yield Observation(max(pool.overflow(), 0), {'db.client.connection.pool.name': pool.logging_name})
+
+def observe_max_connections(options: CallbackOptions) -> Iterable[Observation]:
+    """
+    Report the configured maximum, nothing is reported if the overflow is unlimited (-1).
+    """
+    if settings.database_max_overflow < 0:
+        return
+
+    for pool in list(pools):
+        yield Observation(
+            settings.database_pool_size + settings.database_max_overflow,
+            {'db.client.connection.pool.name': pool.logging_name},
+        )
+
+
+meter.create_observable_gauge(
+    name='db.client.connection.count',
+    callbacks=[observe_connections],
+    unit='{connection}',
+    description='The number of connections that are currently in the state described by the state attribute.',
+)
+meter.create_observable_gauge(
+    name='db.client.connection.overflow',
+    callbacks=[observe_overflow],
+    unit='{connection}',
+    description='The number of connections opened above the pool size.',
+)
+meter.create_observable_gauge(
+    name='db.client.connection.max',
+    callbacks=[observe_max_connections],
+    unit='{connection}',
+    description='The maximum number of open connections allowed.',
+)
+
+checkout_wait_time = meter.create_histogram(
+    name='db.client.connection.wait_time',
+    unit='s',
+    description='The time it took to obtain a connection from the pool.',
+)
+checkout_timeouts = meter.create_counter(
+    name='db.client.connection.timeouts',
+    unit='{timeout}',
+    description='The number of connection checkouts that timed out waiting for a free connection.',
+)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    The default asyncio queue pool that reports its saturation to OpenTelemetry.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        pools.add(self)
+
+    def connect(self) -> PoolProxiedConnection:
+        """
+        Check out a connection and record how long it took.
+        """
+        attributes = {'db.client.connection.pool.name': self.logging_name}
+        started_at = perf_counter()
+
+        try:
+            return super().connect()
+        except TimeoutError:
+            checkout_timeouts.add(1, attributes)
+            raise
+        finally:
+            checkout_wait_time.record(perf_counter() - started_at, attributes)
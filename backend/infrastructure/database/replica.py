@@ -0,0 +1,82 @@
+from asyncio import Lock, wait_for
+from logging import getLogger
+from time import monotonic
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from settings import settings
+
+
+class ReplicaLagMonitor:
+    """
+    Track the replication lag of the read replica.
+
+    The lag is measured at most once per settings.replica_lag_check_interval
+    so the check does not add a round trip to every read.
+    """
+
+    lag_statement = text(
+        'SELECT COALESCE('
+        'CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+        'ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END, 0)'
+    )
+
+    def __init__(self, engine: AsyncEngine | None) -> None:
+        """
+        Initialize the monitor.
+
+        Args:
+            engine (AsyncEngine | None): The replica engine or None if no replica is configured.
+        """
+        self.engine = engine
+        self.lag = None
+        self.checked_at = None
+        self.lock = Lock()
+        self.logger = getLogger(settings.database_logger_name)
+
+    @property
+    def check_is_due(self) -> bool:
+        return self.checked_at is None or monotonic() - self.checked_at >= settings.replica_lag_check_interval
+
+    async def replica_is_usable(self) -> bool:
+        """
+        Check whether reads can be routed to the replica.
+
+        Returns:
+            bool: True if the replica is configured, reachable and its lag is within the limit.
+        """
+        if self.engine is None:
+            return False
+
+        if self.check_is_due:
+            async with self.lock:
+                if self.check_is_due:
+                    self.lag = await self.measure_lag()
+                    self.checked_at = monotonic()
+
+        return self.lag is not None and self.lag <= settings.replica_max_lag
+
+    async def measure_lag(self) -> float | None:
+        """
+        Measure the replication lag in seconds.
+
+        The probe is bounded by settings.replica_lag_check_timeout, the reads waiting
+        for the check are served by the primary if the replica does not answer in time.
+
+        Returns:
+            float | None: The lag or None if the replica could not be reached.
+        """
+        try:
+            return await wait_for(self.query_lag(), timeout=settings.replica_lag_check_timeout)
+        except (SQLAlchemyError, OSError, TimeoutError):
+            self.logger.error(
+                'The read replica is unavailable, falling back to the primary.',
+                extra={'user_id': None, 'event_type': 'Replica unavailable.'},
+            )
+            return None
+
+    async def query_lag(self) -> float:
+        async with self.engine.connect() as connection:
+            return float((await connection.execute(self.lag_statement)).scalar_one())
@@ -1,2 +1,5 @@
+from infrastructure.database.repositories.avatar_job import AvatarJobRepository
+from infrastructure.database.repositories.orphaned_file import OrphanedFileRepository
+from infrastructure.database.repositories.outbox import OutboxRepository
 from infrastructure.database.repositories.session import SessionRepository
 from infrastructure.database.repositories.user import UserRepository
@@ -0,0 +1,122 @@
+from datetime import datetime
+
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.ports import AvatarJobRepositoryPort
+from infrastructure.database.models import AvatarJobModel
+from infrastructure.internal_dtos import InternalAvatarJobDTO
+from infrastructure.monitoring.database import instrument_query
+
+
+class AvatarJobRepository(AvatarJobRepositoryPort):
+    """
+    The repository that is responsible for all the database actions
+    related to the avatar processing jobs.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        """
+        Initialize the repository.
+
+        Args:
+            session (AsyncSession): An instance of AsyncSession.
+        """
+        self.session = session
+
+    @instrument_query
+    async def add_job(self, data: dict) -> dict:
+        """
+        Queue an uploaded avatar for the processing.
+
+        Args:
+            data (dict): Fields for the new job.
+
+        Returns:
+            dict: The new job.
+        """
+        statement = insert(AvatarJobModel).values(**data).returning(AvatarJobModel.__table__)
+
+        result = await self.session.execute(statement=statement)
+
+        return InternalAvatarJobDTO.model_validate(result.mappings().one()).model_dump()
+
+    @instrument_query
+    async def get_job(self, job_id: str, user_id: int) -> dict | None:
+        """
+        Get a job of the user by its id.
+
+        Args:
+            job_id (str): The id of the job.
+            user_id (int): The id of the user the job belongs to.
+
+        Returns:
+            dict | None: The job or None if the user has no such job.
+        """
+        columns = AvatarJobModel.__table__.columns
+
+        statement = select(
+            AvatarJobModel.__table__,
+        ).where(
+            (columns.id == job_id) & (columns.user_id == user_id),
+        )
+
+        result = await self.session.execute(statement=statement)
+
+        if (job := result.mappings().one_or_none()) is not None:
+            return InternalAvatarJobDTO.model_validate(job).model_dump()
+        return None
+
+    @instrument_query
+    async def claim_jobs(self, limit: int, stalled_before: datetime) -> list:
+        """
+        Lock and return the pending jobs and the jobs whose processing stalled.
+
+        The rows locked by another worker are skipped.
+
+        Args:
+            limit (int): The maximum number of jobs.
+            stalled_before (datetime): The jobs in processing that were not updated since are claimed again.
+
+        Returns:
+            list: List of job DTOs ordered by the creation time.
+        """
+        columns = AvatarJobModel.__table__.columns
+
+        statement = select(
+            AvatarJobModel.__table__,
+        ).where(
+            or_(
+                columns.status == 'pending',
+                (columns.status == 'processing') & (columns.updated_at < stalled_before),
+            ),
+        ).order_by(
+            columns.created_at,
+        ).limit(
+            limit,
+        ).with_for_update(
+            skip_locked=True,
+        )
+
+        result = await self.session.execute(statement=statement)
+
+        return [InternalAvatarJobDTO.model_validate(row).model_dump() for row in result.mappings().all()]
+
+    @instrument_query
+    async def update_jobs(self, ids: set, data: dict) -> None:
+        """
+        Update the jobs with provided ids.
+
+        Args:
+            ids (set): A set of ids of the jobs that need to be updated.
+            data (dict): Fields to update.
+        """
+        statement = update(
+            AvatarJobModel.__table__,
+        ).where(
+            AvatarJobModel.__table__.columns.id.in_(ids),
+        ).values(
+            **data,
+        )
+
+        await self.session.execute(statement=statement)
@@ -0,0 +1,87 @@
+from datetime import datetime
+
+from sqlalchemy import delete, exists, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.ports import OrphanedFileRepositoryPort
+from infrastructure.database.models import OrphanedFileModel, UserModel
+from infrastructure.internal_dtos import InternalOrphanedFileDTO
+from infrastructure.monitoring.database import instrument_query
+
+
+class OrphanedFileRepository(OrphanedFileRepositoryPort):
+    """
+    The repository that is responsible for all the database actions
+    related to the files that may be no longer used.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        """
+        Initialize the repository.
+
+        Args:
+            session (AsyncSession): An instance of AsyncSession.
+        """
+        self.session = session
+
+    @instrument_query
+    async def add_file(self, data: dict) -> None:
+        """
+        Register a file that may be no longer used.
+
+        Args:
+            data (dict): The URL the file is referenced by and the paths of the file and its renditions.
+        """
+        await self.session.execute(statement=insert(OrphanedFileModel).values(**data))
+
+    @instrument_query
+    async def claim_files(self, limit: int, created_before: datetime) -> list:
+        """
+        Lock and return the registered files along with whether a user still references them.
+
+        The rows locked by another collector are skipped.
+
+        Args:
+            limit (int): The maximum number of files.
+            created_before (datetime): Only the files registered before this time are returned.
+
+        Returns:
+            list: List of orphaned file DTOs ordered by id.
+        """
+        columns = OrphanedFileModel.__table__.columns
+
+        referenced = exists().where(UserModel.__table__.columns.avatar_url == columns.url).label('referenced')
+
+        statement = select(
+            OrphanedFileModel.__table__,
+            referenced,
+        ).where(
+            columns.created_at < created_before,
+        ).order_by(
+            columns.id,
+        ).limit(
+            limit,
+        ).with_for_update(
+            of=OrphanedFileModel.__table__,
+            skip_locked=True,
+        )
+
+        result = await self.session.execute(statement=statement)
+
+        return [InternalOrphanedFileDTO.model_validate(row).model_dump() for row in result.mappings().all()]
+
+    @instrument_query
+    async def delete_files(self, ids: set) -> None:
+        """
+        Forget the files with provided ids.
+
+        Args:
+            ids (set): A set of ids of the files.
+        """
+        statement = delete(
+            OrphanedFileModel.__table__,
+        ).where(
+            OrphanedFileModel.__table__.columns.id.in_(ids),
+        )
+
+        await self.session.execute(statement=statement)
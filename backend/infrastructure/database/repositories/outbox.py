@@ -0,0 +1,182 @@
+from datetime import datetime
+
+from sqlalchemy import delete, exists, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from application.ports import OutboxRepositoryPort
+from infrastructure.database.models import OutboxMessageModel
+from infrastructure.internal_dtos import InternalOutboxMessageDTO
+from infrastructure.monitoring.database import instrument_query
+
+
+class OutboxRepository(OutboxRepositoryPort):
+    """
+    The repository that is responsible for all the database actions
+    related to the outbox messages.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        """
+        Initialize the repository.
+
+        Args:
+            session (AsyncSession): An instance of AsyncSession.
+        """
+        self.session = session
+
+    @instrument_query
+    async def add_message(self, data: dict) -> None:
+        """
+        Put a message into the outbox.
+
+        Args:
+            data (dict): Fields for the new message.
+        """
+        await self.session.execute(statement=insert(OutboxMessageModel).values(**data))
+
+    @instrument_query
+    async def claim_pending_messages(self, limit: int) -> list:
+        """
+        Lock and return the messages that are due for delivery.
+
+        The pending messages and the messages whose delivery lease expired are due,
+        the rows locked by another dispatcher are skipped. The messages of the keys
+        that have a message being delivered right now are left for later, so two
+        updates of the same key are never delivered at once.
+
+        Args:
+            limit (int): The maximum number of messages.
+
+        Returns:
+            list: List of message DTOs ordered by available_at and id.
+        """
+        table = OutboxMessageModel.__table__
+        in_flight = table.alias('in_flight')
+
+        statement = select(
+            table,
+        ).where(
+            table.columns.status.in_(('pending', 'processing')),
+            table.columns.available_at <= func.now(),
+            ~exists().where(
+                in_flight.columns.key == table.columns.key,
+                in_flight.columns.status == 'processing',
+                in_flight.columns.available_at > func.now(),
+            ),
+        ).order_by(
+            table.columns.available_at,
+            table.columns.id,
+        ).limit(
+            limit,
+        ).with_for_update(
+            skip_locked=True,
+        )
+
+        result = await self.session.execute(statement=statement)
+
+        return [InternalOutboxMessageDTO.model_validate(row).model_dump() for row in result.mappings().all()]
+
+    @instrument_query
+    async def supersede_messages(self, keys: set, ids: set) -> set:
+        """
+        Mark the messages that have a newer message of the same key as superseded.
+
+        Every pending message of the keys is checked along with the claimed messages,
+        so a retried older message can never be delivered after a newer one.
+
+        Args:
+            keys (set): The keys of the claimed messages.
+            ids (set): The ids of the claimed messages.
+
+        Returns:
+            set: The ids of the superseded messages.
+        """
+        table = OutboxMessageModel.__table__
+        newer = table.alias('newer')
+
+        statement = update(
+            table,
+        ).where(
+            table.columns.key.in_(keys),
+            or_(table.columns.status == 'pending', table.columns.id.in_(ids)),
+            exists().where(newer.columns.key == table.columns.key, newer.columns.id > table.columns.id),
+        ).values(
+            status='superseded',
+        ).returning(
+            table.columns.id,
+        )
+
+        result = await self.session.execute(statement=statement)
+
+        return set(result.scalars().all())
+
+    @instrument_query
+    async def update_messages(self, ids: set, data: dict) -> None:
+        """
+        Update the messages with provided ids.
+
+        Args:
+            ids (set): A set of ids of the messages that need to be updated.
+            data (dict): Fields to update.
+        """
+        statement = update(
+            OutboxMessageModel.__table__,
+        ).where(
+            OutboxMessageModel.__table__.columns.id.in_(ids),
+        ).values(
+            **data,
+        )
+
+        await self.session.execute(statement=statement)
+
+    @instrument_query
+    async def get_pending_statistics(self) -> tuple[int, datetime | None]:
+        """
+        Get the number of the undelivered messages and the creation time of the oldest one.
+
+        Returns:
+            tuple[int, datetime | None]: The count and the creation time.
+        """
+        columns = OutboxMessageModel.__table__.columns
+
+        statement = select(
+            func.count(columns.id),
+            func.min(columns.created_at),
+        ).where(
+            columns.status.in_(('pending', 'processing')),
+        )
+
+        result = await self.session.execute(statement=statement)
+
+        return tuple(result.one())
+
+    @instrument_query
+    async def purge_messages(self, finished_before: datetime, limit: int) -> int:
+        """
+        Delete the dispatched, superseded and failed messages that were last updated before the time.
+
+        The rows locked by another dispatcher are skipped.
+
+        Args:
+            finished_before (datetime): The time the messages must have been finished by.
+            limit (int): The maximum number of messages to delete.
+
+        Returns:
+            int: The number of the deleted messages.
+        """
+        table = OutboxMessageModel.__table__
+
+        finished_ids = select(
+            table.columns.id,
+        ).where(
+            table.columns.status.in_(('dispatched', 'superseded', 'failed')),
+            table.columns.updated_at < finished_before,
+        ).limit(
+            limit,
+        ).with_for_update(
+            skip_locked=True,
+        )
+
+        result = await self.session.execute(statement=delete(table).where(table.columns.id.in_(finished_ids)))
+
+        return result.rowcount
@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from application.ports import SessionRepositoryPort
 from infrastructure.database.models import SessionModel
 from infrastructure.internal_dtos import InternalSessionDTO
+from infrastructure.monitoring.database import instrument_query
 
 
 class SessionRepository(SessionRepositoryPort):
@@ -21,6 +22,7 @@ class SessionRepository(SessionRepositoryPort):
         """
         self.session = session
 
+    @instrument_query
     async def create_session(self, data: dict) -> dict:
         """
         Create a session and return its DTO.
@@ -38,6 +40,7 @@ class SessionRepository(SessionRepositoryPort):
 
         return InternalSessionDTO.model_validate(row).model_dump()
     
+    @instrument_query
     async def get_session(self, filters: dict) -> dict | None:
         """
         Return a single session matching filters.
@@ -56,6 +59,7 @@ class SessionRepository(SessionRepositoryPort):
         
         return None
     
+    @instrument_query
     async def get_sessions(self, filters: dict) -> dict | None:
         """
         Return all sessions matching filters.
@@ -73,6 +77,7 @@ class SessionRepository(SessionRepositoryPort):
             return [InternalSessionDTO.model_validate(row).model_dump() for row in rows]
         return None
 
+    @instrument_query
     async def update_session(self, session_id: int, data: dict) -> dict | None:
         """
         Update a session and return its DTO.
@@ -100,6 +105,7 @@ class SessionRepository(SessionRepositoryPort):
             return InternalSessionDTO.model_validate(row).model_dump()
         return None
     
+    @instrument_query
     async def terminate_sessions(self, ids: set) -> None:
         """
         Terminate sessions with provided ids.
@@ -1,10 +1,20 @@
-from sqlalchemy import exists, insert, select, update
+from asyncio import sleep
+from datetime import datetime, timedelta
+from time import monotonic
+from typing import AsyncIterator
+
+from sqlalchemy import any_, bindparam, exists, func, insert, Integer, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from settings import settings
+
 from application.ports.user import UserRepositoryPort
-from infrastructure.database.models import UserModel
+from infrastructure.database.loaders import UserLoader
+from infrastructure.database.models import UserModel, users_version_lock_id
 from infrastructure.exceptions import InvalidDatabaseFilters
 from infrastructure.internal_dtos import InternalUserDTO
+from infrastructure.monitoring.database import instrument_query
 
 
 class UserRepository(UserRepositoryPort):
@@ -13,15 +23,49 @@ class UserRepository(UserRepositoryPort):
     related to users.
     """
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, user_loader: UserLoader | None = None) -> None:
         """
         Initialize the repository.
 
         Args:
             session (AsyncSession): An instance of AsyncSession.
+            user_loader (UserLoader | None): The loader that batches the lookups by id, if any.
         """
         self.session: AsyncSession = session
+        self.user_loader = user_loader
+
+    async def lock_version(self) -> None:
+        """
+        Take the lock the change feed waits for before a version is assigned to a user.
+
+        The lock is shared with the other writers and held until the transaction ends.
+        """
+        await self.session.execute(statement=select(func.pg_advisory_xact_lock_shared(users_version_lock_id)))
+
+    async def wait_for_versions(self) -> None:
+        """
+        Wait until every transaction that has assigned a version to a user is finished.
+
+        The exclusive lock is held until the transaction ends, so it is released along with
+        a cancelled or failed request. It is only tried at first, since a waiting request
+        would queue every new writer behind it, and is waited for after
+        settings.user_changes_lock_timeout, so the feed is not starved by the writers.
+        """
+        deadline = monotonic() + settings.user_changes_lock_timeout
 
+        while monotonic() < deadline:
+            result = await self.session.execute(
+                statement=select(func.pg_try_advisory_xact_lock(users_version_lock_id)),
+            )
+
+            if result.scalar_one():
+                return
+
+            await sleep(settings.user_changes_lock_retry_interval)
+
+        await self.session.execute(statement=select(func.pg_advisory_xact_lock(users_version_lock_id)))
+
+    @instrument_query
     async def create(self, user_data: dict) -> dict:
         """
         Create a user and return its DTO.
@@ -32,6 +76,8 @@ class UserRepository(UserRepositoryPort):
         Returns:
             dict: Serialized user DTO.
         """
+        await self.lock_version()
+
         statement = insert(UserModel).values(**user_data).returning(*UserModel.__table__.columns)
 
         result = await self.session.execute(statement=statement)
@@ -39,6 +85,7 @@ class UserRepository(UserRepositoryPort):
 
         return InternalUserDTO.model_validate(row).model_dump()
 
+    @instrument_query
     async def check_if_exists(self, properties: dict) -> bool:
         """
         Check whether a user exists matching given properties.
@@ -69,16 +116,22 @@ class UserRepository(UserRepositoryPort):
         result = (await self.session.execute(statement=statement)).scalar_one()
         return result
 
+    @instrument_query
     async def get_by_properties(self, properties: dict) -> dict | None:
         """
         Return a user matching given properties.
 
+        The lookups by id alone are batched by the user loader if it is provided.
+
         Args:
             properties (dict): Fields to filter by.
 
         Returns:
             dict | None: User DTO or None if not found.
         """
+        if self.user_loader is not None and properties.keys() == {'id'}:
+            return await self.user_loader.load(user_id=properties.get('id'))
+
         supported_properties = {
             'id': UserModel.__table__.columns.id,
             'email': UserModel.__table__.columns.email,
@@ -102,6 +155,7 @@ class UserRepository(UserRepositoryPort):
             return InternalUserDTO.model_validate(row).model_dump()
         return None
     
+    @instrument_query
     async def get_by_ids(self, ids: list) -> list:
         """
         Return users by a list of IDs.
@@ -112,13 +166,83 @@ class UserRepository(UserRepositoryPort):
         Returns:
             list: List of user DTOs.
         """
-        statement = select(UserModel.__table__).where(UserModel.__table__.columns.id.in_(ids))
+        statement = select(
+            UserModel.__table__,
+        ).where(
+            UserModel.__table__.columns.id == any_(bindparam('ids', value=list(ids), type_=ARRAY(Integer))),
+        )
+        result = await self.session.execute(statement=statement)
+
+        if (rows := result.mappings().all()):
+            return [InternalUserDTO.model_validate(row).model_dump() for row in rows]
+        return []
+
+    @instrument_query
+    async def stream_by_ids(self, ids: list) -> AsyncIterator[list]:
+        """
+        Stream users by a list of IDs through a server-side cursor.
+
+        Args:
+            ids (list): List of user IDs.
+
+        Yields:
+            list: The partitions of user DTOs.
+        """
+        statement = select(
+            UserModel.__table__,
+        ).where(
+            UserModel.__table__.columns.id == any_(bindparam('ids', value=list(ids), type_=ARRAY(Integer))),
+        )
+
+        result = await self.session.stream(statement=statement)
+
+        async for rows in result.mappings().partitions(settings.user_ids_chunk_size):
+            yield [InternalUserDTO.model_validate(row).model_dump() for row in rows]
+
+    @instrument_query
+    async def get_changes(self, cursor: int, limit: int) -> list:
+        """
+        Return the users changed after the cursor ordered by their version.
+
+        The versions are taken from a sequence when a row is written, so a transaction
+        may commit a lower version after a higher one was read. The feed therefore waits
+        for the transactions that have assigned a version to finish before reading. The
+        versions assigned after that are recent, as is every higher version, so the changes
+        younger than settings.user_changes_settle_delay are held back until they commit.
+        updated_at is taken with clock_timestamp() along with the version for this reason.
+
+        It must be read from the primary, a replica may not have applied a lower version yet.
+        The transaction should be ended right after the read, the writers wait for it until then.
+
+        Args:
+            cursor (int): The version of the last change seen by the consumer.
+            limit (int): The maximum number of users to return.
+
+        Returns:
+            list: List of user DTOs.
+        """
+        await self.wait_for_versions()
+
+        statement = select(
+            UserModel.__table__,
+        ).where(
+            UserModel.__table__.columns.version > cursor,
+            UserModel.__table__.columns.updated_at < (
+                func.clock_timestamp() - timedelta(seconds=settings.user_changes_settle_delay)
+            ),
+        ).order_by(
+            UserModel.__table__.columns.version,
+        ).limit(
+            limit,
+        )
+
         result = await self.session.execute(statement=statement)
 
         if (rows := result.mappings().all()):
             return [InternalUserDTO.model_validate(row).model_dump() for row in rows]
         return []
 
+    @instrument_query
     async def update_user(self, user_id: int, user_data: dict) -> dict | None:
         """
         Update a user and return its DTO.
@@ -130,6 +254,8 @@ class UserRepository(UserRepositoryPort):
         Returns:
             dict | None: Updated user DTO or None if not found.
         """
+        await self.lock_version()
+
         statement = update(
             UserModel.__table__,
         ).where(
@@ -146,23 +272,70 @@ class UserRepository(UserRepositoryPort):
             return InternalUserDTO.model_validate(row).model_dump()
         return None
 
-    async def update_avatar(self, user_id: int, avatar_url: str) -> dict | None:
+    @instrument_query
+    async def lock_avatar(self, user_id: int) -> dict | None:
         """
-        Update user's avatar URL.
+        Lock the user until the transaction ends and get the avatar the user has.
+
+        The version lock is taken first, in the same order as the other writers take both locks.
+
+        Args:
+            user_id (int): User ID.
+
+        Returns:
+            dict | None: The avatar URL, the rendition URLs and the time the avatar was queued at
+                or None if not found.
+        """
+        await self.lock_version()
+
+        columns = UserModel.__table__.columns
+
+        statement = select(
+            columns.avatar_url,
+            columns.avatar_renditions,
+            columns.avatar_queued_at,
+        ).where(
+            columns.id == user_id,
+        ).with_for_update()
+
+        result = await self.session.execute(statement=statement)
+
+        if (row := result.mappings().one_or_none()) is not None:
+            return dict(row)
+        return None
+
+    @instrument_query
+    async def update_avatar(
+        self,
+        user_id: int,
+        avatar_url: str,
+        avatar_renditions: dict,
+        queued_at: datetime | None = None,
+    ) -> dict | None:
+        """
+        Update user's avatar URL and the URLs of its renditions.
 
         Args:
             user_id (int): User ID.
             avatar_url (str): New avatar URL.
+            avatar_renditions (dict): The URLs of the thumbnails by format and size.
+            queued_at (datetime | None): The time the avatar was queued at, the current time if it was not.
 
         Returns:
             dict | None: Updated user DTO or None if not found.
         """
+        await self.lock_version()
+
         statement = update(
             UserModel.__table__,
         ).where(
             UserModel.__table__.columns.id == user_id,
         ).values(
-            {'avatar_url': avatar_url},
+            {
+                'avatar_url': avatar_url,
+                'avatar_renditions': avatar_renditions,
+                'avatar_queued_at': queued_at if queued_at is not None else func.clock_timestamp(),
+            },
         ).returning(
             *UserModel.__table__.columns,
         )
@@ -172,6 +345,7 @@ class UserRepository(UserRepositoryPort):
             return InternalUserDTO.model_validate(row).model_dump()
         return None
 
+    @instrument_query
     async def search_users_by_username(self, username: str, user_username: str) -> list:
         """
         Search users by partial username match.
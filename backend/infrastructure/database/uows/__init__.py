@@ -1 +1,2 @@
 from infrastructure.database.uows.database_uow import DatabaseUnitOfWork
+from infrastructure.database.uows.read_only_database_uow import ReadOnlyDatabaseUnitOfWork
@@ -0,0 +1,58 @@
+from types import TracebackType
+from typing import Optional, Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, SessionTransaction
+
+from application.ports.database_uow import DatabaseUnitOfWorkPort
+from infrastructure.database.replica import ReplicaLagMonitor
+
+
+class ReadOnlyDatabaseUnitOfWork(DatabaseUnitOfWorkPort):
+    """
+    The unit of work for the read paths.
+
+    Routes the session to the read replica if it is usable and to the primary otherwise.
+    Every transaction is started as READ ONLY and there is nothing to commit.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        replica_session_factory: async_sessionmaker[AsyncSession],
+        replica_lag_monitor: ReplicaLagMonitor,
+    ) -> None:
+        self.session_factory = session_factory
+        self.replica_session_factory = replica_session_factory
+        self.replica_lag_monitor = replica_lag_monitor
+        self.session = None
+
+    async def __aenter__(self) -> 'ReadOnlyDatabaseUnitOfWork':
+        if await self.replica_lag_monitor.replica_is_usable():
+            self.session = self.replica_session_factory()
+        else:
+            self.session = self.session_factory()
+
+        event.listen(self.session.sync_session, 'after_begin', self.set_read_only)
+
+        return self
+
+    async def __aexit__(
+        self,
+        exception_type: Optional[Type[BaseException]],
+        exception: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.session.close()
+
+    @staticmethod
+    def set_read_only(session: Session, transaction: SessionTransaction, connection: Connection) -> None:
+        connection.exec_driver_sql('SET TRANSACTION READ ONLY')
+
+    async def commit(self) -> None:
+        ...
+
+    async def rollback(self) -> None:
+        await self.session.rollback()
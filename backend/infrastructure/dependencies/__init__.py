@@ -1 +1,8 @@
-from infrastructure.dependencies.authentication import get_access_token, get_request_user
+from infrastructure.dependencies.database import get_database_uow, get_read_only_database_uow, get_user_loader
+from infrastructure.dependencies.authentication import (
+    get_access_token,
+    get_admin_user,
+    get_delivery_access_token,
+    get_read_only_request_user,
+    get_request_user,
+)
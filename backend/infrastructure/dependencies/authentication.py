@@ -1,34 +1,65 @@
-from dependency_injector.wiring import inject, Provide
 from fastapi import Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from settings import settings
+
+from application.exceptions import PermissionDeniedException
+from application.ports import DatabaseUnitOfWorkPort
 from application.use_cases import GetUserUseCase
 from infrastructure.database.repositories import UserRepository
-from infrastructure.database.uows import DatabaseUnitOfWork
-from infrastructure.dependency_injection_containers import DatabaseContainer
+from infrastructure.database.loaders import UserLoader
+from infrastructure.database.uows import DatabaseUnitOfWork, ReadOnlyDatabaseUnitOfWork
+from infrastructure.dependencies.database import get_database_uow, get_read_only_database_uow, get_user_loader
 from infrastructure.internal_dtos import InternalUserDTO
 from infrastructure.security import JWTManager
 
 
-@inject
+async def authenticate(
+    token: str,
+    database_uow: DatabaseUnitOfWorkPort,
+    user_loader: UserLoader | None = None,
+) -> InternalUserDTO:
+    """
+    Extract the user id from the provided token and retrieve a User based on it.
+
+    The lookup is batched with the concurrent ones by the user loader if one is provided.
+    """
+    user_id = await JWTManager().get_user_id(token=token)
+
+    use_case = GetUserUseCase(
+        user_id=user_id,
+        database_repo=UserRepository(session=database_uow.session, user_loader=user_loader),
+        jwt_manager=JWTManager(),
+    )
+
+    return InternalUserDTO(**await use_case.execute()).model_dump()
+
 async def get_request_user(
     credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
-    database_uow: DatabaseUnitOfWork = Depends(Provide[DatabaseContainer.unit_of_work]),
+    database_uow: DatabaseUnitOfWork = Depends(get_database_uow),
 ) -> InternalUserDTO:
     """
     The authentication dependency that extracts the user id from the provided credentials
     and attempts to retrieve a User based on them.
+
+    The lookup runs on the request-scoped unit of work that is shared with the handler, so
+    the write routes read the user from the primary on the connection of the request. It is
+    never batched by the user loader, which reads from the replica.
     """
-    user_id = await JWTManager().get_user_id(token=credentials.credentials)
+    return await authenticate(token=credentials.credentials, database_uow=database_uow)
 
-    async with database_uow:
-        use_case = GetUserUseCase(
-            user_id=user_id,
-            database_repo=UserRepository(session=database_uow.session),
-            jwt_manager=JWTManager(),
-        )
+async def get_read_only_request_user(
+    credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
+    database_uow: ReadOnlyDatabaseUnitOfWork = Depends(get_read_only_database_uow),
+    user_loader: UserLoader | None = Depends(get_user_loader),
+) -> InternalUserDTO:
+    """
+    The authentication dependency for the read-only routes.
 
-        return InternalUserDTO(**await use_case.execute()).model_dump()
+    The lookup runs on the request-scoped read-only unit of work that is shared with the handler,
+    or is batched with the concurrent ones by the user loader if it is enabled.
+    """
+    return await authenticate(token=credentials.credentials, database_uow=database_uow, user_loader=user_loader)
 
 async def get_access_token(
     credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
@@ -37,3 +68,32 @@ async def get_access_token(
     Return the access token from the provided credentials.
     """
     return credentials.credentials
+
+async def get_delivery_access_token(
+    access_token: str = Depends(get_access_token),
+) -> str | None:
+    """
+    Return the access token the updates of the chats are delivered with.
+
+    None is returned if the messaging backend accepts the service token
+    (settings.messaging_backend_service_auth), so the token of the user is not stored.
+    """
+    if settings.messaging_backend_service_auth:
+        return None
+    return access_token
+
+async def get_admin_user(
+    user: InternalUserDTO = Depends(get_read_only_request_user),
+) -> InternalUserDTO:
+    """
+    The authentication dependency for the administrative routes.
+
+    Only the users listed in settings.admin_user_ids are let through,
+    the other authenticated users are answered with 403.
+    """
+    if user.get('id') not in settings.admin_user_ids:
+        raise PermissionDeniedException(
+            title='Permission denied.',
+            details={'Permission denied.': 'Administrative privileges are required.'},
+        )
+    return user
@@ -0,0 +1,53 @@
+from typing import AsyncIterator
+
+from dependency_injector.wiring import inject, Provide
+from fastapi import Depends
+
+from settings import settings
+
+from infrastructure.database.loaders import UserLoader
+
+from infrastructure.database.uows import DatabaseUnitOfWork, ReadOnlyDatabaseUnitOfWork
+from infrastructure.dependency_injection_containers import DatabaseContainer
+
+
+@inject
+async def get_database_uow(
+    database_uow: DatabaseUnitOfWork = Depends(Provide[DatabaseContainer.unit_of_work]),
+) -> AsyncIterator[DatabaseUnitOfWork]:
+    """
+    The request-scoped unit of work dependency.
+
+    FastAPI caches dependencies per request, so the authentication dependency
+    and the handler share the same unit of work and therefore the same pooled
+    connection. The connection itself is checked out only when the first statement
+    is executed and is returned to the pool once the request is finished.
+    """
+    async with database_uow:
+        yield database_uow
+
+@inject
+async def get_read_only_database_uow(
+    database_uow: ReadOnlyDatabaseUnitOfWork = Depends(Provide[DatabaseContainer.read_only_unit_of_work]),
+) -> AsyncIterator[ReadOnlyDatabaseUnitOfWork]:
+    """
+    The request-scoped read-only unit of work dependency.
+
+    Used by the routes that only read, so their queries can be served by the read replica.
+    """
+    async with database_uow:
+        yield database_uow
+
+@inject
+async def get_user_loader(
+    user_loader: UserLoader = Depends(Provide[DatabaseContainer.user_loader]),
+) -> UserLoader | None:
+    """
+    The per-process loader that batches the lookups of users by id.
+
+    It reads through its own read-only units of work, so it is only used by the read-only
+    routes. Returns None if batching is disabled in the settings.
+    """
+    if settings.user_loader_enabled:
+        return user_loader
+    return None
@@ -1 +1,4 @@
 from infrastructure.dependency_injection_containers.database import DatabaseContainer
+from infrastructure.dependency_injection_containers.http import HttpContainer
+from infrastructure.dependency_injection_containers.images import ImagesContainer
+from infrastructure.dependency_injection_containers.storage import StorageContainer
@@ -1,12 +1,28 @@
 from dependency_injector.containers import DeclarativeContainer
 from dependency_injector.providers import Factory, Singleton
 
-from infrastructure.database.main import create_engine, create_session_factory
+from infrastructure.database.loaders import UserLoader
+from infrastructure.database.main import create_engine, create_replica_engine, create_session_factory
+from infrastructure.database.replica import ReplicaLagMonitor
+from infrastructure.database.repositories import UserRepository
 from infrastructure.database.uows.database_uow import DatabaseUnitOfWork
+from infrastructure.database.uows.read_only_database_uow import ReadOnlyDatabaseUnitOfWork
 
 
 class DatabaseContainer(DeclarativeContainer):
     engine = Singleton(create_engine)
     session_factory = Singleton(create_session_factory, engine=engine)
 
+    replica_engine = Singleton(create_replica_engine)
+    replica_session_factory = Singleton(create_session_factory, engine=replica_engine)
+    replica_lag_monitor = Singleton(ReplicaLagMonitor, engine=replica_engine)
+
     unit_of_work = Factory(DatabaseUnitOfWork, session_factory)
+    read_only_unit_of_work = Factory(
+        ReadOnlyDatabaseUnitOfWork,
+        session_factory,
+        replica_session_factory,
+        replica_lag_monitor,
+    )
+
+    user_loader = Singleton(UserLoader, read_only_unit_of_work.provider, UserRepository)
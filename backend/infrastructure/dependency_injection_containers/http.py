@@ -0,0 +1,25 @@
+from dependency_injector.containers import DeclarativeContainer
+from dependency_injector.providers import Factory, Resource, Singleton
+
+from settings import settings
+
+from infrastructure.http.circuit_breaker import CircuitBreaker
+from infrastructure.http.client import create_client_session
+from infrastructure.http.update_chat_related_user import UpdateChatRelatedUser
+
+
+class HttpContainer(DeclarativeContainer):
+    client_session = Resource(create_client_session)
+    circuit_breaker = Singleton(
+        CircuitBreaker,
+        name='messaging_backend',
+        failure_threshold=settings.messaging_backend_failure_threshold,
+        recovery_timeout=settings.messaging_backend_recovery_timeout,
+        half_open_max_calls=settings.messaging_backend_half_open_max_calls,
+    )
+
+    update_chat_related_user = Factory(
+        UpdateChatRelatedUser,
+        client_session=client_session,
+        circuit_breaker=circuit_breaker,
+    )
@@ -0,0 +1,10 @@
+from dependency_injector.containers import DeclarativeContainer
+from dependency_injector.providers import Resource, Singleton
+
+from infrastructure.images import create_process_pool, ImageProcessor
+
+
+class ImagesContainer(DeclarativeContainer):
+    process_pool = Resource(create_process_pool)
+
+    image_processor = Singleton(ImageProcessor, process_pool=process_pool)
@@ -0,0 +1,8 @@
+from dependency_injector.containers import DeclarativeContainer
+from dependency_injector.providers import Resource
+
+from infrastructure.file_storage import create_file_storage
+
+
+class StorageContainer(DeclarativeContainer):
+    file_storage = Resource(create_file_storage)
@@ -1,5 +1,6 @@
 from infrastructure.exception_handlers.application_exception_handler import application_exception_handler
 from infrastructure.exception_handlers.infrastructure_exception_handler import infrastructure_exception_handler
+from infrastructure.exception_handlers.permission_denied_exception_handler import permission_denied_exception_handler
 from infrastructure.exception_handlers.request_validation_exception_handler import request_validation_exception_handler
 
 from infrastructure.exception_handlers.main import setup_exception_handlers
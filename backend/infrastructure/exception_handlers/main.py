@@ -1,11 +1,12 @@
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 
-from application.exceptions import ApplicationException
+from application.exceptions import ApplicationException, PermissionDeniedException
 from infrastructure.exceptions import InfrastructureException
 from infrastructure.exception_handlers import (
     application_exception_handler,
     infrastructure_exception_handler,
+    permission_denied_exception_handler,
     request_validation_exception_handler,
 )
 
@@ -13,7 +14,11 @@ from infrastructure.exception_handlers import (
 def setup_exception_handlers(application: FastAPI) -> None:
     """
     Adds all the exception handlers.
+
+    The handler of the most specific exception class is used, so PermissionDeniedException
+    is answered with 403 while the rest of the application exceptions are answered with 401.
     """
     application.add_exception_handler(ApplicationException, application_exception_handler)
+    application.add_exception_handler(PermissionDeniedException, permission_denied_exception_handler)
     application.add_exception_handler(InfrastructureException, infrastructure_exception_handler)
     application.add_exception_handler(RequestValidationError, request_validation_exception_handler)
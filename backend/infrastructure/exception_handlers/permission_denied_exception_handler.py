@@ -0,0 +1,16 @@
+from http import HTTPStatus
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from application.exceptions import PermissionDeniedException
+
+
+async def permission_denied_exception_handler(request: Request, exception: PermissionDeniedException):
+    content = {'title': exception.title, **exception.details}
+
+    return JSONResponse(
+        status_code=HTTPStatus.FORBIDDEN,
+        media_type='application/problem+json',
+        content=content,
+    )
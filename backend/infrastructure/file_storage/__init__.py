@@ -1 +1,4 @@
 from infrastructure.file_storage.file_storage import FileStorage
+from infrastructure.file_storage.garbage_collector import OrphanedFileCollector
+from infrastructure.file_storage.s3_file_storage import S3FileStorage
+from infrastructure.file_storage.main import create_file_storage
@@ -1,17 +1,28 @@
+from hashlib import sha256
+from os import utime
 from os.path import join
-from pathlib import Path
 from time import time
+from typing import AsyncIterator
+from uuid import uuid4
 
 from aiofiles import open as aioopen
+from aiofiles.os import makedirs, remove, rename, stat, wrap
+from aiofiles.ospath import exists
 
 from settings import settings
 
 from application.ports import FileStoragePort
 
 
+touch = wrap(utime)
+
+
 class FileStorage(FileStoragePort):
     """
     Store and delete files on the local filesystem.
+
+    The files are named by the hash of their content, so identical uploads are stored once,
+    and fanned out into the subdirectories named by the first bytes of the hash.
     """
 
     def __init__(self) -> None:
@@ -20,25 +31,75 @@ class FileStorage(FileStoragePort):
         """
         self.base_path = settings.display_media_root
 
-    async def store(self, bfile: bytes, user_id: int, extension: str) -> str:
-        """Save a file and return its filesystem path.
+    def get_directory(self, file_hash: str) -> str:
+        """
+        Get the directory of a file, e.g. media/ab/cd for the hash abcdef...
+
+        Args:
+            file_hash (str): The hash of the file content.
+
+        Returns:
+            str: The path of the directory.
+        """
+        shards = (file_hash[level * 2:level * 2 + 2] for level in range(settings.media_shard_depth))
+        return join(self.base_path, *shards)
+
+    async def store(self, stream: AsyncIterator[bytes], user_id: int, extension: str) -> str:
+        """Save a file chunk by chunk and return its filesystem path.
+
+        The chunks are written to a temporary file that is moved to its content addressed
+        path once the stream is exhausted, so an interrupted upload never replaces an avatar.
+        If the same content is already stored its modification time is renewed instead,
+        which keeps it from the garbage collection.
 
         Args:
-            bfile (bytes): File content.
+            stream (AsyncIterator[bytes]): The chunks of the file content.
             user_id (int): ID of the user owning the file.
             extension (str): File extension (e.g., '.png').
 
         Returns:
             str: Full path to the saved file.
         """
-        file_name = f'{user_id}_{time()}{extension}'
-        file_path = join(self.base_path, file_name)
+        temporary_path = join(self.base_path, f'{uuid4().hex}.part')
+        file_hash = sha256()
+
+        try:
+            async with aioopen(temporary_path, 'wb') as file:
+                async for chunk in stream:
+                    file_hash.update(chunk)
+                    await file.write(chunk)
+        except BaseException:
+            await self.delete(path=temporary_path)
+            raise
 
-        async with aioopen(file_path, 'wb') as file:
-            await file.write(bfile)
+        directory = self.get_directory(file_hash=file_hash.hexdigest())
+        file_path = join(directory, f'{file_hash.hexdigest()}{extension}')
+
+        if await exists(file_path):
+            await touch(file_path)
+            await self.delete(path=temporary_path)
+        else:
+            await makedirs(directory, exist_ok=True)
+            await rename(temporary_path, file_path)
 
         return file_path
 
+    async def stage(self, path: str) -> None:
+        """
+        The files are kept in the local storage, so a stored file is always at hand.
+
+        Args:
+            path (str): Path of the stored file.
+        """
+
+    async def publish(self, paths: list[str]) -> None:
+        """
+        The files are stored in their final location right away, so there is nothing to publish.
+
+        Args:
+            paths (list[str]): Paths of the stored files.
+        """
+
     async def delete(self, path: str) -> None:
         """
         Delete a file if it exists.
@@ -46,4 +107,33 @@ class FileStorage(FileStoragePort):
         Args:
             path (str): Path to the file to remove.
         """
-        Path(path).unlink(missing_ok=True)
+        try:
+            await remove(path)
+        except FileNotFoundError:
+            pass
+
+    async def delete_stale(self, path: str, min_age: float) -> bool:
+        """
+        Delete a file if it was not modified for min_age seconds.
+
+        Args:
+            path (str): Path to the file to remove.
+            min_age (float): The number of seconds since the last modification.
+
+        Returns:
+            bool: True if the file was deleted.
+        """
+        try:
+            if time() - (await stat(path)).st_mtime < min_age:
+                return False
+            await remove(path)
+        except FileNotFoundError:
+            return False
+
+        return True
+
+    async def get_download_url(self, path: str) -> None:
+        """
+        The files are served by the media route, so there is no other URL to download them from.
+        """
+        return None
@@ -0,0 +1,111 @@
+from asyncio import Event, Task, TimeoutError, get_running_loop, wait_for
+from datetime import datetime, timedelta, timezone
+from logging import getLogger
+from typing import Callable
+
+from opentelemetry.metrics import get_meter
+
+from settings import settings
+
+from application.ports import DatabaseUnitOfWorkPort, FileStoragePort
+from infrastructure.database.repositories import OrphanedFileRepository
+
+
+meter = get_meter(__name__)
+
+collected_files = meter.create_counter(
+    name='file_storage.orphaned_files.collected',
+    unit='{file}',
+    description='The number of the registered orphaned files by whether they were deleted or still referenced.',
+)
+
+
+class OrphanedFileCollector:
+    """
+    The background worker that deletes the files no user references anymore.
+
+    The replaced avatars are registered as orphaned files. Once they are older than
+    settings.orphaned_files_grace_period, the files that are not referenced by any user
+    and were not stored again within the grace period are deleted along with their renditions.
+    """
+
+    def __init__(
+        self,
+        unit_of_work_factory: Callable[[], DatabaseUnitOfWorkPort],
+        file_storage: FileStoragePort,
+    ) -> None:
+        """
+        Initialize the collector.
+
+        Args:
+            unit_of_work_factory (Callable): Creates the unit of work each collection runs in.
+            file_storage (FileStoragePort): The storage the files are deleted from.
+        """
+        self.unit_of_work_factory = unit_of_work_factory
+        self.file_storage = file_storage
+        self.stopping = Event()
+        self.task: Task | None = None
+        self.logger = getLogger(settings.file_storage_logger_name)
+
+    def start(self) -> None:
+        self.task = get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        """
+        Let the current collection finish and stop the worker.
+        """
+        self.stopping.set()
+
+        if self.task is not None:
+            await self.task
+
+    async def run(self) -> None:
+        while not self.stopping.is_set():
+            try:
+                collected = await self.collect()
+            except Exception:
+                self.logger.exception(
+                    'Failed to collect the orphaned files.',
+                    extra={'user_id': None, 'event_type': 'Orphaned files collection failed.'},
+                )
+                collected = 0
+
+            if collected < settings.orphaned_files_batch_size:
+                try:
+                    await wait_for(self.stopping.wait(), timeout=settings.orphaned_files_poll_interval)
+                except TimeoutError:
+                    pass
+
+    async def collect(self) -> int:
+        """
+        Claim a batch of the registered files and delete the unreferenced ones.
+
+        Returns:
+            int: The number of claimed files.
+        """
+        grace_period = settings.orphaned_files_grace_period
+
+        async with self.unit_of_work_factory() as database_uow:
+            repository = OrphanedFileRepository(session=database_uow.session)
+
+            files = await repository.claim_files(
+                limit=settings.orphaned_files_batch_size,
+                created_before=datetime.now(timezone.utc) - timedelta(seconds=grace_period),
+            )
+
+            for file in files:
+                if file.get('referenced'):
+                    collected_files.add(1, {'file_storage.orphaned_file.outcome': 'referenced'})
+                    continue
+
+                for path in file.get('paths'):
+                    await self.file_storage.delete_stale(path=path, min_age=grace_period)
+
+                collected_files.add(1, {'file_storage.orphaned_file.outcome': 'deleted'})
+
+            if files:
+                await repository.delete_files(ids={file.get('id') for file in files})
+
+            await database_uow.commit()
+
+        return len(files)
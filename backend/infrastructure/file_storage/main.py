@@ -0,0 +1,22 @@
+from typing import AsyncIterator
+
+from settings import settings
+
+from application.ports import FileStoragePort
+from infrastructure.file_storage.file_storage import FileStorage
+from infrastructure.file_storage.s3_client import create_s3_client
+from infrastructure.file_storage.s3_file_storage import S3FileStorage
+
+
+async def create_file_storage() -> AsyncIterator[FileStoragePort]:
+    """
+    Create the storage selected by settings.file_storage_backend.
+
+    The client of the object storage is created only if it is selected and closed on shutdown.
+    """
+    if settings.file_storage_backend == 'local':
+        yield FileStorage()
+        return
+
+    async with create_s3_client() as client:
+        yield S3FileStorage(client=client)
@@ -0,0 +1,31 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from aiobotocore.client import AioBaseClient
+from aiobotocore.config import AioConfig
+from aiobotocore.session import get_session
+
+from settings import settings
+
+
+@asynccontextmanager
+async def create_s3_client() -> AsyncIterator[AioBaseClient]:
+    """
+    Create the pooled client of the S3 compatible storage and close it on exit.
+    """
+    config = AioConfig(
+        max_pool_connections=settings.s3_max_pool_connections,
+        connect_timeout=settings.s3_connect_timeout,
+        read_timeout=settings.s3_read_timeout,
+        s3={'addressing_style': settings.s3_addressing_style},
+    )
+
+    async with get_session().create_client(
+        's3',
+        endpoint_url=settings.s3_endpoint_url,
+        region_name=settings.s3_region,
+        aws_access_key_id=settings.s3_access_key_id,
+        aws_secret_access_key=settings.s3_secret_access_key,
+        config=config,
+    ) as client:
+        yield client
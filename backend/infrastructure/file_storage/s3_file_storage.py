@@ -0,0 +1,262 @@
+from asyncio import Semaphore, gather, to_thread
+from datetime import datetime, timezone
+from hashlib import file_digest, sha256
+from mimetypes import guess_type
+from os.path import basename, dirname, splitext
+from typing import AsyncIterator
+from uuid import uuid4
+
+from aiobotocore.client import AioBaseClient
+from aiofiles import open as aioopen
+from aiofiles.os import makedirs, rename, stat
+from aiofiles.ospath import exists
+from botocore.exceptions import ClientError
+
+from settings import settings
+
+from application.ports import FileStoragePort
+from infrastructure.file_storage.file_storage import FileStorage
+
+
+class S3FileStorage(FileStoragePort):
+    """
+    Store and delete files in an S3 compatible storage.
+
+    The uploads are staged in the local storage, where they are hashed and their renditions
+    are created, and moved to the bucket under the same content addressed keys once published.
+    """
+
+    def __init__(self, client: AioBaseClient) -> None:
+        """
+        Initialize the storage.
+
+        Args:
+            client (AioBaseClient): The pooled client shared by the whole process.
+        """
+        self.client = client
+        self.bucket = settings.s3_bucket
+        self.staging = FileStorage()
+
+    async def store(self, stream: AsyncIterator[bytes], user_id: int, extension: str) -> str:
+        """
+        Stage a file in the local storage and return its path, which is also its key.
+
+        Args:
+            stream (AsyncIterator[bytes]): The chunks of the file content.
+            user_id (int): ID of the user owning the file.
+            extension (str): File extension (e.g., '.png').
+
+        Returns:
+            str: The path of the staged file.
+        """
+        return await self.staging.store(stream=stream, user_id=user_id, extension=extension)
+
+    async def stage(self, path: str) -> None:
+        """
+        Download a published file back to the local storage unless it is still staged there.
+
+        The file is written to a temporary file first, so a partial download is never processed.
+
+        Args:
+            path (str): The path of the file, which is also its key.
+        """
+        if await exists(path):
+            return
+
+        temporary_path = f'{path}.{uuid4().hex}.part'
+        response = await self.client.get_object(Bucket=self.bucket, Key=path)
+
+        await makedirs(dirname(path), exist_ok=True)
+
+        try:
+            async with response.get('Body') as body, aioopen(temporary_path, 'wb') as file:
+                while chunk := await body.read(settings.upload_chunk_size):
+                    await file.write(chunk)
+        except BaseException:
+            await self.staging.delete(path=temporary_path)
+            raise
+
+        await rename(temporary_path, path)
+
+    async def publish(self, paths: list[str]) -> None:
+        """
+        Upload the staged files to the bucket and remove them from the local storage.
+
+        Args:
+            paths (list[str]): The paths of the staged files.
+        """
+        await gather(*(self.upload(path=path) for path in paths))
+
+    async def upload(self, path: str) -> None:
+        """
+        Upload a staged file unless the same content is already in the bucket.
+
+        The content is compared by the SHA-256 digest kept in the metadata of the object, since
+        a staged file may differ from the object under its key, e.g. an original published before
+        its metadata was stripped, and such an object is overwritten. An unprocessed upload, which
+        is named by its own digest, never overwrites an object, that may be its stripped copy.
+
+        The objects that are kept are copied onto themselves instead, which renews their modification
+        time and keeps them from the garbage collection. A file of up to one part is sent as the body
+        of a single request, which reads it by chunks rather than into memory.
+        """
+        digest = await to_thread(self.get_digest, path=path)
+        head = await self.get_head(path=path)
+
+        if head is not None and (
+            splitext(basename(path))[0] == digest or head.get('Metadata', {}).get('sha256') == digest
+        ):
+            await self.client.copy_object(
+                Bucket=self.bucket,
+                Key=path,
+                CopySource={'Bucket': self.bucket, 'Key': path},
+                MetadataDirective='REPLACE',
+                **self.get_object_options(path=path, digest=head.get('Metadata', {}).get('sha256')),
+            )
+        elif (size := (await stat(path)).st_size) <= settings.s3_multipart_part_size:
+            with await to_thread(open, path, 'rb') as file:
+                await self.client.put_object(
+                    Bucket=self.bucket,
+                    Key=path,
+                    Body=file,
+                    ContentLength=size,
+                    **self.get_object_options(path=path, digest=digest),
+                )
+        else:
+            await self.upload_multipart(path=path, digest=digest)
+
+        await self.staging.delete(path=path)
+
+    async def upload_multipart(self, path: str, digest: str) -> None:
+        """
+        Upload a staged file by parts of settings.s3_multipart_part_size bytes.
+
+        At most settings.s3_multipart_concurrency parts are read and uploaded at once,
+        the upload is aborted if any of them fails.
+        """
+        upload = await self.client.create_multipart_upload(
+            Bucket=self.bucket,
+            Key=path,
+            **self.get_object_options(path=path, digest=digest),
+        )
+        semaphore = Semaphore(settings.s3_multipart_concurrency)
+
+        async def upload_part(part_number: int) -> dict:
+            async with semaphore:
+                async with aioopen(path, 'rb') as file:
+                    await file.seek((part_number - 1) * settings.s3_multipart_part_size)
+                    body = await file.read(settings.s3_multipart_part_size)
+
+                part = await self.client.upload_part(
+                    Bucket=self.bucket,
+                    Key=path,
+                    UploadId=upload.get('UploadId'),
+                    PartNumber=part_number,
+                    Body=body,
+                )
+                return {'PartNumber': part_number, 'ETag': part.get('ETag')}
+
+        parts_count = -(-(await stat(path)).st_size // settings.s3_multipart_part_size)
+
+        try:
+            parts = await gather(*(upload_part(part_number) for part_number in range(1, parts_count + 1)))
+        except BaseException:
+            await self.client.abort_multipart_upload(Bucket=self.bucket, Key=path, UploadId=upload.get('UploadId'))
+            raise
+
+        await self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=path,
+            UploadId=upload.get('UploadId'),
+            MultipartUpload={'Parts': parts},
+        )
+
+    @staticmethod
+    def get_object_options(path: str, digest: str | None) -> dict:
+        """
+        Get the content type, the caching policy and the digest of an object, the keys are content addressed.
+        """
+        return {
+            'ContentType': guess_type(path)[0] or 'application/octet-stream',
+            'CacheControl': f'public, max-age={settings.media_immutable_max_age}, immutable',
+            'Metadata': {'sha256': digest} if digest is not None else {},
+        }
+
+    @staticmethod
+    def get_digest(path: str) -> str:
+        """
+        Get the SHA-256 digest of a staged file, reads the file and should be run in a thread.
+        """
+        with open(path, 'rb') as file:
+            return file_digest(file, sha256).hexdigest()
+
+    async def get_head(self, path: str) -> dict | None:
+        """
+        Get the metadata of an object.
+
+        Returns:
+            dict | None: The response of HEAD or None if the object does not exist.
+        """
+        try:
+            return await self.client.head_object(Bucket=self.bucket, Key=path)
+        except ClientError as error:
+            if error.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+
+    async def get_last_modified(self, path: str) -> datetime | None:
+        """
+        Get the modification time of an object.
+
+        Returns:
+            datetime | None: The modification time or None if the object does not exist.
+        """
+        if (head := await self.get_head(path=path)) is None:
+            return None
+        return head.get('LastModified')
+
+    async def delete(self, path: str) -> None:
+        """
+        Delete an object and its staged copy if they exist.
+
+        Args:
+            path (str): The key of the object.
+        """
+        await self.client.delete_object(Bucket=self.bucket, Key=path)
+        await self.staging.delete(path=path)
+
+    async def delete_stale(self, path: str, min_age: float) -> bool:
+        """
+        Delete an object if it was not modified for min_age seconds.
+
+        Args:
+            path (str): The key of the object.
+            min_age (float): The number of seconds since the last modification.
+
+        Returns:
+            bool: True if the object was deleted.
+        """
+        if (last_modified := await self.get_last_modified(path=path)) is None:
+            return False
+
+        if (datetime.now(timezone.utc) - last_modified).total_seconds() < min_age:
+            return False
+
+        await self.client.delete_object(Bucket=self.bucket, Key=path)
+        return True
+
+    async def get_download_url(self, path: str) -> str:
+        """
+        Get the URL an object can be downloaded from.
+
+        Returns:
+            str: The public URL if settings.s3_public_url is set and a presigned URL otherwise.
+        """
+        if settings.s3_public_url is not None:
+            return f'{settings.s3_public_url}/{path}'
+
+        return await self.client.generate_presigned_url(
+            'get_object',
+            Params={'Bucket': self.bucket, 'Key': path},
+            ExpiresIn=settings.s3_presigned_url_expiration,
+        )
@@ -1,3 +1,5 @@
+from infrastructure.handlers.media import media_router
+from infrastructure.handlers.profiling import profiling_router
 from infrastructure.handlers.session import session_router
 from infrastructure.handlers.user import user_router
 
@@ -1,11 +1,19 @@
 from fastapi import FastAPI
 
-from infrastructure.handlers import session_router, user_router
+from settings import settings
+
+from infrastructure.handlers import media_router, profiling_router, session_router, user_router
 
 
 def setup_handlers(application: FastAPI) -> None:
     """
     Include routers to application.
+
+    The profiling router is included only if the profiling is enabled.
     """
     application.include_router(session_router)
     application.include_router(user_router)
+    application.include_router(media_router)
+
+    if settings.profiling_enabled:
+        application.include_router(profiling_router)
@@ -0,0 +1,107 @@
+from asyncio import to_thread
+from http import HTTPStatus
+from os import stat_result
+from pathlib import Path
+from re import compile
+from stat import S_ISREG
+
+from aiofiles.os import stat
+from dependency_injector.wiring import inject, Provide
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import FileResponse, RedirectResponse, Response
+from starlette.datastructures import Headers
+
+from settings import settings
+
+from application.ports import FileStoragePort
+from infrastructure.dependency_injection_containers import StorageContainer
+
+
+media_router = APIRouter(prefix='/media')
+
+content_addressed_name = compile(r'[0-9a-f]{64}(_\d+)?')
+
+def resolve_path(path: str) -> Path | None:
+    """
+    Resolve a requested path inside the media directory.
+
+    The resolving follows the symlinks on the disk, so it is blocking and must be run in a thread.
+
+    Returns:
+        Path | None: The path of the file or None if it points outside the media directory
+            or to a partially written file.
+    """
+    media_root = Path(settings.display_media_root).resolve()
+    file_path = (media_root / path).resolve()
+
+    if file_path.is_relative_to(media_root) and file_path.suffix != '.part':
+        return file_path
+    return None
+
+def get_cache_headers(file_path: Path, file_stat: stat_result) -> dict:
+    """
+    Get the validator and the caching policy of a file.
+
+    The content addressed files never change, so they are cached for a year without revalidation
+    and their hash is used as a strong ETag. Other files are revalidated after settings.media_max_age.
+    """
+    if content_addressed_name.fullmatch(file_path.stem):
+        return {
+            'etag': f'"{file_path.stem}"',
+            'cache-control': f'public, max-age={settings.media_immutable_max_age}, immutable',
+        }
+
+    return {
+        'etag': f'"{file_stat.st_mtime_ns:x}-{file_stat.st_size:x}"',
+        'cache-control': f'public, max-age={settings.media_max_age}',
+    }
+
+def is_not_modified(request_headers: Headers, etag: str) -> bool:
+    if (if_none_match := request_headers.get('if-none-match')) is None:
+        return False
+
+    tags = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+    return '*' in tags or etag in tags
+
+@media_router.api_route('/{path:path}', methods=['GET', 'HEAD'])
+@inject
+async def get_media(
+    path: str,
+    request: Request,
+    file_storage: FileStoragePort = Depends(Provide[StorageContainer.file_storage]),
+) -> Response:
+    """
+    Serve a file from the media directory.
+
+    If the files are kept in the object storage, the client is redirected to their public
+    or presigned URL. Otherwise the file is sent with the sendfile-like http.response.pathsend extension if the server
+    supports it, the Range requests are answered with partial content and If-None-Match
+    requests with 304 Not Modified.
+    """
+    if (file_path := await to_thread(resolve_path, path=path)) is None:
+        return Response(status_code=HTTPStatus.NOT_FOUND)
+
+    media_root = Path(settings.display_media_root)
+    key = (media_root / file_path.relative_to(media_root.resolve())).as_posix()
+
+    if (download_url := await file_storage.get_download_url(path=key)) is not None:
+        return RedirectResponse(
+            url=download_url,
+            status_code=HTTPStatus.TEMPORARY_REDIRECT,
+            headers={'cache-control': f'public, max-age={settings.s3_presigned_url_expiration // 2}'},
+        )
+
+    try:
+        file_stat = await stat(file_path)
+    except (FileNotFoundError, NotADirectoryError):
+        return Response(status_code=HTTPStatus.NOT_FOUND)
+
+    if not S_ISREG(file_stat.st_mode):
+        return Response(status_code=HTTPStatus.NOT_FOUND)
+
+    headers = get_cache_headers(file_path=file_path, file_stat=file_stat)
+
+    if is_not_modified(request_headers=request.headers, etag=headers.get('etag')):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+    return FileResponse(path=file_path, stat_result=file_stat, headers=headers)
@@ -0,0 +1,59 @@
+from asyncio import Lock
+from http import HTTPStatus
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import Response
+
+from settings import settings
+
+from infrastructure.database.uows import ReadOnlyDatabaseUnitOfWork
+from infrastructure.dependencies import get_admin_user, get_read_only_database_uow
+from infrastructure.profiling import profile_calls, sample_stacks, trace_allocations
+
+
+profiling_router = APIRouter(prefix='/admin/profile')
+
+profiling_lock = Lock()
+
+@profiling_router.get('')
+async def get_profile(
+    mode: Literal['sampling', 'cprofile', 'tracemalloc'] = Query('sampling'),
+    duration: float = Query(10.0, gt=0, le=settings.profiling_max_duration),
+    interval: float = Query(settings.profiling_sampling_interval, ge=0.001, le=1.0),
+    user: dict = Depends(get_admin_user),
+    database_uow: ReadOnlyDatabaseUnitOfWork = Depends(get_read_only_database_uow),
+) -> Response:
+    """
+    Profile this worker process for the duration and return the profile as a file.
+
+    - sampling: the stacks of the event loop sampled every interval seconds, collapsed.
+    - cprofile: a pstats dump of everything the event loop ran.
+    - tracemalloc: the stacks of the memory allocated in the meantime, collapsed.
+
+    The collapsed stacks can be opened with flamegraph.pl or speedscope.
+    Only one profile runs at a time, 409 is returned while another one is running.
+    """
+    if profiling_lock.locked():
+        return Response(status_code=HTTPStatus.CONFLICT)
+
+    # The lock is free, so it is acquired without suspending and no other request can take it in between.
+    async with profiling_lock:
+        # Release the connection the authentication used, so it is not held while profiling.
+        await database_uow.rollback()
+
+        if mode == 'cprofile':
+            content = await profile_calls(duration=duration)
+            media_type, file_name = 'application/octet-stream', 'profile.pstats'
+        elif mode == 'tracemalloc':
+            content = await trace_allocations(duration=duration)
+            media_type, file_name = 'text/plain', 'allocations.collapsed'
+        else:
+            content = await sample_stacks(duration=duration, interval=interval)
+            media_type, file_name = 'text/plain', 'profile.collapsed'
+
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={'Content-Disposition': f'attachment; filename="{file_name}"'},
+    )
@@ -1,48 +1,66 @@
+from http import HTTPStatus
+from typing import AsyncIterator
+
 from dependency_injector.wiring import inject, Provide
-from fastapi import APIRouter, Depends, File, UploadFile
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from settings import settings
 
-from infrastructure.database.repositories.user import UserRepository
-from infrastructure.database.uows.database_uow import DatabaseUnitOfWork
-from infrastructure.dependencies import get_access_token, get_request_user
-from infrastructure.dependency_injection_containers.database import DatabaseContainer
-from infrastructure.http.update_chat_related_user import UpdateChatRelatedUser
+from application.ports import FileStoragePort
+from infrastructure.database.repositories import (
+    AvatarJobRepository,
+    OrphanedFileRepository,
+    OutboxRepository,
+    UserRepository,
+)
+from infrastructure.database.uows import DatabaseUnitOfWork, ReadOnlyDatabaseUnitOfWork
+from infrastructure.dependencies import (
+    get_database_uow,
+    get_delivery_access_token,
+    get_read_only_database_uow,
+    get_read_only_request_user,
+    get_request_user,
+)
+from infrastructure.dependency_injection_containers import DatabaseContainer, ImagesContainer, StorageContainer
 from infrastructure.incoming_dtos import IncomingCreateUserDTO, IncomingUpdateUserDTO, UserIdsDTO
-from infrastructure.file_storage import FileStorage
+from infrastructure.images import ImageProcessor
 from infrastructure.security.default_hasher import DefaultHasher
+from infrastructure.streaming import MultipartUpload, encode_json_array, encode_ndjson
 from interface_adapters.controllers import (
     CreateUserController,
+    GetAvatarJobController,
+    GetUserChangesController,
     GetUsersInfoController,
     SearchUsersController,
     UpdateAvatarController,
     UpdateUserController
 )
-from interface_adapters.outgoing_dtos import OutgoingUserDTO
+from interface_adapters.outgoing_dtos import OutgoingAvatarJobDTO, OutgoingUserChangesDTO, OutgoingUserDTO
 
 
 user_router = APIRouter(prefix='/users')
 
 @user_router.post('/')
-@inject
 async def create_user(
     user: IncomingCreateUserDTO,
-    database_uow: DatabaseUnitOfWork = Depends(Provide[DatabaseContainer.unit_of_work]),
+    database_uow: DatabaseUnitOfWork = Depends(get_database_uow),
 ) -> OutgoingUserDTO:
     """
     Create a user.
     """
-    async with database_uow:
-        controller = CreateUserController(
-            user_data=user.model_dump(),
-            default_hasher=DefaultHasher(),
-            database_repo=UserRepository(session=database_uow.session),
-            database_uow=database_uow,
-        )
+    controller = CreateUserController(
+        user_data=user.model_dump(),
+        default_hasher=DefaultHasher(),
+        database_repo=UserRepository(session=database_uow.session),
+        database_uow=database_uow,
+    )
 
-        return await controller.create_user()
+    return await controller.create_user()
 
 @user_router.get('/me')
 async def get_user(
-    user: dict = Depends(get_request_user),
+    user: dict = Depends(get_read_only_request_user),
 ) -> OutgoingUserDTO:
     """
     Get a requesting user.
@@ -50,86 +68,183 @@ async def get_user(
     return OutgoingUserDTO.from_dict(user)
 
 @user_router.patch('/update')
-@inject
 async def update_user(
     user_data: IncomingUpdateUserDTO,
     user: dict = Depends(get_request_user),
-    access_token: str = Depends(get_access_token),
-    database_uow: DatabaseUnitOfWork = Depends(Provide[DatabaseContainer.unit_of_work]),
+    access_token: str | None = Depends(get_delivery_access_token),
+    database_uow: DatabaseUnitOfWork = Depends(get_database_uow),
 ) -> OutgoingUserDTO:
     """
     Update the user data.
     """
-    async with database_uow:
-        controller = UpdateUserController(
-            user_id=user.get('id'),
-            user_data=user_data.model_dump(),
-            access_token=access_token,
-            database_repo=UserRepository(session=database_uow.session),
-            database_uow=database_uow,
-            http_service=UpdateChatRelatedUser(),
-        )
+    controller = UpdateUserController(
+        user_id=user.get('id'),
+        user_data=user_data.model_dump(),
+        access_token=access_token,
+        database_repo=UserRepository(session=database_uow.session),
+        database_uow=database_uow,
+        outbox_repo=OutboxRepository(session=database_uow.session),
+    )
 
-        return await controller.update_user()
+    return await controller.update_user()
 
-@user_router.patch('/avatar')
+@user_router.patch(
+    '/avatar',
+    response_model=None,
+    openapi_extra={
+        'requestBody': {
+            'required': True,
+            'content': {
+                'multipart/form-data': {
+                    'schema': {
+                        'type': 'object',
+                        'properties': {'avatar': {'type': 'string', 'format': 'binary'}},
+                        'required': ['avatar'],
+                    },
+                },
+            },
+        },
+    },
+)
 @inject
 async def update_avatar(
-    avatar: UploadFile = File(...),
+    request: Request,
     user: dict = Depends(get_request_user),
-    access_token: str = Depends(get_access_token),
-    database_uow: DatabaseUnitOfWork = Depends(Provide[DatabaseContainer.unit_of_work]),
-) -> dict:
+    access_token: str | None = Depends(get_delivery_access_token),
+    database_uow: DatabaseUnitOfWork = Depends(get_database_uow),
+    image_processor: ImageProcessor = Depends(Provide[ImagesContainer.image_processor]),
+    file_storage: FileStoragePort = Depends(Provide[StorageContainer.file_storage]),
+) -> dict | JSONResponse:
     """
     Update the user avatar.
+
+    The avatar is parsed from the multipart body while it is being received, so a file
+    larger than settings.max_size is rejected before the rest of the body is read.
+
+    If settings.avatar_processing_mode is async, the avatar is only stored and queued,
+    202 is returned along with the job that can be polled for the result.
+
+    The transaction of the authentication is ended before the body is received, so no pooled
+    connection is held while a slow client uploads the avatar or while it is processed.
     """
-    async with database_uow:
-        controller = UpdateAvatarController(
-            file=await avatar.read(),
-            file_name=avatar.filename,
-            user_id=user.get('id'),
-            access_token=access_token,
-            file_storage=FileStorage(),
-            database_repo=UserRepository(session=database_uow.session),
-            database_uow=database_uow,
-            http_service=UpdateChatRelatedUser(),
+    # Release the connection the authentication used, the use case checks one out again to write.
+    await database_uow.rollback()
+
+    if settings.avatar_processing_mode == 'async':
+        avatar_job_repo = AvatarJobRepository(session=database_uow.session)
+    else:
+        avatar_job_repo = None
+
+    avatar = MultipartUpload(request=request, field_name='avatar')
+    await avatar.open()
+
+    controller = UpdateAvatarController(
+        file=avatar.read_chunks(),
+        file_name=avatar.filename,
+        user_id=user.get('id'),
+        previous_avatar={'avatar_url': user.get('avatar_url'), 'avatar_renditions': user.get('avatar_renditions')},
+        file_storage=file_storage,
+        image_processor=image_processor,
+        database_repo=UserRepository(session=database_uow.session),
+        database_uow=database_uow,
+        outbox_repo=OutboxRepository(session=database_uow.session),
+        orphaned_file_repo=OrphanedFileRepository(session=database_uow.session),
+        avatar_job_repo=avatar_job_repo,
+        access_token=access_token,
+    )
+
+    result = await controller.update_avatar()
+
+    if avatar_job_repo is not None:
+        return JSONResponse(
+            status_code=HTTPStatus.ACCEPTED,
+            content=result,
+            headers={'Location': f'/users/avatar/jobs/{result.get("job_id")}'},
         )
+    return result
 
-        return await controller.update_avatar()
+@user_router.get('/avatar/jobs/{job_id}')
+async def get_avatar_job(
+    job_id: str,
+    user: dict = Depends(get_request_user),
+    database_uow: DatabaseUnitOfWork = Depends(get_database_uow),
+) -> OutgoingAvatarJobDTO:
+    """
+    Get the status of an avatar job of the requesting user.
+
+    Read from the primary, so a job is found right after it was queued.
+    """
+    controller = GetAvatarJobController(
+        job_id=job_id,
+        user_id=user.get('id'),
+        avatar_job_repo=AvatarJobRepository(session=database_uow.session),
+    )
+
+    return await controller.get_avatar_job()
     
 @user_router.get('/search')
-@inject
 async def search(
     username: str,
-    user: dict = Depends(get_request_user),
-    database_uow: DatabaseUnitOfWork = Depends(Provide[DatabaseContainer.unit_of_work]),
+    user: dict = Depends(get_read_only_request_user),
+    database_uow: ReadOnlyDatabaseUnitOfWork = Depends(get_read_only_database_uow),
 ):
     """
     Search the users.
     """
-    async with database_uow:
-        controller = SearchUsersController(
-            username=username,
-            user=user,
-            database_repo=UserRepository(session=database_uow.session)
-        )
+    controller = SearchUsersController(
+        username=username,
+        user=user,
+        database_repo=UserRepository(session=database_uow.session)
+    )
 
-        return await controller.search_users()
+    return await controller.search_users()
     
 @user_router.post('/get-users-info')
 @inject
 async def get_users_info(
+    request: Request,
     user_ids: UserIdsDTO,
-    database_uow: DatabaseUnitOfWork = Depends(Provide[DatabaseContainer.unit_of_work]),
-):
+    database_uow: ReadOnlyDatabaseUnitOfWork = Depends(Provide[DatabaseContainer.read_only_unit_of_work]),
+) -> StreamingResponse:
     """
     Technical endpoint that is used to get rich information 
     about users upon the creation of a chat.
+
+    The ids are deduplicated and fetched in chunks, the users are streamed
+    as NDJSON if it is accepted by the client and as a JSON array otherwise.
     """
-    async with database_uow:
-        controller = GetUsersInfoController(
-            user_ids=user_ids.model_dump(),
-            database_repo=UserRepository(session=database_uow.session),
-        )
+    async def get_partitions() -> AsyncIterator[list]:
+        async with database_uow:
+            controller = GetUsersInfoController(
+                user_ids=user_ids.model_dump(),
+                database_repo=UserRepository(session=database_uow.session),
+            )
+
+            async for partition in controller.get_users_info():
+                yield partition
+
+    if 'application/x-ndjson' in request.headers.get('accept', ''):
+        return StreamingResponse(encode_ndjson(get_partitions()), media_type='application/x-ndjson')
+    return StreamingResponse(encode_json_array(get_partitions()), media_type='application/json')
+
+@user_router.get('/changes')
+async def get_user_changes(
+    cursor: int = Query(0, ge=0),
+    limit: int = Query(settings.user_changes_page_size, ge=1, le=settings.max_user_changes_page_size),
+    database_uow: DatabaseUnitOfWork = Depends(get_database_uow),
+) -> OutgoingUserChangesDTO:
+    """
+    Technical endpoint that is used to keep a local replica of the users.
+
+    Returns the users changed after the cursor ordered by their version, the returned
+    cursor should be passed to get the next page. The changes are read from the primary,
+    so no version is skipped because of the replication lag.
+    """
+    controller = GetUserChangesController(
+        cursor=cursor,
+        limit=limit,
+        database_repo=UserRepository(session=database_uow.session),
+        database_uow=database_uow,
+    )
 
-        return await controller.get_users_info()
+    return await controller.get_user_changes()
@@ -0,0 +1,115 @@
+from time import monotonic
+from typing import Iterable
+
+from opentelemetry.metrics import CallbackOptions, Observation, get_meter
+
+from application.exceptions import CircuitOpenException
+
+
+meter = get_meter(__name__)
+
+transitions = meter.create_counter(
+    name='circuit_breaker.transitions',
+    unit='{transition}',
+    description='The number of the circuit breaker state transitions.',
+)
+rejected_calls = meter.create_counter(
+    name='circuit_breaker.rejected_calls',
+    unit='{call}',
+    description='The number of calls rejected without reaching the server.',
+)
+
+
+class CircuitBreaker:
+    """
+    The circuit breaker that lets the calls to a failing server fail fast.
+
+    - closed: calls pass, failure_threshold consecutive failures open the circuit.
+    - open: calls are rejected until recovery_timeout seconds pass.
+    - half_open: up to half_open_max_calls trial calls pass, a success closes the circuit
+      and a failure opens it again.
+    """
+
+    states = {'closed': 0, 'half_open': 1, 'open': 2}
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        recovery_timeout: float,
+        half_open_max_calls: int,
+    ) -> None:
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            name (str): The name the breaker is reported under in the metrics.
+            failure_threshold (int): The number of consecutive failures that opens the circuit.
+            recovery_timeout (float): The number of seconds the circuit stays open.
+            half_open_max_calls (int): The number of trial calls allowed in the half open state.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_calls = 0
+
+        meter.create_observable_gauge(
+            name='circuit_breaker.state',
+            callbacks=[self.observe_state],
+            description='The state of the circuit breaker: 0 - closed, 1 - half open, 2 - open.',
+        )
+
+    def observe_state(self, options: CallbackOptions) -> Iterable[Observation]:
+        yield Observation(self.states[self.state], {'circuit_breaker.name': self.name})
+
+    def transition(self, state: str) -> None:
+        transitions.add(1, {'circuit_breaker.name': self.name, 'from': self.state, 'to': state})
+        self.state = state
+
+    def is_call_allowed(self) -> bool:
+        """
+        Check whether a call would be let through right now without making it a trial call.
+        """
+        if self.state == 'open':
+            return monotonic() - self.opened_at >= self.recovery_timeout
+        if self.state == 'half_open':
+            return self.trial_calls < self.half_open_max_calls
+        return True
+
+    def before_call(self) -> None:
+        """
+        Let the call through or reject it.
+
+        Raises:
+            CircuitOpenException: Raisen if the circuit is open or no more trial calls are allowed.
+        """
+        if self.state == 'open' and monotonic() - self.opened_at >= self.recovery_timeout:
+            self.transition(state='half_open')
+            self.trial_calls = 0
+
+        if self.state == 'open' or (self.state == 'half_open' and self.trial_calls >= self.half_open_max_calls):
+            rejected_calls.add(1, {'circuit_breaker.name': self.name})
+            raise CircuitOpenException(
+                title='External server is unavailable.',
+                details={'Circuit is open.': 'The server is failing, the requests are rejected until it recovers.'},
+            )
+
+        if self.state == 'half_open':
+            self.trial_calls += 1
+
+    def record_success(self) -> None:
+        self.failures = 0
+
+        if self.state == 'half_open':
+            self.transition(state='closed')
+
+    def record_failure(self) -> None:
+        self.failures += 1
+
+        if self.state == 'half_open' or (self.state == 'closed' and self.failures >= self.failure_threshold):
+            self.transition(state='open')
+            self.opened_at = monotonic()
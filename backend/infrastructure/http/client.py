@@ -0,0 +1,114 @@
+from asyncio import get_running_loop
+from types import SimpleNamespace
+from typing import AsyncIterator
+
+from aiohttp import (
+    ClientSession,
+    ClientTimeout,
+    TCPConnector,
+    TraceConfig,
+    TraceConnectionQueuedEndParams,
+    TraceConnectionQueuedStartParams,
+    TraceConnectionCreateEndParams,
+    TraceConnectionReuseconnParams,
+    TraceRequestStartParams,
+)
+from opentelemetry.metrics import get_meter
+
+from settings import settings
+
+
+meter = get_meter(__name__)
+
+connections = meter.create_counter(
+    name='http.client.connections',
+    unit='{connection}',
+    description='The number of connections used by the outgoing requests by whether they were created or reused.',
+)
+queue_time = meter.create_histogram(
+    name='http.client.connection.queue_time',
+    unit='s',
+    description='The time the outgoing requests waited for a free connection in the pool.',
+)
+
+
+async def on_request_start(
+    session: ClientSession,
+    context: SimpleNamespace,
+    params: TraceRequestStartParams,
+) -> None:
+    context.server_address = params.url.host
+
+async def on_connection_queued_start(
+    session: ClientSession,
+    context: SimpleNamespace,
+    params: TraceConnectionQueuedStartParams,
+) -> None:
+    context.queued_at = get_running_loop().time()
+
+async def on_connection_queued_end(
+    session: ClientSession,
+    context: SimpleNamespace,
+    params: TraceConnectionQueuedEndParams,
+) -> None:
+    queue_time.record(
+        get_running_loop().time() - context.queued_at,
+        {'server.address': context.server_address},
+    )
+
+async def on_connection_create_end(
+    session: ClientSession,
+    context: SimpleNamespace,
+    params: TraceConnectionCreateEndParams,
+) -> None:
+    connections.add(1, {'server.address': context.server_address, 'http.client.connection.state': 'created'})
+
+async def on_connection_reuseconn(
+    session: ClientSession,
+    context: SimpleNamespace,
+    params: TraceConnectionReuseconnParams,
+) -> None:
+    connections.add(1, {'server.address': context.server_address, 'http.client.connection.state': 'reused'})
+
+def create_trace_config() -> TraceConfig:
+    """
+    Create the trace config that reports the connection reuse of the client.
+    """
+    trace_config = TraceConfig()
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_connection_queued_start.append(on_connection_queued_start)
+    trace_config.on_connection_queued_end.append(on_connection_queued_end)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+
+    return trace_config
+
+async def create_client_session() -> AsyncIterator[ClientSession]:
+    """
+    Create the pooled client for the messaging backend and close it on shutdown.
+
+    The connections are kept alive between the requests and limited in total and per host.
+    """
+    connector = TCPConnector(
+        limit=settings.messaging_backend_connection_limit,
+        limit_per_host=settings.messaging_backend_connection_limit_per_host,
+        keepalive_timeout=settings.messaging_backend_keepalive_timeout,
+        ttl_dns_cache=settings.messaging_backend_dns_cache_ttl,
+    )
+
+    timeout = ClientTimeout(
+        connect=settings.messaging_backend_connect_timeout,
+        sock_read=settings.messaging_backend_read_timeout,
+    )
+
+    client_session = ClientSession(
+        connector=connector,
+        timeout=timeout,
+        trace_configs=[create_trace_config()],
+    )
+
+    try:
+        yield client_session
+    finally:
+        await client_session.close()
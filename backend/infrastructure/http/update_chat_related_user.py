@@ -1,12 +1,12 @@
 from asyncio import TimeoutError
 
 from aiohttp import ClientConnectionError, ClientError, ClientSession
-from backoff import expo, on_exception, full_jitter
 
 from settings import settings
 
 from application.exceptions import ChatsServerUnavailable
 from application.ports import UpdateChatRelatedUserPort
+from infrastructure.http.circuit_breaker import CircuitBreaker
 
 
 class UpdateChatRelatedUser(UpdateChatRelatedUserPort):
@@ -15,44 +15,110 @@ class UpdateChatRelatedUser(UpdateChatRelatedUserPort):
     about users related to a chat when they update such information about themselves.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, client_session: ClientSession, circuit_breaker: CircuitBreaker) -> None:
         """
         Initialize the service.
+
+        Args:
+            client_session (ClientSession): The pooled client shared by the whole process.
+            circuit_breaker (CircuitBreaker): The breaker that rejects the calls while the server is failing.
+
+        Raises:
+            RuntimeError: If settings.messaging_backend_service_token is not set while the bulk delivery
+            or the service authorization is on, the requests are authorized with it then,
+            so the application must not start without it.
         """
+        uses_service_token = settings.messaging_backend_bulk_delivery or settings.messaging_backend_service_auth
+
+        if uses_service_token and not settings.messaging_backend_service_token:
+            raise RuntimeError('MESSAGING_BACKEND_SERVICE_TOKEN must be set to deliver the updates of the users.')
+
+        self.client_session = client_session
+        self.circuit_breaker = circuit_breaker
         self.url = f'{settings.messaging_backend_url}/messaging/chats/update-chat-related-user'
+        self.bulk_url = f'{settings.messaging_backend_url}/messaging/chats/update-chat-related-users'
 
-    @on_exception(
-        expo,
-        (ClientError, TimeoutError),
-        max_time=30,
-        jitter=full_jitter,
-    )
-    async def execute(self, access_token: str, user_data: dict) -> bool:
+    def is_available(self) -> bool:
+        """
+        Check whether the requests are let through by the circuit breaker right now.
+        """
+        return self.circuit_breaker.is_call_allowed()
+
+    async def execute(self, user_data: dict, access_token: str | None) -> bool:
         """
         Execute the update process.
 
-        Request the endpoint. Retry for 30 seconds if request fails with the jitter.
+        Request the endpoint once, the retries are made by the outbox dispatcher.
+        The request is authorized with the token of the user, or with the service token
+        if settings.messaging_backend_service_auth is on.
 
         Returns:
             bool: True if received 204.
 
         Raises:
-            ChatsServerUnavailable: Raisen if server did not respond or responded with 4xx or 5xx code.
+            ChatsServerUnavailable: Raisen if server did not respond or responded with 4xx or 5xx code
+            or if the circuit is open.
+        """
+        if settings.messaging_backend_service_auth:
+            access_token = settings.messaging_backend_service_token
+
+        return await self.post(url=self.url, access_token=access_token, data=user_data)
+
+    async def execute_bulk(self, users_data: list[dict]) -> bool:
         """
+        Update several users related to the chats with a single request.
+
+        The request is authorized with the service token instead of the tokens of the users.
+
+        Returns:
+            bool: True if received 204.
+
+        Raises:
+            ChatsServerUnavailable: Raisen if server did not respond or responded with 4xx or 5xx code
+            or if the circuit is open.
+        """
+        return await self.post(
+            url=self.bulk_url,
+            access_token=settings.messaging_backend_service_token,
+            data={'users': users_data},
+        )
+
+    async def post(self, url: str, access_token: str, data: dict) -> bool:
+        """
+        Make the request through the circuit breaker.
+
+        Connection errors, timeouts and 5xx responses count as failures of the circuit breaker,
+        as does any other error or a cancellation that leaves the call without an outcome,
+        so a trial call of the half open circuit is always accounted for.
+        """
+        self.circuit_breaker.before_call()
+
         headers = {'Authorization': f'Bearer {access_token}'}
+        outcome_recorded = False
+
         try:
-            async with ClientSession() as session:
-                async with session.post(url=self.url, headers=headers, json=user_data) as response:
-                    try:
-                        response.raise_for_status()
-                    except ClientError:
-                        raise ChatsServerUnavailable(
-                            title='Unprocessable response was returned.',
-                            details={'Unprocessable response code.': 'Returned response with unprocessable code.'},
-                        )
-                    return True
+            async with self.client_session.post(url=url, headers=headers, json=data) as response:
+                if response.status >= 500:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+                outcome_recorded = True
+
+                try:
+                    response.raise_for_status()
+                except ClientError:
+                    raise ChatsServerUnavailable(
+                        title='Unprocessable response was returned.',
+                        details={'Unprocessable response code.': 'Returned response with unprocessable code.'},
+                    )
+                return True
         except (ClientConnectionError, TimeoutError):
+            self.circuit_breaker.record_failure()
+            outcome_recorded = True
             raise ChatsServerUnavailable(
                 title='External server is unavailable.',
                 details={'Connection error.': 'Could not connect to a server that returns required data.'},
             )
+        finally:
+            if not outcome_recorded:
+                self.circuit_breaker.record_failure()
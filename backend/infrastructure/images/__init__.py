@@ -0,0 +1 @@
+from infrastructure.images.image_processor import create_process_pool, ImageProcessor, ProcessPool
@@ -0,0 +1,139 @@
+from asyncio import get_running_loop
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from logging import getLogger
+from typing import Iterator
+
+from opentelemetry.metrics import get_meter
+from PIL.Image import DecompressionBombError
+
+from settings import settings
+
+from application.exceptions import FileExtensionException
+from application.ports import ImageProcessorPort
+from infrastructure.images.renditions import render_renditions
+
+
+meter = get_meter(__name__)
+
+processing_duration = meter.create_histogram(
+    name='images.processing.duration',
+    unit='s',
+    description='The time it took to create the renditions of an image including the wait for a worker.',
+)
+
+
+class ProcessPool:
+    """
+    The pool of the processes that decode and encode the images.
+
+    A ProcessPoolExecutor is broken for good once one of its processes dies, e.g. when
+    it runs out of memory decoding an image, so the executor is replaced then.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            max_workers (int): The number of the processes.
+        """
+        self.max_workers = max_workers
+        self.executor = ProcessPoolExecutor(max_workers=max_workers)
+        self.logger = getLogger(settings.images_logger_name)
+
+    def replace_broken(self, executor: ProcessPoolExecutor) -> None:
+        """
+        Replace the broken executor unless it was already replaced by another call.
+        """
+        if self.executor is not executor:
+            return
+
+        self.logger.error(
+            'A process of the image processing pool died, the pool is recreated.',
+            extra={'user_id': None, 'event_type': 'Image processing pool broken.'},
+        )
+        executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def create_process_pool() -> Iterator[ProcessPool]:
+    """
+    Create the pool of the processes that decode and encode the images and shut it down on shutdown.
+    """
+    process_pool = ProcessPool(max_workers=settings.image_processing_workers)
+
+    try:
+        yield process_pool
+    finally:
+        process_pool.shutdown()
+
+
+class ImageProcessor(ImageProcessorPort):
+    """
+    Create the renditions of the images off the event loop.
+    """
+
+    def __init__(self, process_pool: ProcessPool) -> None:
+        """
+        Initialize the processor.
+
+        Args:
+            process_pool (ProcessPool): The pool the images are processed in.
+        """
+        self.process_pool = process_pool
+
+    async def create_renditions(self, path: str) -> dict:
+        """
+        Create the thumbnails of settings.avatar_sizes in every format of settings.avatar_quality.
+
+        Args:
+            path (str): The path of the stored image.
+
+        Returns:
+            dict: The paths of the thumbnails by format and size.
+
+        A pool broken before is replaced and the image is submitted to the new one. If the pool
+        breaks while the image is processed, it is replaced and the error is raised, since the image
+        may have caused it.
+
+        Raises:
+            FileExtensionException: If the file can not be decoded as an image.
+            BrokenProcessPool: If a process of the pool died while the image was processed.
+        """
+        loop = get_running_loop()
+        started_at = loop.time()
+        task = partial(
+            render_renditions,
+            source_path=path,
+            sizes=settings.avatar_sizes,
+            quality=settings.avatar_quality,
+            max_pixels=settings.max_image_pixels,
+        )
+
+        try:
+            executor = self.process_pool.executor
+
+            try:
+                future = loop.run_in_executor(executor, task)
+            except BrokenProcessPool:
+                self.process_pool.replace_broken(executor=executor)
+                executor = self.process_pool.executor
+                future = loop.run_in_executor(executor, task)
+
+            try:
+                return await future
+            except BrokenProcessPool:
+                self.process_pool.replace_broken(executor=executor)
+                raise
+        except (OSError, ValueError, DecompressionBombError):
+            raise FileExtensionException(
+                title='File extension exception.',
+                details={'File extension exception.': 'The file could not be decoded as an image.'},
+            )
+        finally:
+            processing_duration.record(loop.time() - started_at)
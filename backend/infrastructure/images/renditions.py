@@ -0,0 +1,127 @@
+from os import replace, utime
+from os.path import exists, splitext
+from uuid import uuid4
+
+from PIL import Image, ImageOps, JpegImagePlugin
+
+
+formats = {
+    'jpeg': {'extension': '.jpg', 'options': {'optimize': True, 'progressive': True}},
+    'webp': {'extension': '.webp', 'options': {'method': 4}},
+}
+
+metadata_keys = ('exif', 'xmp', 'XML:com.adobe.xmp', 'comment', 'photoshop')
+
+
+def flatten(image: Image.Image) -> Image.Image:
+    """
+    Convert the image to RGB putting the transparent pixels on a white background.
+    """
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+def get_temporary_path(path: str) -> str:
+    """
+    Get a unique temporary path next to a file, identical uploads share their paths and
+    may be processed at once, so two processes never write the same temporary file.
+    """
+    return f'{path}.{uuid4().hex}.part'
+
+def has_metadata(image: Image.Image) -> bool:
+    """
+    Check whether the image carries the metadata, e.g. the EXIF camera and location or the PNG text.
+    """
+    if any(key in image.info for key in metadata_keys) or len(image.getexif()):
+        return True
+    return bool(getattr(image, 'text', None))
+
+def strip_metadata(source_path: str) -> None:
+    """
+    Re-encode the source without its metadata applying the EXIF orientation.
+
+    The ICC profile is kept and a JPEG is re-encoded with its own quantization tables.
+    The stripped source has no metadata left, so a source is re-encoded only once.
+    """
+    with Image.open(source_path) as image:
+        if not has_metadata(image):
+            return
+
+        options = {'icc_profile': icc_profile} if (icc_profile := image.info.get('icc_profile')) else {}
+
+        if image.format == 'JPEG':
+            options['qtables'] = image.quantization
+
+            if (subsampling := JpegImagePlugin.get_sampling(image)) != -1:
+                options['subsampling'] = subsampling
+
+        temporary_path = get_temporary_path(path=source_path)
+        stripped = ImageOps.exif_transpose(image)
+        stripped.save(temporary_path, format=image.format, **options)
+
+    replace(temporary_path, source_path)
+
+def render_renditions(
+    source_path: str,
+    sizes: list[int],
+    quality: dict[str, int],
+    max_pixels: int,
+) -> dict[str, dict[str, str]]:
+    """
+    Decode an image and save its square thumbnails next to it.
+
+    Runs in a worker process. The metadata of the source is stripped, so neither the source
+    nor the thumbnails are published with it. The sources are content addressed, so the
+    existing thumbnails are reused.
+
+    Pillow raises DecompressionBombError for the images that are far above its own limit
+    before they are decoded.
+
+    Args:
+        source_path (str): The path of the uploaded image.
+        sizes (list[int]): The sides of the thumbnails in pixels.
+        quality (dict[str, int]): The encoder quality by format.
+        max_pixels (int): The maximum number of pixels of the source.
+
+    Returns:
+        dict[str, dict[str, str]]: The paths of the thumbnails by format and size.
+
+    Raises:
+        ValueError: If the image has too many pixels.
+        OSError: If the image can not be decoded.
+    """
+    base_path, _ = splitext(source_path)
+    renditions = {
+        format: {str(size): f'{base_path}_{size}{formats[format]["extension"]}' for size in sizes}
+        for format in quality
+    }
+    paths = [path for format_paths in renditions.values() for path in format_paths.values()]
+
+    with Image.open(source_path) as image:
+        if image.width * image.height > max_pixels:
+            raise ValueError('The image has too many pixels.')
+
+    strip_metadata(source_path=source_path)
+
+    if all(exists(path) for path in paths):
+        for path in paths:
+            utime(path)
+        return renditions
+
+    with Image.open(source_path) as image:
+        image.draft('RGB', (max(sizes), max(sizes)))
+        image = flatten(ImageOps.exif_transpose(image))
+
+        for size in sorted(sizes, reverse=True):
+            thumbnail = ImageOps.fit(image, (size, size), method=Image.Resampling.LANCZOS)
+
+            for format, quality_value in quality.items():
+                path = renditions[format][str(size)]
+                temporary_path = get_temporary_path(path=path)
+                thumbnail.save(temporary_path, format=format, quality=quality_value, **formats[format]['options'])
+                replace(temporary_path, path)
+
+    return renditions
@@ -20,4 +20,4 @@ class IncomingUpdateUserDTO(BaseModel):
 
 
 class UserIdsDTO(BaseModel):
-    user_ids: list
+    user_ids: list[int] = Field(..., max_length=settings.max_user_ids)
@@ -1,2 +1,5 @@
+from infrastructure.internal_dtos.avatar_job import InternalAvatarJobDTO
+from infrastructure.internal_dtos.orphaned_file import InternalOrphanedFileDTO
+from infrastructure.internal_dtos.outbox_message import InternalOutboxMessageDTO
 from infrastructure.internal_dtos.session import InternalSessionDTO
 from infrastructure.internal_dtos.user import InternalUserDTO
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class InternalAvatarJobDTO(BaseModel):
+    """
+    The dataclass that is responsible for transmitting the avatar processing jobs internally.
+    """
+    id: str
+    user_id: int
+    status: str
+    avatar_path: str
+    access_token: str | None
+    result: dict | None
+    error: dict | None
+    attempts: int
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
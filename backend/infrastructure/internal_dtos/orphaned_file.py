@@ -0,0 +1,16 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class InternalOrphanedFileDTO(BaseModel):
+    """
+    The dataclass that is responsible for transmitting the files that may be no longer used internally.
+    """
+    id: int
+    url: str
+    paths: list[str]
+    created_at: datetime
+    referenced: bool
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class InternalOutboxMessageDTO(BaseModel):
+    """
+    The dataclass that is responsible for transmitting outbox messages internally.
+    """
+    id: int
+    topic: str
+    key: str
+    payload: dict
+    access_token: str | None
+    status: str
+    attempts: int
+    created_at: datetime
+    available_at: datetime
+    dispatched_at: datetime | None
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
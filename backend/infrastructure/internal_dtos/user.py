@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel, ConfigDict, Field
 
 from settings import settings
@@ -13,5 +15,8 @@ class InternalUserDTO(BaseModel):
     password: str = Field(..., min_length=settings.min_password_length)
     email: str
     avatar_url: str
+    avatar_renditions: dict
+    version: int
+    updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
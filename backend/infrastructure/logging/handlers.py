@@ -0,0 +1,92 @@
+from logging import CRITICAL, Filter, LogRecord
+from logging.handlers import QueueHandler
+from queue import Full, Queue
+from random import random
+from threading import Lock
+from time import monotonic
+from typing import Iterable
+
+from opentelemetry.metrics import CallbackOptions, Observation, get_meter
+
+from settings import settings
+
+
+meter = get_meter(__name__)
+
+dropped_records = meter.create_counter(
+    name='logging.records.dropped',
+    unit='{record}',
+    description='The number of log records dropped before they were written by the reason.',
+)
+
+
+class RateLimitFilter(Filter):
+    """
+    Let through at most settings.logging_rate_limit records per second of each event type.
+
+    Every logger and event type pair has a token bucket of settings.logging_burst records.
+    Once it is empty only a settings.logging_sample_rate share of the records is kept,
+    so a burst of the same event is still visible without flooding the output.
+    The critical records are never dropped.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.buckets: dict[tuple, tuple[float, float]] = {}
+        self.lock = Lock()
+
+    def filter(self, record: LogRecord) -> bool:
+        if record.levelno >= CRITICAL:
+            return True
+
+        key = (record.name, getattr(record, 'event_type', None))
+        now = monotonic()
+
+        with self.lock:
+            tokens, updated_at = self.buckets.get(key, (settings.logging_burst, now))
+            tokens = min(tokens + (now - updated_at) * settings.logging_rate_limit, settings.logging_burst)
+
+            if allowed := tokens >= 1:
+                tokens -= 1
+
+            self.buckets[key] = (tokens, now)
+
+        if allowed or random() < settings.logging_sample_rate:
+            return True
+
+        dropped_records.add(1, {'logging.drop.reason': 'rate_limited'})
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Put the records into a bounded queue the writer thread takes them from.
+
+    Neither formatting nor writing happens on the calling thread. If the writer
+    falls behind and the queue is full the record is dropped instead of waiting.
+    """
+
+    def __init__(self, queue: Queue) -> None:
+        super().__init__(queue=queue)
+
+        meter.create_observable_gauge(
+            name='logging.queue.size',
+            callbacks=[self.observe_queue_size],
+            unit='{record}',
+            description='The number of log records waiting to be written.',
+        )
+
+    def observe_queue_size(self, options: CallbackOptions) -> Iterable[Observation]:
+        yield Observation(self.queue.qsize())
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        """
+        Pass the record as it is, it is formatted by the handlers of the writer thread.
+        """
+        return record
+
+    def enqueue(self, record: LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            dropped_records.add(1, {'logging.drop.reason': 'queue_full'})
@@ -1,15 +1,23 @@
+from atexit import register
 from logging import getLogger, ERROR, StreamHandler
+from logging.handlers import QueueListener
+from queue import Queue
 from sys import stdout
 
 from pythonjsonlogger import jsonlogger
 
+from settings import settings
+
+from infrastructure.logging.handlers import NonBlockingQueueHandler, RateLimitFilter
+
 
 def setup_logging() -> None:
     """
     Setup the root logger configuration.
 
     - Setup handler and log format.
-    - Configure the root logger logging level and handler.
+    - Start the writer thread the records are formatted and written by.
+    - Configure the root logger logging level and the queue handler.
     """
     handler = StreamHandler(stream=stdout)
 
@@ -21,6 +29,15 @@ def setup_logging() -> None:
 
     handler.setFormatter(formatter)
 
+    queue = Queue(maxsize=settings.logging_queue_size)
+
+    listener = QueueListener(queue, handler, respect_handler_level=True)
+    listener.start()
+    register(listener.stop)
+
+    queue_handler = NonBlockingQueueHandler(queue=queue)
+    queue_handler.addFilter(RateLimitFilter())
+
     root = getLogger()
     root.setLevel(level=ERROR)
-    root.addHandler(hdlr=handler)
+    root.addHandler(hdlr=queue_handler)
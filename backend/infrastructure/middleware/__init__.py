@@ -1 +1,3 @@
+from infrastructure.middleware.round_trips import DatabaseRoundTripsMiddleware
+
 from infrastructure.middleware.main import setup_middleware
@@ -3,11 +3,14 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from settings import settings
 
+from infrastructure.middleware import DatabaseRoundTripsMiddleware
+
 
 def setup_middleware(application: FastAPI) -> None:
     """
     Adds middleware to application.
     """
+    application.add_middleware(DatabaseRoundTripsMiddleware)
     application.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_origins,
@@ -0,0 +1,32 @@
+from opentelemetry.trace import get_current_span
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from infrastructure.monitoring.database import RequestRoundTrips, request_round_trips, request_round_trips_var
+
+
+class DatabaseRoundTripsMiddleware:
+    """
+    Count the database round trips of every request.
+
+    The count is exposed as the db.round_trips attribute of the request span
+    and recorded into the per-route histogram once the request is handled.
+    """
+
+    def __init__(self, application: ASGIApp) -> None:
+        self.application = application
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope.get('type') != 'http':
+            await self.application(scope, receive, send)
+            return
+
+        round_trips = RequestRoundTrips(span=get_current_span())
+        token = request_round_trips_var.set(round_trips)
+
+        try:
+            await self.application(scope, receive, send)
+        finally:
+            request_round_trips_var.reset(token)
+
+            if (route := scope.get('route')) is not None:
+                request_round_trips.record(round_trips.count, {'http.route': route.path})
@@ -1 +1,2 @@
-from infrastructure.monitoring.main import setup_metrics
+from infrastructure.monitoring.event_loop import EventLoopMonitor
+from infrastructure.monitoring.main import setup_metrics, setup_tracing, start_metrics_server
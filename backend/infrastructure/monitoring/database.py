@@ -0,0 +1,133 @@
+from contextvars import ContextVar
+from functools import wraps
+from inspect import isasyncgenfunction
+from time import perf_counter
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
+
+from opentelemetry.metrics import get_meter
+from opentelemetry.trace import Span
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+T = TypeVar('T')
+
+meter = get_meter(__name__)
+
+operation_duration = meter.create_histogram(
+    name='db.client.operation.duration',
+    unit='s',
+    description='The duration of a repository method.',
+)
+returned_rows = meter.create_histogram(
+    name='db.client.response.returned_rows',
+    unit='{row}',
+    description='The number of rows returned by a repository method.',
+)
+request_round_trips = meter.create_histogram(
+    name='db.client.request.round_trips',
+    unit='{statement}',
+    description='The number of statements sent to the database while handling a request.',
+)
+
+
+class RequestRoundTrips:
+    """
+    The counter of the statements executed while handling a single request.
+    """
+
+    def __init__(self, span: Span) -> None:
+        """
+        Initialize the counter.
+
+        Args:
+            span (Span): The request span the counter is exposed on.
+        """
+        self.span = span
+        self.count = 0
+
+    def increment(self) -> None:
+        self.count += 1
+        self.span.set_attribute('db.round_trips', self.count)
+
+
+request_round_trips_var: ContextVar[RequestRoundTrips | None] = ContextVar('request_round_trips', default=None)
+
+
+def count_rows(result: Any) -> int:
+    """
+    Get the number of rows a repository method returned.
+    """
+    if result is None:
+        return 0
+    if isinstance(result, (list, set, tuple)):
+        return len(result)
+    return 1
+
+def instrument_query(method: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """
+    The decorator that records the duration and the returned rows of a repository method.
+
+    The method is identified by its qualified name, e.g. UserRepository.get_by_properties.
+    For the methods that stream the partitions of rows the duration covers the whole
+    iteration and the rows of all the partitions are counted.
+    """
+    operation_name = method.__qualname__
+
+    if isasyncgenfunction(method):
+        return instrument_stream(method=method, operation_name=operation_name)
+
+    @wraps(method)
+    async def wrapper(*args, **kwargs) -> T:
+        attributes = {'db.operation.name': operation_name}
+        started_at = perf_counter()
+
+        try:
+            result = await method(*args, **kwargs)
+        except Exception as exception:
+            operation_duration.record(
+                perf_counter() - started_at,
+                {**attributes, 'error.type': type(exception).__name__},
+            )
+            raise
+
+        operation_duration.record(perf_counter() - started_at, attributes)
+        returned_rows.record(count_rows(result), attributes)
+
+        return result
+
+    return wrapper
+
+def instrument_stream(method: Callable[..., AsyncIterator[T]], operation_name: str) -> Callable[..., AsyncIterator[T]]:
+    @wraps(method)
+    async def wrapper(*args, **kwargs) -> AsyncIterator[T]:
+        attributes = {'db.operation.name': operation_name}
+        started_at = perf_counter()
+        rows = 0
+
+        try:
+            async for partition in method(*args, **kwargs):
+                rows += count_rows(partition)
+                yield partition
+        except Exception as exception:
+            operation_duration.record(
+                perf_counter() - started_at,
+                {**attributes, 'error.type': type(exception).__name__},
+            )
+            raise
+
+        operation_duration.record(perf_counter() - started_at, attributes)
+        returned_rows.record(rows, attributes)
+
+    return wrapper
+
+def count_round_trip(*args) -> None:
+    if (round_trips := request_round_trips_var.get()) is not None:
+        round_trips.increment()
+
+def instrument_engine(engine: AsyncEngine) -> AsyncEngine:
+    """
+    Count every statement the engine sends towards the round trips of the current request.
+    """
+    event.listen(engine.sync_engine, 'before_cursor_execute', count_round_trip)
+    return engine
@@ -0,0 +1,142 @@
+from asyncio import Event, Task, TimeoutError, get_running_loop, wait_for
+from logging import getLogger
+from sys import _current_frames
+from threading import Event as ThreadEvent, Thread, get_ident
+from time import perf_counter
+from traceback import extract_stack, format_list, walk_stack
+from types import FrameType
+
+from opentelemetry.metrics import get_meter
+
+from settings import settings
+
+
+meter = get_meter(__name__)
+
+event_loop_lag = meter.create_histogram(
+    name='event_loop.lag',
+    unit='s',
+    description='The delay between the time the event loop was due to run a callback and the time it did.',
+)
+blocking_calls = meter.create_counter(
+    name='event_loop.blocking_calls',
+    unit='{call}',
+    description='The number of callbacks that blocked the event loop for longer than the threshold.',
+)
+
+
+def get_attribution(frame: FrameType) -> dict:
+    """
+    Find the route and the use case a blocked event loop is running from its stack.
+
+    Returns:
+        dict: The route and the use case, each is None if it is not on the stack.
+    """
+    attribution = {'route': None, 'use_case': None}
+
+    for frame, _ in walk_stack(frame):
+        frame_locals = frame.f_locals
+
+        if attribution.get('use_case') is None and type(frame_locals.get('self')).__name__.endswith('UseCase'):
+            attribution['use_case'] = f'{type(frame_locals.get("self")).__name__}.{frame.f_code.co_name}'
+
+        scope = frame_locals.get('scope')
+
+        if attribution.get('route') is None and isinstance(scope, dict) and scope.get('type') == 'http':
+            if (route := scope.get('route')) is not None:
+                attribution['route'] = f'{scope.get("method")} {route.path}'
+
+    return attribution
+
+
+class EventLoopMonitor:
+    """
+    The monitor of the scheduling delay of the event loop.
+
+    A task wakes up every settings.event_loop_monitor_interval seconds and records how late it was.
+    In the debug mode a watchdog thread also samples the stack of the event loop once the task
+    is late by more than settings.event_loop_blocking_threshold, i.e. some callback is still
+    blocking the loop, and logs it along with the route and the use case it was called from.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the monitor.
+        """
+        self.stopping = Event()
+        self.task: Task | None = None
+        self.watchdog: Thread | None = None
+        self.watchdog_stopping = ThreadEvent()
+        self.loop_thread_id: int | None = None
+        self.due_at = perf_counter()
+        self.logger = getLogger(settings.event_loop_logger_name)
+
+    def start(self) -> None:
+        self.loop_thread_id = get_ident()
+        self.task = get_running_loop().create_task(self.run())
+
+        if settings.event_loop_monitor_debug:
+            self.watchdog = Thread(target=self.watch, name='event-loop-watchdog', daemon=True)
+            self.watchdog.start()
+
+    async def stop(self) -> None:
+        """
+        Stop the monitor and its watchdog.
+        """
+        self.stopping.set()
+        self.watchdog_stopping.set()
+
+        if self.task is not None:
+            await self.task
+
+        if self.watchdog is not None:
+            self.watchdog.join()
+
+    async def run(self) -> None:
+        interval = settings.event_loop_monitor_interval
+
+        while not self.stopping.is_set():
+            self.due_at = perf_counter() + interval
+
+            try:
+                await wait_for(self.stopping.wait(), timeout=interval)
+            except TimeoutError:
+                pass
+
+            event_loop_lag.record(max(perf_counter() - self.due_at, 0.0))
+
+    def watch(self) -> None:
+        """
+        Sample the stack of the event loop once per blocking call.
+        """
+        threshold = settings.event_loop_blocking_threshold
+        sampled_due_at = None
+
+        while not self.watchdog_stopping.wait(timeout=threshold / 2):
+            due_at = self.due_at
+
+            if due_at == sampled_due_at or perf_counter() - due_at < threshold:
+                continue
+
+            if (frame := _current_frames().get(self.loop_thread_id)) is None:
+                continue
+
+            sampled_due_at = due_at
+            self.report(frame=frame, blocked_for=perf_counter() - due_at)
+
+    def report(self, frame: FrameType, blocked_for: float) -> None:
+        attribution = get_attribution(frame=frame)
+
+        attributes = {'http.route': attribution.get('route'), 'app.use_case': attribution.get('use_case')}
+        blocking_calls.add(1, {key: value for key, value in attributes.items() if value is not None})
+
+        self.logger.error(
+            'The event loop is blocked.',
+            extra={
+                'user_id': None,
+                'event_type': 'Event loop blocked.',
+                'blocked_for': round(blocked_for, 4),
+                **attribution,
+                'stack': ''.join(format_list(extract_stack(frame)[-settings.event_loop_stack_depth:])),
+            },
+        )
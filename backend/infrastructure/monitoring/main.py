@@ -1,34 +1,117 @@
-from opentelemetry import metrics
+from wsgiref.simple_server import WSGIServer
+
+from opentelemetry import metrics, trace
 from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import OTLPMetricExporter
+from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+from opentelemetry.exporter.prometheus import PrometheusMetricReader
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics import Histogram, MeterProvider
 from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
+from opentelemetry.sdk.metrics.view import ExplicitBucketHistogramAggregation, View
 from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from prometheus_client import start_http_server
 
 from fastapi import FastAPI
 
 from settings import settings
 
+from infrastructure.monitoring.operations import instrument_operations
+
+
+def setup_tracing() -> None:
+    """
+    Setup opentelemetry tracing.
+
+    - Export the spans to the collector if enabled, otherwise the spans are not recorded at all.
+    - Instrument the use cases, the hasher and the JWT manager if enabled.
+    """
+    if settings.tracing_otlp_enabled:
+        exporter = OTLPSpanExporter(
+            endpoint=settings.opentelemetry_collector_url,
+            insecure=True,
+        )
+
+        provider = TracerProvider(
+            resource=Resource.create({'service_name': 'chat_authentication'})
+        )
+        provider.add_span_processor(BatchSpanProcessor(span_exporter=exporter))
+
+        trace.set_tracer_provider(provider)
+
+    if settings.operation_instrumentation_enabled:
+        instrument_operations()
+
+def get_views() -> list[View]:
+    """
+    Get the views that set the histogram buckets to the latency ranges of the service.
+
+    The durations are recorded in seconds by the service and in milliseconds by the HTTP instrumentation.
+    """
+    buckets = settings.metrics_duration_buckets
+
+    return [
+        View(
+            instrument_type=Histogram,
+            instrument_unit='s',
+            aggregation=ExplicitBucketHistogramAggregation(boundaries=buckets),
+        ),
+        View(
+            instrument_type=Histogram,
+            instrument_unit='ms',
+            aggregation=ExplicitBucketHistogramAggregation(boundaries=[bucket * 1000 for bucket in buckets]),
+        ),
+    ]
 
 def setup_metrics(application: FastAPI) -> None:
     """
     Setup opentelemtery metrics.
+
+    - Export the metrics to the collector every settings.metrics_export_interval milliseconds if enabled.
+    - Collect the metrics to be scraped by Prometheus if enabled, see start_metrics_server.
     """
-    exporter = OTLPMetricExporter(
-        endpoint=settings.opentelemetry_collector_url,
-        insecure=True,
-    )
+    metrics_readers = []
 
-    metrics_reader = PeriodicExportingMetricReader(
-        exporter=exporter,
-        export_interval_millis=1000,
-    )
+    if settings.metrics_otlp_enabled:
+        exporter = OTLPMetricExporter(
+            endpoint=settings.opentelemetry_collector_url,
+            insecure=True,
+        )
+
+        metrics_readers.append(
+            PeriodicExportingMetricReader(
+                exporter=exporter,
+                export_interval_millis=settings.metrics_export_interval,
+                export_timeout_millis=settings.metrics_export_timeout,
+            ),
+        )
+
+    if settings.metrics_prometheus_enabled:
+        metrics_readers.append(PrometheusMetricReader())
 
     provider = MeterProvider(
-        metric_readers=[metrics_reader],
-        resource=Resource.create({'service_name': 'chat_authentication'})
+        metric_readers=metrics_readers,
+        resource=Resource.create({'service_name': 'chat_authentication'}),
+        views=get_views(),
     )
 
     metrics.set_meter_provider(provider)
 
     FastAPIInstrumentor.instrument_app(application)
+
+def start_metrics_server() -> WSGIServer | None:
+    """
+    Serve the metrics to be scraped by Prometheus if enabled.
+
+    The metrics are served on settings.metrics_prometheus_port in a thread, apart from the public
+    port of the service, so the port can be left reachable by the scraper only.
+
+    Returns:
+        WSGIServer | None: The server to shut down or None if the metrics are not exposed.
+    """
+    if not settings.metrics_prometheus_enabled:
+        return None
+
+    server, _ = start_http_server(port=settings.metrics_prometheus_port, addr=settings.metrics_prometheus_host)
+    return server
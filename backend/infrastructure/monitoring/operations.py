@@ -0,0 +1,74 @@
+from functools import wraps
+from inspect import getmembers, iscoroutinefunction, isclass
+from time import perf_counter
+from typing import Any, Awaitable, Callable, TypeVar
+
+from opentelemetry.metrics import get_meter
+from opentelemetry.trace import get_tracer
+
+import application.use_cases
+
+from infrastructure.security import DefaultHasher, JWTManager
+
+
+T = TypeVar('T')
+
+meter = get_meter(__name__)
+tracer = get_tracer(__name__)
+
+operation_duration = meter.create_histogram(
+    name='app.operation.duration',
+    unit='s',
+    description='The duration of a use case, a step of a use case or a security operation.',
+)
+
+
+def instrument_operation(method: Callable[..., Awaitable[T]], operation_name: str) -> Callable[..., Awaitable[T]]:
+    """
+    Wrap a coroutine method into a span and record its duration.
+
+    The steps a use case awaits are instrumented too, so their spans are nested
+    into the span of the use case and give the breakdown of its latency.
+    """
+    attributes = {'app.operation.name': operation_name}
+
+    @wraps(method)
+    async def wrapper(*args, **kwargs) -> T:
+        started_at = perf_counter()
+
+        with tracer.start_as_current_span(operation_name, attributes=attributes):
+            try:
+                result = await method(*args, **kwargs)
+            except Exception as exception:
+                operation_duration.record(
+                    perf_counter() - started_at,
+                    {**attributes, 'error.type': type(exception).__name__},
+                )
+                raise
+
+        operation_duration.record(perf_counter() - started_at, attributes)
+
+        return result
+
+    return wrapper
+
+def instrument_class(cls: type[Any]) -> None:
+    """
+    Instrument the public coroutine methods of a class, e.g. CreateSessionUseCase.execute.
+    """
+    for name, member in vars(cls).copy().items():
+        if name.startswith('_') or not iscoroutinefunction(member) or hasattr(member, '__wrapped__'):
+            continue
+        setattr(cls, name, instrument_operation(method=member, operation_name=f'{cls.__name__}.{name}'))
+
+def instrument_operations() -> None:
+    """
+    Instrument every use case along with the hasher and the JWT manager.
+
+    The methods are replaced once on startup, nothing is wrapped unless this is called,
+    so disabled instrumentation costs nothing.
+    """
+    use_cases = [cls for _, cls in getmembers(application.use_cases, isclass) if cls.__name__.endswith('UseCase')]
+
+    for cls in [*use_cases, DefaultHasher, JWTManager]:
+        instrument_class(cls=cls)
@@ -0,0 +1 @@
+from infrastructure.outbox.dispatcher import OutboxDispatcher
@@ -0,0 +1,364 @@
+from asyncio import Event, Task, TimeoutError, gather, get_running_loop, wait_for
+from datetime import datetime, timedelta, timezone
+from logging import getLogger
+from time import monotonic, perf_counter
+from typing import Callable, Iterable
+
+from opentelemetry.metrics import CallbackOptions, Observation, get_meter
+
+from settings import settings
+
+from application.exceptions import CircuitOpenException
+from application.ports import DatabaseUnitOfWorkPort, UpdateChatRelatedUserPort
+from infrastructure.database.repositories import OutboxRepository
+
+
+meter = get_meter(__name__)
+
+dispatched_messages = meter.create_counter(
+    name='outbox.messages.dispatched',
+    unit='{message}',
+    description='The number of outbox messages processed by the dispatcher by their outcome.',
+)
+purged_messages = meter.create_counter(
+    name='outbox.messages.purged',
+    unit='{message}',
+    description='The number of finished outbox messages deleted after the retention period.',
+)
+delivery_lag = meter.create_histogram(
+    name='outbox.delivery.lag',
+    unit='s',
+    description='The time between putting a message into the outbox and delivering it.',
+)
+batch_size = meter.create_histogram(
+    name='outbox.batch.size',
+    unit='{message}',
+    description='The number of messages claimed by a single dispatch.',
+)
+flush_size = meter.create_histogram(
+    name='outbox.flush.size',
+    unit='{user}',
+    description='The number of users sent to the messaging backend in a single bulk request.',
+)
+flush_duration = meter.create_histogram(
+    name='outbox.flush.duration',
+    unit='s',
+    description='The duration of a single bulk request to the messaging backend.',
+)
+
+
+class OutboxDispatcher:
+    """
+    The background worker that delivers the outbox messages to the messaging backend.
+
+    Messages are claimed in batches with FOR UPDATE SKIP LOCKED, so several workers
+    can run at once. Only the latest update of a user is delivered, the older ones are
+    superseded, and, if settings.messaging_backend_bulk_delivery is on, the updates
+    are sent as a single bulk request. Failed deliveries are retried with an exponential delay
+    until settings.outbox_max_attempts is reached.
+
+    Nothing is claimed while the circuit breaker of the messaging backend rejects the calls, and
+    the deliveries it rejects anyway are retried without using up an attempt, so an outage of
+    the backend does not make the messages fail without a single request reaching it.
+
+    The finished messages are purged every settings.outbox_purge_interval seconds once they are
+    older than settings.outbox_retention_period, so the outbox does not grow without bound.
+    """
+
+    def __init__(
+        self,
+        unit_of_work_factory: Callable[[], DatabaseUnitOfWorkPort],
+        http_service: UpdateChatRelatedUserPort,
+    ) -> None:
+        """
+        Initialize the dispatcher.
+
+        Args:
+            unit_of_work_factory (Callable): Creates the unit of work each dispatch runs in.
+            http_service (UpdateChatRelatedUserPort): The service that delivers the messages.
+        """
+        self.unit_of_work_factory = unit_of_work_factory
+        self.http_service = http_service
+        self.stopping = Event()
+        self.task: Task | None = None
+        self.next_purge_at = 0.0
+        self.pending_count = 0
+        self.oldest_pending_age = 0.0
+        self.logger = getLogger(settings.outbox_logger_name)
+
+        meter.create_observable_gauge(
+            name='outbox.messages.pending',
+            callbacks=[self.observe_pending_count],
+            unit='{message}',
+            description='The number of messages waiting in the outbox.',
+        )
+        meter.create_observable_gauge(
+            name='outbox.oldest_pending.age',
+            callbacks=[self.observe_oldest_pending_age],
+            unit='s',
+            description='The age of the oldest message waiting in the outbox.',
+        )
+
+    def observe_pending_count(self, options: CallbackOptions) -> Iterable[Observation]:
+        yield Observation(self.pending_count)
+
+    def observe_oldest_pending_age(self, options: CallbackOptions) -> Iterable[Observation]:
+        yield Observation(self.oldest_pending_age)
+
+    def start(self) -> None:
+        self.task = get_running_loop().create_task(self.run())
+
+    async def stop(self) -> None:
+        """
+        Let the current dispatch finish and stop the worker.
+        """
+        self.stopping.set()
+
+        if self.task is not None:
+            await self.task
+
+    async def run(self) -> None:
+        while not self.stopping.is_set():
+            try:
+                dispatched = await self.dispatch()
+            except Exception:
+                self.logger.exception(
+                    'Failed to dispatch the outbox messages.',
+                    extra={'user_id': None, 'event_type': 'Outbox dispatch failed.'},
+                )
+                dispatched = 0
+
+            if monotonic() >= self.next_purge_at:
+                self.next_purge_at = monotonic() + settings.outbox_purge_interval
+
+                try:
+                    await self.purge()
+                except Exception:
+                    self.logger.exception(
+                        'Failed to purge the outbox messages.',
+                        extra={'user_id': None, 'event_type': 'Outbox purge failed.'},
+                    )
+
+            if dispatched < settings.outbox_batch_size:
+                try:
+                    await wait_for(self.stopping.wait(), timeout=settings.outbox_poll_interval)
+                except TimeoutError:
+                    pass
+
+    async def dispatch(self) -> int:
+        """
+        Claim a batch of the due messages, deliver them and record the results.
+
+        The claim is committed before the delivery, so neither the row locks nor a pooled
+        connection are held during the requests to the messaging backend. The claimed
+        messages are leased for settings.outbox_lease_duration seconds and become due
+        again if the dispatcher dies before recording the results. Nothing is claimed while
+        the messaging backend is not available.
+
+        Returns:
+            int: The number of claimed messages.
+        """
+        if self.http_service.is_available():
+            async with self.unit_of_work_factory() as database_uow:
+                messages = await self.claim(repository=OutboxRepository(session=database_uow.session))
+                await database_uow.commit()
+        else:
+            messages = []
+
+        if messages:
+            if settings.messaging_backend_bulk_delivery:
+                results = await self.deliver_bulk(messages=messages)
+            else:
+                results = await gather(*(self.deliver(message=message) for message in messages))
+        else:
+            results = []
+
+        async with self.unit_of_work_factory() as database_uow:
+            repository = OutboxRepository(session=database_uow.session)
+
+            await self.record_results(repository=repository, results=results)
+
+            self.pending_count, oldest_created_at = await repository.get_pending_statistics()
+            self.oldest_pending_age = self.get_age(oldest_created_at) if oldest_created_at is not None else 0.0
+
+            await database_uow.commit()
+
+        return len(messages)
+
+    async def purge(self) -> int:
+        """
+        Delete the finished messages older than settings.outbox_retention_period.
+
+        The messages are deleted by batches of settings.outbox_purge_batch_size, each in its own
+        short transaction, so neither the dispatch nor the writers are held up for long.
+
+        Returns:
+            int: The number of deleted messages.
+        """
+        finished_before = datetime.now(timezone.utc) - timedelta(seconds=settings.outbox_retention_period)
+        purged = 0
+
+        while not self.stopping.is_set():
+            async with self.unit_of_work_factory() as database_uow:
+                deleted = await OutboxRepository(session=database_uow.session).purge_messages(
+                    finished_before=finished_before,
+                    limit=settings.outbox_purge_batch_size,
+                )
+                await database_uow.commit()
+
+            purged += deleted
+
+            if deleted < settings.outbox_purge_batch_size:
+                break
+
+        if purged:
+            purged_messages.add(purged)
+
+        return purged
+
+    async def claim(self, repository: OutboxRepository) -> list[dict]:
+        """
+        Claim the latest message of every key among the due ones.
+
+        The messages that have a newer message of the same key, claimed or not, are
+        marked as superseded, so an older update is never delivered after a newer one.
+
+        Returns:
+            list[dict]: The claimed messages.
+        """
+        messages = await repository.claim_pending_messages(limit=settings.outbox_batch_size)
+
+        if not messages:
+            return []
+
+        batch_size.record(len(messages))
+
+        superseded_ids = await repository.supersede_messages(
+            keys={message.get('key') for message in messages},
+            ids={message.get('id') for message in messages},
+        )
+
+        latest_messages = {}
+
+        for message in messages:
+            if message.get('id') in superseded_ids:
+                continue
+
+            latest_message = latest_messages.get(message.get('key'))
+
+            if latest_message is None or message.get('id') > latest_message.get('id'):
+                latest_messages[message.get('key')] = message
+
+        claimed_ids = {message.get('id') for message in latest_messages.values()}
+
+        if (duplicate_ids := {message.get('id') for message in messages} - superseded_ids - claimed_ids):
+            await repository.update_messages(ids=duplicate_ids, data={'status': 'superseded'})
+            superseded_ids |= duplicate_ids
+
+        if superseded_ids:
+            dispatched_messages.add(len(superseded_ids), {'outbox.message.status': 'superseded'})
+
+        if claimed_ids:
+            await repository.update_messages(
+                ids=claimed_ids,
+                data={
+                    'status': 'processing',
+                    'available_at': datetime.now(timezone.utc) + timedelta(seconds=settings.outbox_lease_duration),
+                },
+            )
+
+        return list(latest_messages.values())
+
+    async def deliver(self, message: dict) -> tuple[dict, str]:
+        """
+        Deliver a single message.
+
+        Returns:
+            tuple[dict, str]: The message and the outcome: delivered, rejected by the circuit breaker or failed.
+        """
+        try:
+            await self.http_service.execute(user_data=message.get('payload'), access_token=message.get('access_token'))
+        except CircuitOpenException:
+            return message, 'rejected'
+        except Exception:
+            self.logger.error(
+                'Failed to deliver an outbox message.',
+                extra={'user_id': message.get('payload').get('id'), 'event_type': 'Outbox delivery failed.'},
+            )
+            return message, 'failed'
+
+        return message, 'delivered'
+
+    async def deliver_bulk(self, messages: list[dict]) -> list[tuple[dict, str]]:
+        """
+        Deliver the messages with a single bulk request.
+
+        Returns:
+            list[tuple[dict, str]]: The messages and the outcome: delivered, rejected by the circuit breaker or failed.
+        """
+        started_at = perf_counter()
+
+        try:
+            await self.http_service.execute_bulk(users_data=[message.get('payload') for message in messages])
+        except CircuitOpenException:
+            return [(message, 'rejected') for message in messages]
+        except Exception:
+            self.logger.error(
+                'Failed to deliver a bulk of outbox messages.',
+                extra={'user_id': None, 'event_type': 'Outbox bulk delivery failed.'},
+            )
+            outcome = 'failed'
+        else:
+            outcome = 'delivered'
+
+        flush_size.record(len(messages))
+        flush_duration.record(perf_counter() - started_at, {'outbox.flush.delivered': outcome == 'delivered'})
+
+        return [(message, outcome) for message in messages]
+
+    async def record_results(self, repository: OutboxRepository, results: list[tuple[dict, str]]) -> None:
+        """
+        Mark the delivered messages and schedule the retries of the failed ones.
+
+        The messages rejected by the circuit breaker did not reach the backend, so they are
+        retried after settings.outbox_retry_base_delay without using up an attempt.
+        """
+        now = datetime.now(timezone.utc)
+
+        if (delivered_ids := {message.get('id') for message, outcome in results if outcome == 'delivered'}):
+            await repository.update_messages(ids=delivered_ids, data={'status': 'dispatched', 'dispatched_at': now})
+            dispatched_messages.add(len(delivered_ids), {'outbox.message.status': 'dispatched'})
+
+        if (rejected_ids := {message.get('id') for message, outcome in results if outcome == 'rejected'}):
+            await repository.update_messages(
+                ids=rejected_ids,
+                data={
+                    'status': 'pending',
+                    'available_at': now + timedelta(seconds=settings.outbox_retry_base_delay),
+                },
+            )
+            dispatched_messages.add(len(rejected_ids), {'outbox.message.status': 'rejected'})
+
+        for message, outcome in results:
+            if outcome == 'delivered':
+                delivery_lag.record(self.get_age(message.get('created_at')))
+                continue
+
+            if outcome == 'rejected':
+                continue
+
+            attempts = message.get('attempts') + 1
+
+            if attempts >= settings.outbox_max_attempts:
+                data = {'status': 'failed', 'attempts': attempts}
+                dispatched_messages.add(1, {'outbox.message.status': 'failed'})
+            else:
+                delay = min(settings.outbox_retry_base_delay * 2 ** (attempts - 1), settings.outbox_retry_max_delay)
+                data = {'status': 'pending', 'attempts': attempts, 'available_at': now + timedelta(seconds=delay)}
+                dispatched_messages.add(1, {'outbox.message.status': 'retried'})
+
+            await repository.update_messages(ids={message.get('id')}, data=data)
+
+    @staticmethod
+    def get_age(created_at: datetime) -> float:
+        return (datetime.now(timezone.utc) - created_at).total_seconds()
@@ -0,0 +1 @@
+from infrastructure.profiling.profilers import profile_calls, sample_stacks, trace_allocations
@@ -0,0 +1,123 @@
+from asyncio import sleep, to_thread
+from cProfile import Profile
+from collections import Counter
+from marshal import dumps
+from sys import _current_frames
+from threading import get_ident
+from time import perf_counter, sleep as blocking_sleep
+from types import FrameType
+import tracemalloc
+
+from settings import settings
+
+
+def get_frame_label(frame: FrameType) -> str:
+    """
+    Get the label of a frame in the collapsed stack format, e.g. get_request_user (.../authentication.py).
+    """
+    return f'{frame.f_code.co_qualname} ({frame.f_code.co_filename})'.replace(';', ':')
+
+def collapse(stacks: Counter) -> str:
+    """
+    Render the stacks in the collapsed format flamegraph.pl and speedscope read.
+
+    Every line is the frames from the root to the leaf separated by semicolons and the value of the stack.
+    """
+    return ''.join(f'{";".join(stack)} {value}\n' for stack, value in stacks.most_common())
+
+def collect_samples(thread_id: int, duration: float, interval: float) -> Counter:
+    """
+    Sample the stack of a thread every interval seconds for duration seconds.
+
+    Runs in a thread of its own, so the sampled thread keeps running while it is profiled.
+    """
+    stacks = Counter()
+    finishes_at = perf_counter() + duration
+
+    while perf_counter() < finishes_at:
+        if (frame := _current_frames().get(thread_id)) is not None:
+            stack = []
+
+            while frame is not None:
+                stack.append(get_frame_label(frame=frame))
+                frame = frame.f_back
+
+            stacks[tuple(reversed(stack))] += 1
+
+        blocking_sleep(interval)
+
+    return stacks
+
+async def sample_stacks(duration: float, interval: float) -> str:
+    """
+    Run a sampling profile of the event loop thread.
+
+    Args:
+        duration (float): The number of seconds to profile for.
+        interval (float): The number of seconds between the samples.
+
+    Returns:
+        str: The sampled stacks in the collapsed format, the values are the numbers of samples.
+    """
+    stacks = await to_thread(collect_samples, thread_id=get_ident(), duration=duration, interval=interval)
+    return collapse(stacks=stacks)
+
+async def profile_calls(duration: float) -> bytes:
+    """
+    Run cProfile on the event loop thread.
+
+    The profile covers every callback the event loop runs in the meantime, not only this request.
+
+    Args:
+        duration (float): The number of seconds to profile for.
+
+    Returns:
+        bytes: The profile in the format pstats.Stats and snakeviz load.
+    """
+    profile = Profile()
+    profile.enable()
+
+    try:
+        await sleep(duration)
+    finally:
+        profile.disable()
+
+    profile.create_stats()
+
+    return dumps(profile.stats)
+
+async def trace_allocations(duration: float) -> str:
+    """
+    Trace the memory allocated by the process.
+
+    The tracing is started if it is not running already and stopped afterwards,
+    it slows down every allocation while it runs.
+
+    Args:
+        duration (float): The number of seconds to trace for.
+
+    Returns:
+        str: The stacks of the allocations in the collapsed format, the values are the numbers of bytes
+            allocated and not released in the meantime.
+    """
+    started = not tracemalloc.is_tracing()
+
+    if started:
+        tracemalloc.start(settings.profiling_traceback_limit)
+
+    try:
+        before = tracemalloc.take_snapshot()
+        await sleep(duration)
+        after = tracemalloc.take_snapshot()
+    finally:
+        if started:
+            tracemalloc.stop()
+
+    stacks = Counter()
+
+    for statistic in after.compare_to(before, 'traceback'):
+        if statistic.size_diff > 0:
+            stack = tuple(f'{frame.filename}:{frame.lineno}'.replace(';', ':') for frame in statistic.traceback)
+            stacks[stack] += statistic.size_diff
+
+    return collapse(stacks=stacks)
@@ -0,0 +1,2 @@
+from infrastructure.streaming.encoders import encode_json_array, encode_ndjson
+from infrastructure.streaming.uploads import MultipartUpload
@@ -0,0 +1,28 @@
+from dataclasses import asdict
+from json import dumps
+from typing import AsyncIterator
+
+
+def encode(item: object) -> str:
+    return dumps(asdict(item), separators=(',', ':'))
+
+async def encode_ndjson(partitions: AsyncIterator[list]) -> AsyncIterator[bytes]:
+    """
+    Encode the partitions of dataclasses as newline delimited JSON.
+    """
+    async for partition in partitions:
+        if partition:
+            yield ''.join(f'{encode(item)}\n' for item in partition).encode()
+
+async def encode_json_array(partitions: AsyncIterator[list]) -> AsyncIterator[bytes]:
+    """
+    Encode the partitions of dataclasses as a single JSON array that is sent in chunks.
+    """
+    separator = '['
+
+    async for partition in partitions:
+        if partition:
+            yield (separator + ','.join(encode(item) for item in partition)).encode()
+            separator = ','
+
+    yield b'[]' if separator == '[' else b']'
@@ -0,0 +1,158 @@
+from collections import deque
+from typing import AsyncIterator
+
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+from settings import settings
+
+from application.exceptions import FileSizeException
+
+
+class MultipartUpload:
+    """
+    The file of a multipart request parsed while the request body is being received.
+
+    Unlike the form parsing of Starlette, the body is neither received in full nor spooled
+    before the handler runs. The request is rejected right away if its Content-Length
+    exceeds the limit and the receiving is aborted as soon as the body does.
+    """
+
+    def __init__(self, request: Request, field_name: str) -> None:
+        """
+        Initialize the upload.
+
+        Args:
+            request (Request): The multipart request.
+            field_name (str): The name of the form field the file is sent in.
+        """
+        self.request = request
+        self.field_name = field_name.encode()
+        self.max_body_size = settings.max_size + settings.max_multipart_overhead
+        self.body = request.stream()
+        self.received_size = 0
+        self.filename = None
+        self.chunks = deque()
+        self.file_found = False
+        self.file_finished = False
+        self.part_is_file = False
+        self.headers = {}
+        self.header_field = bytearray()
+        self.header_value = bytearray()
+        self.parser = None
+
+    def reject_too_large(self) -> None:
+        raise FileSizeException(
+            title='File size exception.',
+            details={'File size exception.': 'The file size exceeded the allowed file size.'},
+        )
+
+    def reject_invalid(self, message: str) -> None:
+        raise RequestValidationError(
+            [{'type': 'missing', 'loc': ('body', self.field_name.decode()), 'msg': message, 'input': None}],
+        )
+
+    async def open(self) -> None:
+        """
+        Receive the body until the headers of the file part, so its name is known.
+
+        Raises:
+            FileSizeException: If the Content-Length of the request exceeds the limit.
+            RequestValidationError: If the request is not multipart or has no file in the field.
+        """
+        if int(self.request.headers.get('content-length') or 0) > self.max_body_size:
+            self.reject_too_large()
+
+        content_type, options = parse_options_header(self.request.headers.get('content-type', ''))
+
+        if content_type != b'multipart/form-data' or not options.get(b'boundary'):
+            self.reject_invalid(message='A multipart request with a file is required.')
+
+        self.parser = MultipartParser(
+            boundary=options.get(b'boundary'),
+            callbacks={
+                'on_part_begin': self.on_part_begin,
+                'on_header_field': self.on_header_field,
+                'on_header_value': self.on_header_value,
+                'on_header_end': self.on_header_end,
+                'on_headers_finished': self.on_headers_finished,
+                'on_part_data': self.on_part_data,
+                'on_part_end': self.on_part_end,
+            },
+        )
+
+        while not self.file_found:
+            if not await self.receive():
+                self.reject_invalid(message='Field required')
+
+    async def receive(self) -> bool:
+        """
+        Receive and parse the next chunk of the body.
+
+        Returns:
+            bool: False if the body is over.
+
+        Raises:
+            FileSizeException: If the received body exceeds the limit.
+        """
+        try:
+            chunk = await anext(self.body)
+        except StopAsyncIteration:
+            return False
+
+        self.received_size += len(chunk)
+
+        if self.received_size > self.max_body_size:
+            self.reject_too_large()
+
+        self.parser.write(chunk)
+        return True
+
+    async def read_chunks(self) -> AsyncIterator[bytes]:
+        """
+        Stream the file as the body is received.
+
+        Yields:
+            bytes: The chunks of the file.
+        """
+        while True:
+            while self.chunks:
+                yield self.chunks.popleft()
+
+            if self.file_finished:
+                return
+
+            if not await self.receive():
+                self.reject_invalid(message='The file is incomplete.')
+
+    def on_part_begin(self) -> None:
+        self.headers = {}
+
+    def on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self.header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self.header_value += data[start:end]
+
+    def on_header_end(self) -> None:
+        self.headers[bytes(self.header_field).lower()] = bytes(self.header_value)
+        self.header_field.clear()
+        self.header_value.clear()
+
+    def on_headers_finished(self) -> None:
+        _, options = parse_options_header(self.headers.get(b'content-disposition', b''))
+
+        if not self.file_found and options.get(b'name') == self.field_name and b'filename' in options:
+            self.file_found = True
+            self.part_is_file = True
+            self.filename = options.get(b'filename').decode('utf-8', errors='replace')
+
+    def on_part_data(self, data: bytes, start: int, end: int) -> None:
+        if self.part_is_file:
+            self.chunks.append(bytes(data[start:end]))
+
+    def on_part_end(self) -> None:
+        if self.part_is_file:
+            self.part_is_file = False
+            self.file_finished = True
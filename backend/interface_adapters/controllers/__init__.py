@@ -1,6 +1,9 @@
 from interface_adapters.controllers.create_session import CreateSessionController
 from interface_adapters.controllers.create_user import CreateUserController
+from interface_adapters.controllers.get_avatar_job import GetAvatarJobController
+from interface_adapters.controllers.get_user_changes import GetUserChangesController
 from interface_adapters.controllers.get_users_info import GetUsersInfoController
+from interface_adapters.controllers.process_avatar import ProcessAvatarController
 from interface_adapters.controllers.refresh_session import RefreshSessionController
 from interface_adapters.controllers.search_users import SearchUsersController
 from interface_adapters.controllers.terminate_all_sessions import TerminateAllSessionsController
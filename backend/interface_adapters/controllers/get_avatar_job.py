@@ -0,0 +1,37 @@
+from application.ports import AvatarJobRepositoryPort
+from application.use_cases import GetAvatarJobUseCase
+from interface_adapters.outgoing_dtos import OutgoingAvatarJobDTO
+
+
+class GetAvatarJobController:
+    """
+    The controller that is responsible for retrieving the status of an avatar processing job.
+    """
+
+    def __init__(self, job_id: str, user_id: int, avatar_job_repo: AvatarJobRepositoryPort) -> None:
+        """
+        Initialize the controller.
+
+        Args:
+            job_id (str): The id of the job.
+            user_id (int): The id of the requesting user.
+            avatar_job_repo (AvatarJobRepositoryPort): The queue of the avatars to process in the background.
+        """
+        self.job_id = job_id
+        self.user_id = user_id
+        self.avatar_job_repo = avatar_job_repo
+
+    async def get_avatar_job(self) -> OutgoingAvatarJobDTO:
+        """
+        Get the job.
+
+        Returns:
+            OutgoingAvatarJobDTO: The status of the job and its result or error once it is finished.
+        """
+        use_case = GetAvatarJobUseCase(
+            job_id=self.job_id,
+            user_id=self.user_id,
+            avatar_job_repo=self.avatar_job_repo,
+        )
+
+        return OutgoingAvatarJobDTO.from_dict(await use_case.execute())
@@ -0,0 +1,53 @@
+from application.ports import DatabaseUnitOfWorkPort, UserRepositoryPort
+from application.use_cases import GetUserChangesUseCase
+from interface_adapters.outgoing_dtos import OutgoingUserChangesDTO, OutgoingUserDTO
+
+
+class GetUserChangesController:
+    """
+    The controller that is responsible for retrieving the changes of the users
+    since the cursor provided by a consumer.
+    """
+
+    def __init__(
+        self,
+        cursor: int,
+        limit: int,
+        database_repo: UserRepositoryPort,
+        database_uow: DatabaseUnitOfWorkPort,
+    ) -> None:
+        """
+        Initialize the controller.
+
+        Args:
+            cursor (int): The version of the last change seen by the consumer.
+            limit (int): The maximum number of changes in a page.
+            database_repo (UserRepositoryPort): The port responsible for actions with users.
+            database_uow (DatabaseUnitOfWorkPort): The unit of work the changes are read in.
+        """
+        self.cursor = cursor
+        self.limit = limit
+        self.database_repo = database_repo
+        self.database_uow = database_uow
+
+    async def get_user_changes(self) -> OutgoingUserChangesDTO:
+        """
+        Get a page of the changes.
+
+        Returns:
+            OutgoingUserChangesDTO: The changed users and the cursor of the next page.
+        """
+        use_case = GetUserChangesUseCase(
+            cursor=self.cursor,
+            limit=self.limit,
+            database_repo=self.database_repo,
+            database_uow=self.database_uow,
+        )
+
+        changes = await use_case.execute()
+
+        return OutgoingUserChangesDTO(
+            users=[OutgoingUserDTO.from_dict(user_data) for user_data in changes.get('users')],
+            cursor=changes.get('cursor'),
+            has_more=changes.get('has_more'),
+        )
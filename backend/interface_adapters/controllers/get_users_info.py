@@ -1,3 +1,5 @@
+from typing import AsyncIterator
+
 from application.ports import UserRepositoryPort
 from application.use_cases import GetUsersInfoUseCase
 from interface_adapters.outgoing_dtos import OutgoingUserDTO
@@ -20,17 +22,19 @@ class GetUsersInfoController:
         self.user_ids = user_ids
         self.database_repo = database_repo
 
-    async def get_users_info(self) -> list:
+    async def get_users_info(self) -> AsyncIterator[list]:
         """
         Get users information.
+
+        Yields:
+            list: The partitions of OutgoingUserDTO.
         """
         user_ids = self.user_ids.get('user_ids')
 
-        raw_users = await GetUsersInfoUseCase(
+        use_case = GetUsersInfoUseCase(
             user_ids=user_ids,
             database_repo=self.database_repo,
-        ).execute()
-        
-        clean_users = [OutgoingUserDTO.from_dict(raw_user) for raw_user in raw_users]
+        )
 
-        return clean_users
+        async for raw_users in use_case.execute():
+            yield [OutgoingUserDTO.from_dict(raw_user) for raw_user in raw_users]
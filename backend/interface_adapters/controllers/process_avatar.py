@@ -0,0 +1,68 @@
+from application.ports import (
+    DatabaseUnitOfWorkPort,
+    FileStoragePort,
+    ImageProcessorPort,
+    OrphanedFileRepositoryPort,
+    OutboxRepositoryPort,
+    UserRepositoryPort,
+)
+from application.use_cases import ProcessAvatarUseCase
+
+
+class ProcessAvatarController:
+    """
+    This controller is responsible for processing an avatar that was uploaded earlier.
+    """
+
+    def __init__(
+            self,
+            avatar_job: dict,
+            file_storage: FileStoragePort,
+            image_processor: ImageProcessorPort,
+            database_repo: UserRepositoryPort,
+            database_uow: DatabaseUnitOfWorkPort,
+            outbox_repo: OutboxRepositoryPort,
+            orphaned_file_repo: OrphanedFileRepositoryPort,
+        ) -> None:
+        """
+        Initialize the controller.
+
+        Args:
+            avatar_job (dict): The job the avatar was queued with.
+            file_storage (FileStoragePort): Port for file storage operations.
+            image_processor (ImageProcessorPort): Port that creates the thumbnails of the avatar.
+            database_repo (UserRepositoryPort): User repository port.
+            database_uow (DatabaseUnitOfWorkPort): Unit of work for DB changes.
+            outbox_repo (OutboxRepositoryPort): The outbox the update of chats is put into.
+            orphaned_file_repo (OrphanedFileRepositoryPort): The registry of the files that may be no longer used.
+        """
+        self.avatar_job = avatar_job
+        self.file_storage = file_storage
+        self.image_processor = image_processor
+        self.database_repo = database_repo
+        self.database_uow = database_uow
+        self.outbox_repo = outbox_repo
+        self.orphaned_file_repo = orphaned_file_repo
+
+    async def process_avatar(self) -> dict:
+        """
+        Process the avatar.
+
+        Returns:
+            dict: The URLs of the avatar and its renditions.
+        """
+        use_case = ProcessAvatarUseCase(
+            avatar_path=self.avatar_job.get('avatar_path'),
+            user_id=self.avatar_job.get('user_id'),
+            previous_avatar=None,
+            file_storage=self.file_storage,
+            image_processor=self.image_processor,
+            database_repo=self.database_repo,
+            database_uow=self.database_uow,
+            outbox_repo=self.outbox_repo,
+            orphaned_file_repo=self.orphaned_file_repo,
+            queued_at=self.avatar_job.get('created_at'),
+            access_token=self.avatar_job.get('access_token'),
+        )
+
+        return await use_case.execute()
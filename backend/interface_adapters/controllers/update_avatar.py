@@ -7,8 +7,17 @@
 
 
 from pathlib import Path
-
-from application.ports import DatabaseUnitOfWorkPort, FileStoragePort, UserRepositoryPort, UpdateChatRelatedUserPort
+from typing import AsyncIterator
+
+from application.ports import (
+    AvatarJobRepositoryPort,
+    DatabaseUnitOfWorkPort,
+    FileStoragePort,
+    ImageProcessorPort,
+    OrphanedFileRepositoryPort,
+    OutboxRepositoryPort,
+    UserRepositoryPort,
+)
 from application.use_cases import UpdateAvatarUseCase
 
 
@@ -19,36 +28,48 @@ class UpdateAvatarController:
 
     def __init__(
             self,
-            file: bytes,
+            file: AsyncIterator[bytes],
             file_name: str,
             user_id: int,
-            access_token: str,
+            previous_avatar: dict,
             file_storage: FileStoragePort,
+            image_processor: ImageProcessorPort,
             database_repo: UserRepositoryPort,
             database_uow: DatabaseUnitOfWorkPort,
-            http_service: UpdateChatRelatedUserPort,
+            outbox_repo: OutboxRepositoryPort,
+            orphaned_file_repo: OrphanedFileRepositoryPort,
+            avatar_job_repo: AvatarJobRepositoryPort | None = None,
+            access_token: str | None = None,
         ) -> None:
         """
         Initialize the controller.
 
         Args:
-            file (bytes): Raw file content.
+            file (AsyncIterator[bytes]): The chunks of the file content.
             file_name (str): Name of the uploaded file.
             user_id (int): ID of the user uploading the file.
-            access_token (str): The token required to perform a user identification.
+            previous_avatar (dict): The avatar URL and the rendition URLs the user had before.
             file_storage (FileStoragePort): Port for file storage operations.
+            image_processor (ImageProcessorPort): Port that creates the thumbnails of the avatar.
             database_repo (UserRepositoryPort): User repository port.
             database_uow (DatabaseUnitOfWorkPort): Unit of work for DB changes.
-            http_service (UpdateChatRelatedUserPort): The port for the http service that updates chats.
+            outbox_repo (OutboxRepositoryPort): The outbox the update of chats is put into.
+            orphaned_file_repo (OrphanedFileRepositoryPort): The registry of the files that may be no longer used.
+            avatar_job_repo (AvatarJobRepositoryPort | None): The queue to process the avatar in the background with, if any.
+            access_token (str | None): The token the update of chats is delivered with, if the service token is not used.
         """
         self.file = file
         self.file_name = file_name
         self.user_id = user_id
-        self.access_token = access_token
+        self.previous_avatar = previous_avatar
         self.file_storage = file_storage
+        self.image_processor = image_processor
         self.database_repo = database_repo
         self.database_uow = database_uow
-        self.http_service = http_service
+        self.outbox_repo = outbox_repo
+        self.orphaned_file_repo = orphaned_file_repo
+        self.avatar_job_repo = avatar_job_repo
+        self.access_token = access_token
 
     def get_extension(self) -> str:
         """
@@ -60,22 +81,26 @@ class UpdateAvatarController:
         full_name = Path(self.file_name or '').name
         return ''.join(Path(full_name).suffixes).lower()
 
-    async def update_avatar(self) -> str:
+    async def update_avatar(self) -> dict:
         """
         Update the user avatar.
 
         Returns:
-            str: The path of the new user avatar.
+            dict: The URLs of the new user avatar or the job it is processed by.
         """
         use_case = UpdateAvatarUseCase(
             avatar=self.file,
             extension=self.get_extension(),
             user_id=self.user_id,
-            access_token=self.access_token,
+            previous_avatar=self.previous_avatar,
             file_storage=self.file_storage,
+            image_processor=self.image_processor,
             database_repo=self.database_repo,
             database_uow=self.database_uow,
-            http_service=self.http_service,
+            outbox_repo=self.outbox_repo,
+            orphaned_file_repo=self.orphaned_file_repo,
+            avatar_job_repo=self.avatar_job_repo,
+            access_token=self.access_token,
         )
 
         return await use_case.execute()
@@ -1,4 +1,4 @@
-from application.ports import DatabaseUnitOfWorkPort, UpdateChatRelatedUserPort, UserRepositoryPort
+from application.ports import DatabaseUnitOfWorkPort, OutboxRepositoryPort, UserRepositoryPort
 from application.use_cases import UpdateUserUseCase
 from interface_adapters.outgoing_dtos import OutgoingUserDTO
 
@@ -12,10 +12,10 @@ class UpdateUserController:
         self,
         user_id: int,
         user_data: dict,
-        access_token: str,
+        access_token: str | None,
         database_repo: UserRepositoryPort,
         database_uow: DatabaseUnitOfWorkPort,
-        http_service: UpdateChatRelatedUserPort,
+        outbox_repo: OutboxRepositoryPort,
     ) -> None:
         """
         Initialize the controller.
@@ -23,17 +23,17 @@ class UpdateUserController:
         Args:
             user_id (int): The id of a user that will be updated.
             user_data (dict): Incoming data containing fields to update.
-            access_token (str): The token required to perform a user identification.
+            access_token (str | None): The token the update of chats is delivered with, if the service token is not used.
             database_repo (UserRepositoryPort): Repository responsible for persisting user changes.
             database_uow (DatabaseUnitOfWorkPort): Unit of Work ensuring atomic update operations.
-            http_service (UpdateChatRelatedUserPort): The port for the http service that updates chats.
+            outbox_repo (OutboxRepositoryPort): The outbox the update of chats is put into.
         """
         self.user_id = user_id
         self.user_data = user_data
         self.access_token = access_token
         self.database_repo = database_repo
         self.database_uow = database_uow
-        self.http_service = http_service
+        self.outbox_repo = outbox_repo
 
     def prepare_data(self) -> None:
         """
@@ -54,7 +54,7 @@ class UpdateUserController:
             user_data=self.user_data,
             database_repo=self.database_repo,
             database_uow=self.database_uow,
-            http_service=self.http_service,
+            outbox_repo=self.outbox_repo,
         )
 
         return OutgoingUserDTO.from_dict(await use_case.execute())
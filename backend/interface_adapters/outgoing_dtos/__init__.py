@@ -1,2 +1,4 @@
+from interface_adapters.outgoing_dtos.outgoing_avatar_job import OutgoingAvatarJobDTO
 from interface_adapters.outgoing_dtos.outgoing_session import OutgoingSessionDTO
 from interface_adapters.outgoing_dtos.outgoing_user import OutgoingUserDTO
+from interface_adapters.outgoing_dtos.outgoing_user_changes import OutgoingUserChangesDTO
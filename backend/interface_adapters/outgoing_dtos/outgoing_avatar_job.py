@@ -0,0 +1,18 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from interface_adapters.shared_utils import add_from_dict
+
+
+@dataclass
+@add_from_dict
+class OutgoingAvatarJobDTO:
+    """
+    This DTO is used to adapt an avatar processing job to the outgoing format.
+    """
+    id: str
+    status: str
+    result: dict | None
+    error: dict | None
+    created_at: datetime
+    updated_at: datetime
@@ -9,3 +9,4 @@ class OutgoingUserDTO:
     id: int
     username: str
     avatar_url: str
+    avatar_renditions: dict
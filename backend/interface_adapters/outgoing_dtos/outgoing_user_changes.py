@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+from interface_adapters.outgoing_dtos.outgoing_user import OutgoingUserDTO
+from interface_adapters.shared_utils import add_from_dict
+
+
+@dataclass
+@add_from_dict
+class OutgoingUserChangesDTO:
+    """
+    This DTO is used to adapt a page of the user changes to the outgoing format.
+    """
+    users: list[OutgoingUserDTO]
+    cursor: int
+    has_more: bool
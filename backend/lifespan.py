@@ -2,14 +2,80 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from infrastructure.dependency_injection_containers import DatabaseContainer
+from settings import settings
+
+from infrastructure.avatar_jobs import AvatarJobWorker
+from infrastructure.dependency_injection_containers import (
+    DatabaseContainer,
+    HttpContainer,
+    ImagesContainer,
+    StorageContainer,
+)
+from infrastructure.file_storage import OrphanedFileCollector
+from infrastructure.monitoring import EventLoopMonitor, start_metrics_server
+from infrastructure.outbox import OutboxDispatcher
 
 
 @asynccontextmanager
 async def lifespan(application: FastAPI):
+    event_loop_monitor = EventLoopMonitor()
+    event_loop_monitor.start()
+
+    metrics_server = start_metrics_server()
+
     database_container = DatabaseContainer()
     database_container.wire(
-        modules=['infrastructure.handlers.user', 'infrastructure.handlers.session']
+        modules=[
+            'infrastructure.dependencies.database',
+            'infrastructure.handlers.user',
+            'infrastructure.handlers.session',
+        ]
     )
 
+    images_container = ImagesContainer()
+    images_container.wire(modules=['infrastructure.handlers.user'])
+    images_container.init_resources()
+
+    storage_container = StorageContainer()
+    storage_container.wire(modules=['infrastructure.handlers.user', 'infrastructure.handlers.media'])
+    await storage_container.init_resources()
+
+    http_container = HttpContainer()
+    await http_container.init_resources()
+
+    outbox_dispatcher = OutboxDispatcher(
+        unit_of_work_factory=database_container.unit_of_work,
+        http_service=await http_container.update_chat_related_user(),
+    )
+    outbox_dispatcher.start()
+
+    orphaned_file_collector = OrphanedFileCollector(
+        unit_of_work_factory=database_container.unit_of_work,
+        file_storage=await storage_container.file_storage(),
+    )
+    orphaned_file_collector.start()
+
+    if settings.avatar_processing_mode == 'async':
+        avatar_job_worker = AvatarJobWorker(
+            unit_of_work_factory=database_container.unit_of_work,
+            file_storage=await storage_container.file_storage(),
+            image_processor=images_container.image_processor(),
+        )
+        avatar_job_worker.start()
+    else:
+        avatar_job_worker = None
+
     yield
+
+    if avatar_job_worker is not None:
+        await avatar_job_worker.stop()
+    await orphaned_file_collector.stop()
+    await outbox_dispatcher.stop()
+    await http_container.shutdown_resources()
+    await storage_container.shutdown_resources()
+    images_container.shutdown_resources()
+    await event_loop_monitor.stop()
+
+    if metrics_server is not None:
+        metrics_server.shutdown()
+        metrics_server.server_close()
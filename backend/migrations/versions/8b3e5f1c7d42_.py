@@ -0,0 +1,28 @@
+"""empty message
+
+Revision ID: 8b3e5f1c7d42
+Revises: 6f2d9b4e8a17
+Create Date: 2026-10-19 23:05:52.604318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3e5f1c7d42'
+down_revision: Union[str, Sequence[str], None] = '6f2d9b4e8a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('users', 'updated_at', server_default=sa.text('clock_timestamp()'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('users', 'updated_at', server_default=sa.text('now()'))
@@ -1,3 +1,4 @@
+from typing import Literal
 from zoneinfo import ZoneInfo
 
 from pydantic import Field
@@ -10,11 +11,48 @@ class Settings(BaseSettings):
     min_username_length: int = 4
     min_password_length: int = 8
     messaging_backend_url: str = 'http://messaging_backend:8002'
+    #MESSAGING BACKEND
+    messaging_backend_connection_limit: int = 100
+    messaging_backend_connection_limit_per_host: int = 30
+    messaging_backend_keepalive_timeout: float = 30.0
+    messaging_backend_connect_timeout: float = 2.0
+    messaging_backend_read_timeout: float = 5.0
+    messaging_backend_dns_cache_ttl: int = 300
+    messaging_backend_failure_threshold: int = 5
+    messaging_backend_recovery_timeout: float = 30.0
+    messaging_backend_half_open_max_calls: int = 1
+    messaging_backend_bulk_delivery: bool = False
+    messaging_backend_service_auth: bool = False
+    messaging_backend_service_token: str | None = Field(default=None, validation_alias='MESSAGING_BACKEND_SERVICE_TOKEN')
+    #OUTBOX
+    chat_related_user_topic: str = 'chat_related_user.updated'
+    outbox_batch_size: int = 100
+    outbox_poll_interval: float = 0.5
+    outbox_max_attempts: int = 20
+    outbox_retry_base_delay: float = 1.0
+    outbox_retry_max_delay: float = 300.0
+    outbox_lease_duration: float = 60.0
+    outbox_retention_period: float = 604800.0
+    outbox_purge_interval: float = 300.0
+    outbox_purge_batch_size: int = 1000
     #SECURITY
     key: str = Field(validation_alias='KEY')
     algorithm: str = Field(validation_alias='ALGORITHM')
     #DB
     database_url: str = Field(validation_alias='DATABASE_URL')
+    replica_database_url: str | None = Field(default=None, validation_alias='REPLICA_DATABASE_URL')
+    replica_max_lag: float = 5.0
+    replica_lag_check_interval: float = 1.0
+    replica_lag_check_timeout: float = 1.0
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: float = 30.0
+    database_pool_recycle: int = -1
+    database_pool_pre_ping: bool = True
+    database_prepare_threshold: int | None = 5
+    user_loader_enabled: bool = True
+    user_loader_window: float = 0.002
+    user_loader_max_batch_size: int = 100
     echo: bool = True
     #REDIS
     redis_url: str = Field(validation_alias='REDIS_URL')
@@ -27,11 +65,85 @@ class Settings(BaseSettings):
     display_media_root: str = 'media'
     allowed_extensions: set = {'.jpg', '.jpeg', '.png'}
     max_size: int = 2097152
+    upload_chunk_size: int = 65536
+    max_multipart_overhead: int = 16384
+    avatar_sizes: list[int] = [40, 128, 256]
+    avatar_quality: dict[str, int] = {'webp': 80, 'jpeg': 85}
+    max_image_pixels: int = 25000000
+    image_processing_workers: int = 2
+    media_shard_depth: int = 2
+    media_max_age: int = 3600
+    media_immutable_max_age: int = 31536000
+    #OBJECT STORAGE
+    file_storage_backend: Literal['local', 's3'] = 'local'
+    s3_endpoint_url: str | None = Field(default=None, validation_alias='S3_ENDPOINT_URL')
+    s3_access_key_id: str | None = Field(default=None, validation_alias='S3_ACCESS_KEY_ID')
+    s3_secret_access_key: str | None = Field(default=None, validation_alias='S3_SECRET_ACCESS_KEY')
+    s3_region: str = 'us-east-1'
+    s3_bucket: str = 'avatars'
+    s3_addressing_style: str = 'auto'
+    s3_public_url: str | None = None
+    s3_presigned_url_expiration: int = 3600
+    s3_max_pool_connections: int = 50
+    s3_connect_timeout: float = 2.0
+    s3_read_timeout: float = 30.0
+    s3_multipart_part_size: int = 8388608
+    s3_multipart_concurrency: int = 4
+    orphaned_files_grace_period: float = 3600.0
+    orphaned_files_batch_size: int = 100
+    orphaned_files_poll_interval: float = 60.0
+    #AVATAR JOBS
+    avatar_processing_mode: str = 'sync'
+    avatar_jobs_batch_size: int = 10
+    avatar_jobs_poll_interval: float = 0.5
+    avatar_jobs_timeout: float = 300.0
+    avatar_jobs_max_attempts: int = 3
+    #USERS INFO
+    max_user_ids: int = 10000
+    user_ids_chunk_size: int = 500
+    #USER CHANGES
+    user_changes_page_size: int = 100
+    max_user_changes_page_size: int = 1000
+    user_changes_settle_delay: float = 1.0
+    user_changes_lock_retry_interval: float = 0.01
+    user_changes_lock_timeout: float = 1.0
     #METRICS
     opentelemetry_collector_url: str = Field(validation_alias='OPENTELEMETRY_COLLECTOR_URL')
+    operation_instrumentation_enabled: bool = True
+    tracing_otlp_enabled: bool = True
+    metrics_otlp_enabled: bool = True
+    metrics_export_interval: int = 10000
+    metrics_export_timeout: int = 5000
+    metrics_prometheus_enabled: bool = False
+    metrics_prometheus_host: str = '0.0.0.0'
+    metrics_prometheus_port: int = 9464
+    metrics_duration_buckets: list[float] = [
+        0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+    ]
+    #EVENT LOOP
+    event_loop_monitor_interval: float = 0.1
+    event_loop_monitor_debug: bool = False
+    event_loop_blocking_threshold: float = 0.1
+    event_loop_stack_depth: int = 30
+    #PROFILING
+    profiling_enabled: bool = False
+    admin_user_ids: set[int] = set()
+    profiling_max_duration: float = 60.0
+    profiling_sampling_interval: float = 0.005
+    profiling_traceback_limit: int = 25
     #LOGGING
+    logging_queue_size: int = 10000
+    logging_rate_limit: float = 20.0
+    logging_burst: int = 100
+    logging_sample_rate: float = 0.01
     sessions_logger_name: str = 'application.sessions'
     users_logger_name: str = 'application.users'
+    database_logger_name: str = 'infrastructure.database'
+    outbox_logger_name: str = 'infrastructure.outbox'
+    file_storage_logger_name: str = 'infrastructure.file_storage'
+    avatar_jobs_logger_name: str = 'infrastructure.avatar_jobs'
+    images_logger_name: str = 'infrastructure.images'
+    event_loop_logger_name: str = 'infrastructure.event_loop'
 
     model_config = {
         'env_file': '.env',
@@ -0,0 +1,178 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from settings import settings
+
+from application.exceptions import AvatarSupersededException
+from application.use_cases import ProcessAvatarUseCase
+from infrastructure.avatar_jobs import worker as worker_module
+from infrastructure.avatar_jobs import AvatarJobWorker
+
+
+QUEUED_AT = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+class FakeUnitOfWork:
+
+    def __init__(self) -> None:
+        self.session = None
+        self.commits = 0
+
+    async def __aenter__(self) -> 'FakeUnitOfWork':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+
+class FakeFileStorage:
+
+    async def stage(self, path: str) -> None:
+        pass
+
+    async def publish(self, paths: list[str]) -> None:
+        pass
+
+
+class FakeImageProcessor:
+
+    async def create_renditions(self, path: str) -> dict:
+        return {'webp': {40: path.replace('.png', '_40.webp')}}
+
+
+class FakeUserRepository:
+
+    def __init__(self, avatar: dict) -> None:
+        self.avatar = avatar
+        self.updates = []
+
+    async def lock_avatar(self, user_id: int) -> dict:
+        return dict(self.avatar)
+
+    async def update_avatar(self, user_id: int, avatar_url: str, avatar_renditions: dict, queued_at: datetime) -> dict:
+        self.updates.append({'avatar_url': avatar_url, 'avatar_queued_at': queued_at})
+        return {
+            'id': user_id,
+            'username': 'username',
+            'email': 'user@test',
+            'avatar_url': avatar_url,
+            'avatar_renditions': avatar_renditions,
+        }
+
+
+class FakeOrphanedFileRepository:
+
+    files: list[dict] = []
+
+    def __init__(self, session: None = None) -> None:
+        self.session = session
+
+    async def add_file(self, data: dict) -> None:
+        self.files.append(data)
+
+
+class FakeOutboxRepository:
+
+    async def add_message(self, data: dict) -> None:
+        pass
+
+
+def create_use_case(user_repository: FakeUserRepository, queued_at: datetime) -> ProcessAvatarUseCase:
+    return ProcessAvatarUseCase(
+        avatar_path='media/ab/cd/abcd.png',
+        user_id=1,
+        previous_avatar=None,
+        file_storage=FakeFileStorage(),
+        image_processor=FakeImageProcessor(),
+        database_repo=user_repository,
+        database_uow=FakeUnitOfWork(),
+        outbox_repo=FakeOutboxRepository(),
+        orphaned_file_repo=FakeOrphanedFileRepository(),
+        queued_at=queued_at,
+    )
+
+
+@pytest.fixture(autouse=True)
+def orphaned_files() -> list[dict]:
+    FakeOrphanedFileRepository.files = []
+    return FakeOrphanedFileRepository.files
+
+
+@pytest.mark.anyio
+async def test_older_avatar_does_not_replace_newer_one(orphaned_files: list[dict]) -> None:
+    user_repository = FakeUserRepository(
+        avatar={
+            'avatar_url': f'{settings.current_domain}/media/ef/01/ef01.png',
+            'avatar_renditions': {},
+            'avatar_queued_at': QUEUED_AT + timedelta(seconds=1),
+        },
+    )
+
+    with pytest.raises(AvatarSupersededException):
+        await create_use_case(user_repository=user_repository, queued_at=QUEUED_AT).execute()
+
+    assert user_repository.updates == []
+    assert [file.get('url') for file in orphaned_files] == [f'{settings.current_domain}/media/ab/cd/abcd.png']
+
+
+@pytest.mark.anyio
+async def test_newer_avatar_replaces_older_one(orphaned_files: list[dict]) -> None:
+    user_repository = FakeUserRepository(
+        avatar={
+            'avatar_url': f'{settings.current_domain}/media/ef/01/ef01.png',
+            'avatar_renditions': {},
+            'avatar_queued_at': QUEUED_AT - timedelta(seconds=1),
+        },
+    )
+
+    await create_use_case(user_repository=user_repository, queued_at=QUEUED_AT).execute()
+
+    assert user_repository.updates == [
+        {'avatar_url': f'{settings.current_domain}/media/ab/cd/abcd.png', 'avatar_queued_at': QUEUED_AT},
+    ]
+    assert [file.get('url') for file in orphaned_files] == [f'{settings.current_domain}/media/ef/01/ef01.png']
+
+
+class FakeAvatarJobRepository:
+
+    jobs: list[dict] = []
+
+    def __init__(self, session: None) -> None:
+        self.session = session
+
+    async def claim_jobs(self, limit: int, stalled_before: datetime) -> list:
+        return [dict(job) for job in self.jobs]
+
+    async def update_jobs(self, ids: set, data: dict) -> None:
+        for job in self.jobs:
+            if job.get('id') in ids:
+                job.update(data)
+
+
+@pytest.mark.anyio
+async def test_upload_of_exhausted_job_is_registered_as_orphaned(
+    monkeypatch: pytest.MonkeyPatch,
+    orphaned_files: list[dict],
+) -> None:
+    monkeypatch.setattr(worker_module, 'AvatarJobRepository', FakeAvatarJobRepository)
+    monkeypatch.setattr(worker_module, 'OrphanedFileRepository', FakeOrphanedFileRepository)
+    FakeAvatarJobRepository.jobs = [
+        {
+            'id': 'exhausted',
+            'avatar_path': 'media/ab/cd/abcd.png',
+            'attempts': settings.avatar_jobs_max_attempts,
+            'created_at': QUEUED_AT,
+        },
+    ]
+
+    worker = AvatarJobWorker(unit_of_work_factory=FakeUnitOfWork, file_storage=None, image_processor=None)
+
+    assert await worker.claim() == []
+    assert FakeAvatarJobRepository.jobs[0].get('status') == 'failed'
+    assert orphaned_files == [
+        {'url': f'{settings.current_domain}/media/ab/cd/abcd.png', 'paths': ['media/ab/cd/abcd.png']},
+    ]
@@ -0,0 +1,56 @@
+from asyncio import CancelledError
+
+import pytest
+from aiohttp import ClientPayloadError
+
+from application.exceptions import ChatsServerUnavailable
+from infrastructure.http.circuit_breaker import CircuitBreaker
+from infrastructure.http.update_chat_related_user import UpdateChatRelatedUser
+
+
+class FailingClientSession:
+
+    def __init__(self, exception: BaseException) -> None:
+        self.exception = exception
+
+    def post(self, **kwargs) -> 'FailingClientSession':
+        return self
+
+    async def __aenter__(self) -> None:
+        raise self.exception
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+
+def create_half_open_breaker() -> CircuitBreaker:
+    circuit_breaker = CircuitBreaker(name='test', failure_threshold=1, recovery_timeout=0.0, half_open_max_calls=1)
+    circuit_breaker.record_failure()
+    return circuit_breaker
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize('exception', [ClientPayloadError('Response payload is not completed.'), CancelledError()])
+async def test_unexpected_error_of_trial_call_is_recorded(exception: BaseException) -> None:
+    circuit_breaker = create_half_open_breaker()
+    service = UpdateChatRelatedUser(client_session=FailingClientSession(exception), circuit_breaker=circuit_breaker)
+
+    with pytest.raises(type(exception)):
+        await service.execute(user_data={'id': 1}, access_token='user-token')
+
+    assert circuit_breaker.state == 'open'
+    assert circuit_breaker.failures == 2
+
+    circuit_breaker.before_call()
+
+    assert circuit_breaker.state == 'half_open'
+    assert circuit_breaker.trial_calls == 1
+
+
+@pytest.mark.anyio
+async def test_trial_calls_are_rejected_while_trial_call_is_running() -> None:
+    circuit_breaker = create_half_open_breaker()
+    circuit_breaker.before_call()
+
+    with pytest.raises(ChatsServerUnavailable):
+        circuit_breaker.before_call()
@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from os import _exit
+from pathlib import Path
+from struct import pack
+from zlib import compress, crc32
+
+import pytest
+from PIL import Image
+
+from settings import settings
+
+from application.exceptions import FileExtensionException
+from infrastructure.images import ImageProcessor, ProcessPool
+from infrastructure.images.renditions import render_renditions
+
+
+def create_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    return pack('>I', len(data)) + chunk_type + data + pack('>I', crc32(chunk_type + data))
+
+def create_png_header(width: int, height: int) -> bytes:
+    """
+    Create a small PNG whose header claims the provided dimensions.
+    """
+    return (
+        b'\x89PNG\r\n\x1a\n'
+        + create_chunk(b'IHDR', pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+        + create_chunk(b'IDAT', compress(b''))
+        + create_chunk(b'IEND', b'')
+    )
+
+
+@pytest.mark.anyio
+async def test_decompression_bomb_is_rejected(tmp_path: Path) -> None:
+    path = tmp_path / 'bomb.png'
+    path.write_bytes(create_png_header(width=15000, height=15000))
+
+    process_pool = ProcessPool(max_workers=1)
+
+    try:
+        with pytest.raises(FileExtensionException):
+            await ImageProcessor(process_pool=process_pool).create_renditions(path=str(path))
+    finally:
+        process_pool.shutdown()
+
+
+@pytest.mark.anyio
+async def test_broken_process_pool_is_recreated(tmp_path: Path) -> None:
+    path = tmp_path / 'avatar.png'
+    Image.new('RGB', (40, 40), (200, 30, 30)).save(path, format='PNG')
+    process_pool = ProcessPool(max_workers=1)
+    image_processor = ImageProcessor(process_pool=process_pool)
+
+    try:
+        broken_executor = process_pool.executor
+
+        with pytest.raises(BrokenProcessPool):
+            broken_executor.submit(_exit, 1).result()
+
+        assert (await image_processor.create_renditions(path=str(path))).keys() == settings.avatar_quality.keys()
+
+        executor = process_pool.executor
+        process_pool.replace_broken(executor=broken_executor)
+
+        assert executor is not broken_executor
+        assert process_pool.executor is executor
+    finally:
+        process_pool.shutdown()
+
+
+def test_metadata_is_stripped_from_source_and_orientation_is_applied(tmp_path: Path) -> None:
+    path = tmp_path / 'avatar.jpg'
+    exif = Image.Exif()
+    exif[0x0112] = 6
+    exif[0x010F] = 'Camera'
+    exif.get_ifd(0x8825)[2] = (50.0, 27.0, 0.0)
+    Image.new('RGB', (40, 20), (200, 30, 30)).save(path, format='JPEG', exif=exif.tobytes())
+
+    render_renditions(
+        source_path=str(path),
+        sizes=[16],
+        quality=settings.avatar_quality,
+        max_pixels=settings.max_image_pixels,
+    )
+
+    with Image.open(path) as image:
+        assert 'exif' not in image.info
+        assert len(image.getexif()) == 0
+        assert image.size == (20, 40)
+
+    modified_at = path.stat().st_mtime_ns
+
+    render_renditions(
+        source_path=str(path),
+        sizes=[16],
+        quality=settings.avatar_quality,
+        max_pixels=settings.max_image_pixels,
+    )
+
+    assert path.stat().st_mtime_ns == modified_at
+
+
+def test_identical_uploads_are_processed_at_once(tmp_path: Path) -> None:
+    path = tmp_path / 'avatar.jpg'
+    exif = Image.Exif()
+    exif[0x010F] = 'Camera'
+    Image.new('RGB', (400, 400), (200, 30, 30)).save(path, format='JPEG', exif=exif.tobytes())
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [
+            executor.submit(
+                render_renditions,
+                source_path=str(path),
+                sizes=[160, 40],
+                quality=settings.avatar_quality,
+                max_pixels=settings.max_image_pixels,
+            )
+            for _ in range(8)
+        ]
+        renditions = [future.result() for future in futures]
+
+    assert all(rendition == renditions[0] for rendition in renditions)
+    assert not [file for file in tmp_path.iterdir() if file.suffix == '.part']
@@ -0,0 +1,22 @@
+from pathlib import Path
+
+import pytest
+
+from settings import settings
+
+from infrastructure.handlers.media import resolve_path
+
+
+@pytest.fixture
+def media_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(settings, 'display_media_root', str(tmp_path))
+    return tmp_path.resolve()
+
+
+def test_path_inside_media_directory_is_resolved(media_root: Path) -> None:
+    assert resolve_path(path='avatars/avatar.png') == media_root / 'avatars' / 'avatar.png'
+
+
+@pytest.mark.parametrize('path', ['../secret.txt', 'avatars/../../secret.txt', 'avatars/avatar.png.0f3a.part'])
+def test_path_outside_media_directory_or_partial_file_is_rejected(media_root: Path, path: str) -> None:
+    assert resolve_path(path=path) is None
@@ -0,0 +1,215 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from settings import settings
+
+from application.exceptions import CircuitOpenException
+from infrastructure.http.circuit_breaker import CircuitBreaker
+from infrastructure.http.update_chat_related_user import UpdateChatRelatedUser
+from infrastructure.outbox import dispatcher as dispatcher_module
+from infrastructure.outbox.dispatcher import OutboxDispatcher
+
+
+class FakeUnitOfWork:
+
+    def __init__(self) -> None:
+        self.session = None
+
+    async def __aenter__(self) -> 'FakeUnitOfWork':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+    async def commit(self) -> None:
+        pass
+
+
+class FakeOutboxRepository:
+    """
+    The in-memory outbox that follows the semantics of the SQL statements of OutboxRepository.
+    """
+
+    messages: list[dict] = []
+
+    def __init__(self, session: None) -> None:
+        self.session = session
+
+    async def claim_pending_messages(self, limit: int) -> list:
+        now = datetime.now(timezone.utc)
+        in_flight_keys = {
+            message.get('key') for message in self.messages
+            if message.get('status') == 'processing' and message.get('available_at') > now
+        }
+        due_messages = [
+            message for message in self.messages
+            if message.get('status') in ('pending', 'processing')
+            and message.get('available_at') <= now
+            and message.get('key') not in in_flight_keys
+        ]
+        due_messages.sort(key=lambda message: (message.get('available_at'), message.get('id')))
+
+        return [dict(message) for message in due_messages[:limit]]
+
+    async def supersede_messages(self, keys: set, ids: set) -> set:
+        superseded_ids = set()
+
+        for message in self.messages:
+            if message.get('key') not in keys:
+                continue
+            if message.get('status') != 'pending' and message.get('id') not in ids:
+                continue
+            if any(
+                other.get('key') == message.get('key') and other.get('id') > message.get('id')
+                for other in self.messages
+            ):
+                message['status'] = 'superseded'
+                superseded_ids.add(message.get('id'))
+
+        return superseded_ids
+
+    async def update_messages(self, ids: set, data: dict) -> None:
+        for message in self.messages:
+            if message.get('id') in ids:
+                message.update(data)
+
+    async def purge_messages(self, finished_before: datetime, limit: int) -> int:
+        finished_messages = [
+            message for message in self.messages
+            if message.get('status') in ('dispatched', 'superseded', 'failed')
+            and message.get('updated_at') < finished_before
+        ][:limit]
+
+        for message in finished_messages:
+            self.messages.remove(message)
+
+        return len(finished_messages)
+
+    async def get_pending_statistics(self) -> tuple:
+        return 0, None
+
+
+class FakeHttpService:
+
+    def __init__(self) -> None:
+        self.delivered = []
+
+    def is_available(self) -> bool:
+        return True
+
+    async def execute(self, user_data: dict, access_token: str | None) -> bool:
+        self.delivered.append(user_data)
+        return True
+
+    async def execute_bulk(self, users_data: list[dict]) -> bool:
+        self.delivered.extend(users_data)
+        return True
+
+
+class RejectingHttpService(FakeHttpService):
+    """
+    The service whose circuit breaker let the dispatch start but rejects the calls,
+    e.g. since another call took the only trial call of the half open circuit.
+    """
+
+    async def execute(self, user_data: dict, access_token: str | None) -> bool:
+        raise CircuitOpenException(title='External server is unavailable.', details={})
+
+
+def create_message(id: int, username: str, status: str = 'pending', available_in: float = -1.0) -> dict:
+    now = datetime.now(timezone.utc)
+
+    return {
+        'id': id,
+        'topic': 'chat_related_user.updated',
+        'key': 'user:1',
+        'payload': {'id': 1, 'username': username},
+        'status': status,
+        'attempts': 0,
+        'created_at': now - timedelta(seconds=10),
+        'available_at': now + timedelta(seconds=available_in),
+        'dispatched_at': None,
+    }
+
+
+@pytest.fixture
+def http_service(monkeypatch: pytest.MonkeyPatch) -> FakeHttpService:
+    monkeypatch.setattr(dispatcher_module, 'OutboxRepository', FakeOutboxRepository)
+    return FakeHttpService()
+
+
+@pytest.mark.anyio
+async def test_retried_older_message_is_superseded_by_newer_one(http_service: FakeHttpService) -> None:
+    """
+    The older message was retried, so it sorts after the newer message of the same user.
+    """
+    older_message = create_message(id=1, username='old', available_in=-1.0)
+    newer_message = create_message(id=2, username='new', available_in=-5.0)
+    FakeOutboxRepository.messages = [older_message, newer_message]
+
+    await OutboxDispatcher(unit_of_work_factory=FakeUnitOfWork, http_service=http_service).dispatch()
+
+    assert http_service.delivered == [{'id': 1, 'username': 'new'}]
+    assert older_message.get('status') == 'superseded'
+    assert newer_message.get('status') == 'dispatched'
+
+
+@pytest.mark.anyio
+async def test_retried_older_message_is_not_sent_before_newer_one_is_due(http_service: FakeHttpService) -> None:
+    """
+    The older message is due on its own while the newer one waits for its retry.
+    """
+    older_message = create_message(id=1, username='old', available_in=-1.0)
+    newer_message = create_message(id=2, username='new', available_in=60.0)
+    FakeOutboxRepository.messages = [older_message, newer_message]
+
+    await OutboxDispatcher(unit_of_work_factory=FakeUnitOfWork, http_service=http_service).dispatch()
+
+    assert http_service.delivered == []
+    assert older_message.get('status') == 'superseded'
+    assert newer_message.get('status') == 'pending'
+
+
+@pytest.mark.anyio
+async def test_nothing_is_claimed_while_circuit_is_open(http_service: FakeHttpService) -> None:
+    message = create_message(id=1, username='new')
+    FakeOutboxRepository.messages = [message]
+    circuit_breaker = CircuitBreaker(name='test', failure_threshold=1, recovery_timeout=60.0, half_open_max_calls=1)
+    circuit_breaker.record_failure()
+    service = UpdateChatRelatedUser(client_session=None, circuit_breaker=circuit_breaker)
+
+    assert await OutboxDispatcher(unit_of_work_factory=FakeUnitOfWork, http_service=service).dispatch() == 0
+    assert message.get('status') == 'pending'
+    assert message.get('attempts') == 0
+
+
+@pytest.mark.anyio
+async def test_rejected_delivery_does_not_use_up_attempt(http_service: FakeHttpService) -> None:
+    message = create_message(id=1, username='new')
+    FakeOutboxRepository.messages = [message]
+
+    await OutboxDispatcher(unit_of_work_factory=FakeUnitOfWork, http_service=RejectingHttpService()).dispatch()
+
+    assert message.get('status') == 'pending'
+    assert message.get('attempts') == 0
+    assert message.get('available_at') > datetime.now(timezone.utc)
+
+
+@pytest.mark.anyio
+async def test_finished_messages_are_purged_after_retention_period(
+    http_service: FakeHttpService,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, 'outbox_purge_batch_size', 2)
+    now = datetime.now(timezone.utc)
+    expired_at = now - timedelta(seconds=settings.outbox_retention_period + 1)
+    FakeOutboxRepository.messages = [
+        {**create_message(id=id, username='old', status=status), 'updated_at': expired_at}
+        for id, status in enumerate(['dispatched', 'superseded', 'failed', 'pending', 'processing'], start=1)
+    ] + [{**create_message(id=6, username='new', status='dispatched'), 'updated_at': now}]
+
+    purged = await OutboxDispatcher(unit_of_work_factory=FakeUnitOfWork, http_service=http_service).purge()
+
+    assert purged == 3
+    assert [message.get('id') for message in FakeOutboxRepository.messages] == [4, 5, 6]
@@ -0,0 +1,45 @@
+from asyncio import gather, sleep
+from http import HTTPStatus
+
+import pytest
+
+from application.exceptions import PermissionDeniedException
+from infrastructure.dependencies import get_admin_user
+from infrastructure.exception_handlers import permission_denied_exception_handler
+from infrastructure.handlers import profiling as profiling_module
+from infrastructure.handlers.profiling import get_profile
+
+
+class SlowUnitOfWork:
+
+    async def rollback(self) -> None:
+        await sleep(0.01)
+
+
+async def sample_stacks(duration: float, interval: float) -> bytes:
+    await sleep(0.01)
+    return b''
+
+
+@pytest.mark.anyio
+async def test_concurrent_profile_is_rejected(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(profiling_module, 'sample_stacks', sample_stacks)
+
+    responses = await gather(
+        *(
+            get_profile(mode='sampling', duration=1.0, interval=0.005, user={'id': 1}, database_uow=SlowUnitOfWork())
+            for _ in range(2)
+        ),
+    )
+
+    assert sorted(response.status_code for response in responses) == [HTTPStatus.OK, HTTPStatus.CONFLICT]
+
+
+@pytest.mark.anyio
+async def test_user_without_administrative_privileges_is_forbidden() -> None:
+    with pytest.raises(PermissionDeniedException) as exception_info:
+        await get_admin_user(user={'id': 1})
+
+    response = await permission_denied_exception_handler(request=None, exception=exception_info.value)
+
+    assert response.status_code == HTTPStatus.FORBIDDEN
@@ -0,0 +1,62 @@
+from hashlib import sha256
+from pathlib import Path
+
+import pytest
+from botocore.exceptions import ClientError
+
+from infrastructure.file_storage import S3FileStorage
+
+
+ORIGINAL = b'\x89PNG\r\n\x1a\n original with the metadata'
+STRIPPED = b'\x89PNG\r\n\x1a\n stripped'
+
+
+class FakeS3Client:
+
+    def __init__(self, objects: dict[str, dict] | None = None) -> None:
+        self.objects = objects or {}
+        self.calls = []
+
+    async def head_object(self, Bucket: str, Key: str) -> dict:
+        if Key not in self.objects:
+            raise ClientError({'Error': {'Code': '404'}}, 'HeadObject')
+        return {'Metadata': self.objects[Key].get('Metadata')}
+
+    async def put_object(self, Bucket: str, Key: str, Body, ContentLength: int, **options) -> None:
+        self.calls.append('put_object')
+        self.objects[Key] = {'Body': Body.read(), 'Metadata': options.get('Metadata')}
+
+    async def copy_object(self, Bucket: str, Key: str, CopySource: dict, MetadataDirective: str, **options) -> None:
+        self.calls.append('copy_object')
+        self.objects[Key]['Metadata'] = options.get('Metadata')
+
+
+def stage_file(tmp_path: Path, content: bytes) -> str:
+    path = tmp_path / f'{sha256(ORIGINAL).hexdigest()}.png'
+    path.write_bytes(content)
+    return str(path)
+
+
+@pytest.mark.anyio
+async def test_stripped_file_overwrites_original_published_before(tmp_path: Path) -> None:
+    client = FakeS3Client()
+    storage = S3FileStorage(client=client)
+
+    await storage.publish(paths=[stage_file(tmp_path=tmp_path, content=ORIGINAL)])
+    await storage.publish(paths=[path := stage_file(tmp_path=tmp_path, content=STRIPPED)])
+
+    assert client.calls == ['put_object', 'put_object']
+    assert client.objects[path] == {'Body': STRIPPED, 'Metadata': {'sha256': sha256(STRIPPED).hexdigest()}}
+
+
+@pytest.mark.anyio
+async def test_original_uploaded_again_does_not_overwrite_stripped_file(tmp_path: Path) -> None:
+    client = FakeS3Client()
+    storage = S3FileStorage(client=client)
+
+    await storage.publish(paths=[stage_file(tmp_path=tmp_path, content=STRIPPED)])
+    await storage.publish(paths=[path := stage_file(tmp_path=tmp_path, content=ORIGINAL)])
+    await storage.publish(paths=[stage_file(tmp_path=tmp_path, content=STRIPPED)])
+
+    assert client.calls == ['put_object', 'copy_object', 'copy_object']
+    assert client.objects[path] == {'Body': STRIPPED, 'Metadata': {'sha256': sha256(STRIPPED).hexdigest()}}
@@ -0,0 +1,67 @@
+import pytest
+
+from settings import settings
+
+from infrastructure.http.circuit_breaker import CircuitBreaker
+from infrastructure.http.update_chat_related_user import UpdateChatRelatedUser
+
+
+class RecordingResponse:
+    status = 204
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class RecordingClientSession:
+
+    def __init__(self) -> None:
+        self.requests = []
+
+    def post(self, **kwargs) -> 'RecordingClientSession':
+        self.requests.append(kwargs)
+        return self
+
+    async def __aenter__(self) -> RecordingResponse:
+        return RecordingResponse()
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+
+def create_service(client_session: RecordingClientSession) -> UpdateChatRelatedUser:
+    circuit_breaker = CircuitBreaker(name='test', failure_threshold=1, recovery_timeout=0.0, half_open_max_calls=1)
+    return UpdateChatRelatedUser(client_session=client_session, circuit_breaker=circuit_breaker)
+
+
+@pytest.mark.anyio
+async def test_update_is_authorized_with_token_of_user_by_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, 'messaging_backend_service_token', None)
+    client_session = RecordingClientSession()
+
+    await create_service(client_session=client_session).execute(user_data={'id': 1}, access_token='user-token')
+
+    assert client_session.requests[0].get('headers') == {'Authorization': 'Bearer user-token'}
+
+
+@pytest.mark.anyio
+async def test_update_is_authorized_with_service_token_if_enabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, 'messaging_backend_service_auth', True)
+    client_session = RecordingClientSession()
+
+    await create_service(client_session=client_session).execute(user_data={'id': 1}, access_token=None)
+
+    assert client_session.requests[0].get('headers') == {
+        'Authorization': f'Bearer {settings.messaging_backend_service_token}',
+    }
+
+
+@pytest.mark.parametrize('setting', ['messaging_backend_bulk_delivery', 'messaging_backend_service_auth'])
+def test_service_token_is_required_only_if_it_is_used(monkeypatch: pytest.MonkeyPatch, setting: str) -> None:
+    monkeypatch.setattr(settings, 'messaging_backend_service_token', None)
+    create_service(client_session=RecordingClientSession())
+
+    monkeypatch.setattr(settings, setting, True)
+
+    with pytest.raises(RuntimeError):
+        create_service(client_session=RecordingClientSession())
@@ -0,0 +1,157 @@
+from typing import AsyncIterator
+
+import pytest
+from fastapi import Request
+
+from settings import settings
+
+from application.exceptions import FileExtensionException, FileSizeException
+from application.use_cases import UpdateAvatarUseCase
+from infrastructure.handlers.user import update_avatar
+from infrastructure.streaming import MultipartUpload
+
+
+BOUNDARY = 'test-boundary'
+
+
+def create_body(content: bytes, filename: str = 'avatar.png') -> bytes:
+    return (
+        f'--{BOUNDARY}\r\n'
+        f'Content-Disposition: form-data; name="description"\r\n\r\n'
+        f'My avatar\r\n'
+        f'--{BOUNDARY}\r\n'
+        f'Content-Disposition: form-data; name="avatar"; filename="{filename}"\r\n'
+        f'Content-Type: image/png\r\n\r\n'
+    ).encode() + content + f'\r\n--{BOUNDARY}--\r\n'.encode()
+
+
+def create_request(body: bytes, chunk_size: int, content_length: int | None = None) -> tuple[Request, list]:
+    """
+    Create a request that receives the body by chunks and records the received ones.
+    """
+    chunks = [body[start:start + chunk_size] for start in range(0, len(body), chunk_size)]
+    received = []
+
+    async def receive() -> dict:
+        chunk = chunks[len(received)]
+        received.append(chunk)
+        return {'type': 'http.request', 'body': chunk, 'more_body': len(received) < len(chunks)}
+
+    headers = [(b'content-type', f'multipart/form-data; boundary={BOUNDARY}'.encode())]
+
+    if content_length is not None:
+        headers.append((b'content-length', str(content_length).encode()))
+
+    return Request({'type': 'http', 'method': 'PATCH', 'headers': headers}, receive), received
+
+
+@pytest.mark.anyio
+async def test_file_is_streamed_while_body_is_received() -> None:
+    content = bytes(range(256)) * 64
+    request, _ = create_request(body=create_body(content), chunk_size=1000)
+
+    upload = MultipartUpload(request=request, field_name='avatar')
+    await upload.open()
+
+    assert upload.filename == 'avatar.png'
+    assert b''.join([chunk async for chunk in upload.read_chunks()]) == content
+
+
+@pytest.mark.anyio
+async def test_request_with_too_large_content_length_is_rejected_before_receiving() -> None:
+    body = create_body(b'x' * 1000)
+    request, received = create_request(
+        body=body,
+        chunk_size=1000,
+        content_length=settings.max_size + settings.max_multipart_overhead + 1,
+    )
+
+    with pytest.raises(FileSizeException):
+        await MultipartUpload(request=request, field_name='avatar').open()
+
+    assert received == []
+
+
+@pytest.mark.anyio
+async def test_receiving_is_aborted_once_body_exceeds_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, 'max_size', 10000)
+    monkeypatch.setattr(settings, 'max_multipart_overhead', 1000)
+    request, received = create_request(body=create_body(b'x' * 100000), chunk_size=1000)
+
+    upload = MultipartUpload(request=request, field_name='avatar')
+    await upload.open()
+
+    with pytest.raises(FileSizeException):
+        async for _ in upload.read_chunks():
+            pass
+
+    assert len(received) == 12
+
+
+async def iterate_chunks(content: bytes, chunk_size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(content), chunk_size):
+        yield content[start:start + chunk_size]
+
+
+def create_use_case(content: bytes, chunk_size: int) -> UpdateAvatarUseCase:
+    return UpdateAvatarUseCase(
+        avatar=iterate_chunks(content=content, chunk_size=chunk_size),
+        extension='.png',
+        user_id=1,
+        previous_avatar={},
+        file_storage=None,
+        image_processor=None,
+        database_repo=None,
+        database_uow=None,
+        outbox_repo=None,
+        orphaned_file_repo=None,
+    )
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize('chunk_size', [1, 2, 5, 8, 100])
+async def test_signature_split_across_chunks_is_accepted(chunk_size: int) -> None:
+    content = b'\x89PNG\r\n\x1a\n' + bytes(range(256))
+    use_case = create_use_case(content=content, chunk_size=chunk_size)
+
+    assert b''.join([chunk async for chunk in use_case.validate_stream()]) == content
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize('content', [b'\x89PNG', b'\xff\xd8\xff' + bytes(range(256))])
+async def test_content_not_matching_signature_is_rejected(content: bytes) -> None:
+    use_case = create_use_case(content=content, chunk_size=1)
+
+    with pytest.raises(FileExtensionException):
+        async for _ in use_case.validate_stream():
+            pass
+
+
+class RecordingUnitOfWork:
+
+    def __init__(self, received: list) -> None:
+        self.session = None
+        self.received = received
+        self.received_on_rollback = None
+
+    async def rollback(self) -> None:
+        self.received_on_rollback = len(self.received)
+
+
+@pytest.mark.anyio
+async def test_authentication_transaction_is_ended_before_body_is_received() -> None:
+    request, received = create_request(body=create_body(b'GIF89a', filename='avatar.gif'), chunk_size=1000)
+    database_uow = RecordingUnitOfWork(received=received)
+
+    with pytest.raises(FileExtensionException):
+        await update_avatar(
+            request=request,
+            user={'id': 1, 'avatar_url': None, 'avatar_renditions': {}},
+            access_token=None,
+            database_uow=database_uow,
+            image_processor=None,
+            file_storage=None,
+        )
+
+    assert database_uow.received_on_rollback == 0
+    assert len(received) > 0
@@ -0,0 +1,149 @@
+from asyncio import CancelledError, create_task, sleep, wait_for
+from os import environ
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from settings import settings
+
+from infrastructure.database.models import BaseModel, UserModel
+from infrastructure.database.repositories import UserRepository
+
+
+class RecordingSession:
+
+    def __init__(self, locked: bool = False) -> None:
+        self.statements = []
+        self.locked = locked
+
+    async def execute(self, statement) -> 'RecordingSession':
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return self
+
+    def mappings(self) -> 'RecordingSession':
+        return self
+
+    def all(self) -> list:
+        return []
+
+    def one_or_none(self) -> None:
+        return None
+
+    def scalar_one(self) -> bool:
+        return not self.locked
+
+
+@pytest.mark.anyio
+async def test_changes_are_read_after_writers_that_assigned_versions_finish() -> None:
+    session = RecordingSession()
+
+    await UserRepository(session=session).get_changes(cursor=0, limit=10)
+
+    assert 'pg_try_advisory_xact_lock' in session.statements[0]
+    assert 'clock_timestamp()' in session.statements[1]
+
+@pytest.mark.anyio
+async def test_lock_is_waited_for_once_writers_hold_it_longer_than_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, 'user_changes_lock_timeout', 0.05)
+    session = RecordingSession(locked=True)
+
+    await UserRepository(session=session).get_changes(cursor=0, limit=10)
+
+    assert all('pg_try_advisory_xact_lock' in statement for statement in session.statements[:-2])
+    assert 'pg_advisory_xact_lock(' in session.statements[-2]
+    assert 'clock_timestamp()' in session.statements[-1]
+
+@pytest.mark.anyio
+async def test_version_is_assigned_under_shared_lock() -> None:
+    session = RecordingSession()
+
+    await UserRepository(session=session).update_user(user_id=1, user_data={'username': 'updated'})
+
+    assert 'pg_advisory_xact_lock_shared' in session.statements[0]
+    assert session.statements[1].startswith('UPDATE users')
+
+
+@pytest.fixture
+async def session_factory() -> async_sessionmaker[AsyncSession]:
+    if (database_url := environ.get('TEST_DATABASE_URL')) is None:
+        pytest.skip('TEST_DATABASE_URL is not set.')
+
+    engine = create_async_engine(database_url)
+
+    async with engine.begin() as connection:
+        await connection.run_sync(BaseModel.metadata.create_all, tables=[UserModel.__table__])
+
+    yield async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as connection:
+        await connection.run_sync(BaseModel.metadata.drop_all, tables=[UserModel.__table__])
+
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_late_commit_of_lower_version_is_not_skipped(
+    session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    A lower version committed after a higher one must still be returned after the cursor.
+    """
+    monkeypatch.setattr(settings, 'user_changes_settle_delay', 0.0)
+
+    async with session_factory() as session:
+        repository = UserRepository(session=session)
+        first_user = await repository.create({'username': 'first', 'password': 'password', 'email': 'first@test'})
+        second_user = await repository.create({'username': 'second', 'password': 'password', 'email': 'second@test'})
+        await session.commit()
+        cursor = (await session.execute(select(func.max(UserModel.__table__.columns.version)))).scalar_one()
+
+    async with session_factory() as slow_session, session_factory() as fast_session:
+        slow_user = await UserRepository(session=slow_session).update_user(first_user.get('id'), {'username': 'slow'})
+
+        fast_user = await UserRepository(session=fast_session).update_user(second_user.get('id'), {'username': 'fast'})
+        await fast_session.commit()
+
+        assert slow_user.get('version') < fast_user.get('version')
+
+        async with session_factory() as feed_session:
+            changes = create_task(UserRepository(session=feed_session).get_changes(cursor=cursor, limit=10))
+
+            await sleep(0.5)
+            await slow_session.commit()
+
+            versions = [user.get('version') for user in await changes]
+
+    assert versions == [slow_user.get('version'), fast_user.get('version')]
+
+
+@pytest.mark.anyio
+async def test_cancelled_feed_does_not_block_writers(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """
+    The lock of a feed cancelled while it waits must not outlive its transaction.
+    """
+    async with session_factory() as session:
+        user = await UserRepository(session=session).create({'username': 'user', 'password': 'password', 'email': 'user@test'})
+        await session.commit()
+
+    async with session_factory() as writer_session:
+        await UserRepository(session=writer_session).update_user(user.get('id'), {'username': 'writer'})
+
+        async with session_factory() as feed_session:
+            changes = create_task(UserRepository(session=feed_session).get_changes(cursor=0, limit=10))
+            await sleep(0.1)
+            changes.cancel()
+
+            with pytest.raises(CancelledError):
+                await changes
+
+        await writer_session.commit()
+
+    async with session_factory() as session:
+        await wait_for(
+            UserRepository(session=session).update_user(user.get('id'), {'username': 'next_writer'}),
+            timeout=5.0,
+        )
+        await session.commit()
@@ -0,0 +1,129 @@
+from asyncio import CancelledError, Event, create_task, gather, sleep
+
+import pytest
+
+from settings import settings
+
+from infrastructure.database.loaders import UserLoader
+
+
+class FakeUnitOfWork:
+
+    def __init__(self) -> None:
+        self.session = None
+
+    async def __aenter__(self) -> 'FakeUnitOfWork':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+
+class FakeUserRepository:
+    """
+    Records the batches it is queried with, the users with the ids below 100 exist.
+    """
+
+    batches: list[list[int]] = []
+    exception: Exception | None = None
+    release: Event | None = None
+
+    def __init__(self, session: None) -> None:
+        self.session = session
+
+    async def get_by_ids(self, ids: list[int]) -> list[dict]:
+        self.batches.append(sorted(ids))
+
+        if self.release is not None:
+            await self.release.wait()
+        if self.exception is not None:
+            raise self.exception
+
+        return [{'id': user_id, 'username': f'user_{user_id}'} for user_id in ids if user_id < 100]
+
+
+@pytest.fixture(autouse=True)
+def repository() -> type[FakeUserRepository]:
+    FakeUserRepository.batches = []
+    FakeUserRepository.exception = None
+    FakeUserRepository.release = None
+    return FakeUserRepository
+
+
+def create_loader() -> UserLoader:
+    return UserLoader(unit_of_work_factory=FakeUnitOfWork, repository_class=FakeUserRepository)
+
+
+@pytest.mark.anyio
+async def test_concurrent_loads_are_fetched_by_one_query(repository: type[FakeUserRepository]) -> None:
+    loader = create_loader()
+
+    users = await gather(*(loader.load(user_id=user_id) for user_id in [1, 2, 1, 3]))
+
+    assert [user.get('id') for user in users] == [1, 2, 1, 3]
+    assert repository.batches == [[1, 2, 3]]
+
+
+@pytest.mark.anyio
+async def test_batch_is_dispatched_once_it_reaches_max_size(
+    repository: type[FakeUserRepository],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, 'user_loader_max_batch_size', 2)
+    monkeypatch.setattr(settings, 'user_loader_window', 60.0)
+    loader = create_loader()
+
+    await gather(*(loader.load(user_id=user_id) for user_id in [1, 2, 3, 4]))
+
+    assert repository.batches == [[1, 2], [3, 4]]
+
+
+@pytest.mark.anyio
+async def test_missing_user_is_loaded_as_none() -> None:
+    loader = create_loader()
+
+    assert await gather(loader.load(user_id=1), loader.load(user_id=100)) == [{'id': 1, 'username': 'user_1'}, None]
+
+
+@pytest.mark.anyio
+async def test_error_of_batch_is_raised_to_every_waiter(repository: type[FakeUserRepository]) -> None:
+    repository.exception = RuntimeError('The database is unavailable.')
+    loader = create_loader()
+
+    results = await gather(loader.load(user_id=1), loader.load(user_id=2), return_exceptions=True)
+
+    assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+
+
+@pytest.mark.anyio
+async def test_cancelled_waiter_does_not_affect_others(repository: type[FakeUserRepository]) -> None:
+    repository.release = Event()
+    loader = create_loader()
+
+    cancelled = create_task(loader.load(user_id=1))
+    waiting = create_task(loader.load(user_id=1))
+    await sleep(settings.user_loader_window * 2)
+
+    cancelled.cancel()
+    repository.release.set()
+
+    assert (await waiting) == {'id': 1, 'username': 'user_1'}
+
+    with pytest.raises(CancelledError):
+        await cancelled
+
+
+@pytest.mark.anyio
+async def test_waiters_are_cancelled_along_with_batch(repository: type[FakeUserRepository]) -> None:
+    repository.release = Event()
+    loader = create_loader()
+
+    waiters = [create_task(loader.load(user_id=user_id)) for user_id in [1, 2]]
+    await sleep(settings.user_loader_window * 2)
+
+    for task in loader.tasks:
+        task.cancel()
+
+    results = await gather(*waiters, return_exceptions=True)
+
+    assert [type(result) for result in results] == [CancelledError, CancelledError]